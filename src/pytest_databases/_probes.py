@@ -0,0 +1,667 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import os
+import socket
+import struct
+from contextlib import contextmanager, suppress
+from typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+# capability flags of the MySQL client/server protocol
+CLIENT_LONG_PASSWORD = 0x00000001
+CLIENT_PROTOCOL_41 = 0x00000200
+CLIENT_SECURE_CONNECTION = 0x00008000
+CLIENT_PLUGIN_AUTH = 0x00080000
+MYSQL_UTF8_GENERAL_CI = 33
+
+# TDS message types, tokens and pre-login options, see [MS-TDS]
+TDS_SQL_BATCH = 0x01
+TDS_RESPONSE = 0x04
+TDS_LOGIN7 = 0x10
+TDS_PRELOGIN = 0x12
+TDS_STATUS_EOM = 0x01
+TDS_VERSION_7_4 = 0x74000004
+TDS_PACKET_SIZE = 4096
+TDS_ENCRYPT_NOT_SUP = 0x02
+TDS_TOKEN_ERROR = 0xAA
+TDS_TOKEN_LOGINACK = 0xAD
+# tokens with a 2-byte length, and DONE tokens of a fixed size
+TDS_VARIABLE_TOKENS = frozenset({0xA4, 0xA5, 0xA9, TDS_TOKEN_ERROR, 0xAB, TDS_TOKEN_LOGINACK, 0xE3})
+TDS_DONE_TOKENS = frozenset({0xFD, 0xFE, 0xFF})
+TDS_DONE_ERROR = 0x0002
+
+# TNS packet types, see the Oracle Net protocol
+TNS_CONNECT = 0x01
+TNS_ACCEPT = 0x02
+TNS_REDIRECT = 0x05
+TNS_RESEND = 0x0B
+TNS_VERSION = 314
+TNS_LOWEST_VERSION = 300
+TNS_SDU = 8192
+TNS_TDU = 32767
+# longer connect data has to be sent in a separate packet
+TNS_MAX_CONNECT_DATA = 230
+
+MONGODB_OP_MSG = 2013
+# BSON element types, fixed sizes of those without a length prefix
+BSON_DOUBLE = 0x01
+BSON_STRING = 0x02
+BSON_DOCUMENT = 0x03
+BSON_ARRAY = 0x04
+BSON_BINARY = 0x05
+BSON_BOOLEAN = 0x08
+BSON_INT32 = 0x10
+BSON_INT64 = 0x12
+BSON_FIXED_SIZES = {0x07: 12, 0x09: 8, 0x0A: 0, 0x11: 8, 0x13: 16, 0xFF: 0, 0x7F: 0}
+
+# PostgreSQL protocol 3.0 and its authentication requests
+PG_PROTOCOL_VERSION = 196608
+PG_AUTH_OK = 0
+PG_AUTH_CLEARTEXT = 3
+PG_AUTH_MD5 = 5
+PG_AUTH_SASL = 10
+PG_AUTH_SASL_CONTINUE = 11
+PG_AUTH_SASL_FINAL = 12
+
+
+class ProbeError(Exception):
+    """The server answered with something that is not part of its protocol."""
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            # Docker's port proxy accepts connections before the server listens,
+            # and closes them right away
+            msg = "connection closed by the server"
+            raise ProbeError(msg)
+        data += chunk
+    return data
+
+
+def _read_mysql_packet(sock: socket.socket) -> tuple[int, bytes]:
+    header = _recv_exactly(sock, 4)
+    length = int.from_bytes(header[:3], "little")
+    return header[3], _recv_exactly(sock, length)
+
+
+def _write_mysql_packet(sock: socket.socket, sequence: int, payload: bytes) -> None:
+    sock.sendall(len(payload).to_bytes(3, "little") + bytes([sequence & 0xFF]) + payload)
+
+
+def _xor(left: bytes, right: bytes) -> bytes:
+    return bytes(a ^ b for a, b in zip(left, right))
+
+
+def _sha1(data: bytes) -> bytes:
+    # SHA-1 and MD5 are what the legacy authentication schemes are defined with
+    return hashlib.sha1(data, usedforsecurity=False).digest()
+
+
+def _md5_hex(data: bytes) -> bytes:
+    return hashlib.md5(data, usedforsecurity=False).hexdigest().encode()
+
+
+def _mysql_scramble(plugin: str, password: str, nonce: bytes) -> bytes:
+    if not password:
+        return b""
+    secret = password.encode()
+    if plugin == "caching_sha2_password":
+        digest = hashlib.sha256(secret).digest()
+        return _xor(digest, hashlib.sha256(hashlib.sha256(digest).digest() + nonce).digest())
+    digest = _sha1(secret)
+    return _xor(digest, _sha1(nonce + _sha1(digest)))
+
+
+def _parse_mysql_handshake(payload: bytes) -> tuple[bytes, str]:
+    """Return the auth nonce and the default auth plugin of a v10 handshake packet."""
+    if not payload or payload[0] != 10:
+        msg = f"unexpected handshake packet {payload[:1]!r}"
+        raise ProbeError(msg)
+    position = payload.index(b"\0", 1) + 1  # server version
+    position += 4  # connection id
+    nonce = payload[position : position + 8]
+    position += 8 + 1 + 2 + 1 + 2 + 2  # filler, capabilities, charset, status, capabilities
+    nonce_length = payload[position]
+    position += 1 + 10
+    # the second part is at least 13 bytes, the last of which is a NUL
+    second_length = max(13, nonce_length - 8)
+    nonce += payload[position : position + second_length].rstrip(b"\0")
+    position += second_length
+    plugin = payload[position:].split(b"\0", 1)[0].decode() or "mysql_native_password"
+    return nonce, plugin
+
+
+def _mysql_login(sock: socket.socket, nonce: bytes, plugin: str, user: str, password: str) -> bool:
+    capabilities = CLIENT_LONG_PASSWORD | CLIENT_PROTOCOL_41 | CLIENT_SECURE_CONNECTION | CLIENT_PLUGIN_AUTH
+    scramble = _mysql_scramble(plugin, password, nonce)
+    response = (
+        struct.pack("<IIB", capabilities, 1 << 24, MYSQL_UTF8_GENERAL_CI)
+        + bytes(23)
+        + user.encode()
+        + b"\0"
+        + bytes([len(scramble)])
+        + scramble
+        + plugin.encode()
+        + b"\0"
+    )
+    _write_mysql_packet(sock, 1, response)
+    sequence, payload = _read_mysql_packet(sock)
+    if payload[:1] == b"\xfe":
+        # the account uses another auth plugin; answer in its terms
+        plugin_name, _, nonce = payload[1:].partition(b"\0")
+        _write_mysql_packet(sock, sequence + 1, _mysql_scramble(plugin_name.decode(), password, nonce.rstrip(b"\0")))
+        sequence, payload = _read_mysql_packet(sock)
+    if payload[:2] == b"\x01\x03":
+        # caching_sha2_password fast authentication, followed by OK
+        _, payload = _read_mysql_packet(sock)
+    return payload[:1] == b"\x00" or payload[:2] == b"\x01\x04"
+
+
+def mysql_ping(host: str, port: int, user: str | None = None, password: str = "", timeout: float = 2.0) -> bool:
+    """Check whether a MySQL, MariaDB or Dolt server accepts connections.
+
+    The server has to send its handshake, which it only does once it is out of
+    the ``--skip-networking`` phase of the images' initialization. With
+    ``user``, the login must not be rejected either. Logins through
+    ``caching_sha2_password`` that need the full exchange, which requires TLS
+    or RSA, count as not rejected.
+    """
+    try:
+        with socket.create_connection((host, port), timeout=timeout) as sock:
+            _, payload = _read_mysql_packet(sock)
+            if payload[:1] == b"\xff":
+                # e.g. too many connections, or the host is blocked
+                return False
+            nonce, plugin = _parse_mysql_handshake(payload)
+            return user is None or _mysql_login(sock, nonce, plugin, user, password)
+    except (OSError, ProbeError, ValueError, IndexError):
+        return False
+
+
+def _write_tds_message(sock: socket.socket, message_type: int, payload: bytes) -> None:
+    chunk_size = TDS_PACKET_SIZE - 8
+    chunks = [payload[i : i + chunk_size] for i in range(0, len(payload), chunk_size)] or [b""]
+    for number, chunk in enumerate(chunks, start=1):
+        status = TDS_STATUS_EOM if number == len(chunks) else 0
+        sock.sendall(struct.pack(">BBHHBB", message_type, status, len(chunk) + 8, 0, number & 0xFF, 0) + chunk)
+
+
+def _read_tds_message(sock: socket.socket) -> bytes:
+    payload = b""
+    while True:
+        _, status, length, _, _, _ = struct.unpack(">BBHHBB", _recv_exactly(sock, 8))
+        payload += _recv_exactly(sock, length - 8)
+        if status & TDS_STATUS_EOM:
+            return payload
+
+
+def _read_tds_tokens(payload: bytes) -> tuple[bool, list[str]]:
+    """Return whether the response has a LOGINACK and the messages of its errors.
+
+    Only responses without result sets are understood, which is all that logins
+    and DDL batches produce.
+    """
+    login_ack = False
+    errors: list[str] = []
+    position = 0
+    while position < len(payload):
+        token = payload[position]
+        if token in TDS_DONE_TOKENS:
+            if struct.unpack_from("<H", payload, position + 1)[0] & TDS_DONE_ERROR and not errors:
+                errors.append("the batch was aborted")
+            position += 13
+        elif token in TDS_VARIABLE_TOKENS:
+            length = struct.unpack_from("<H", payload, position + 1)[0]
+            body = payload[position + 3 : position + 3 + length]
+            if token == TDS_TOKEN_LOGINACK:
+                login_ack = True
+            elif token == TDS_TOKEN_ERROR:
+                # number, state, class, then the message as a length-prefixed UCS-2 string
+                message_length = struct.unpack_from("<H", body, 6)[0]
+                errors.append(body[8 : 8 + message_length * 2].decode("utf-16-le"))
+            position += 3 + length
+        else:
+            msg = f"unexpected TDS token {token:#x}"
+            raise ProbeError(msg)
+    return login_ack, errors
+
+
+def _make_tds_prelogin() -> bytes:
+    # VERSION and ENCRYPTION options; without encryption support the server
+    # takes the login in the clear unless it is configured to force encryption
+    data = bytes(6) + bytes([TDS_ENCRYPT_NOT_SUP])
+    table_length = 2 * 5 + 1
+    return struct.pack(">BHH", 0x00, table_length, 6) + struct.pack(">BHH", 0x01, table_length + 6, 1) + b"\xff" + data
+
+
+def _tds_obfuscate(password: str) -> bytes:
+    return bytes((((byte << 4) & 0xF0) | (byte >> 4)) ^ 0xA5 for byte in password.encode("utf-16-le"))
+
+
+def _make_tds_login7(user: str, password: str, database: str) -> bytes:
+    fields = [
+        socket.gethostname().encode("utf-16-le"),
+        user.encode("utf-16-le"),
+        _tds_obfuscate(password),
+        "pytest-databases".encode("utf-16-le"),  # application
+        b"",  # server name
+        b"",  # extension
+        "pytest-databases".encode("utf-16-le"),  # client library
+        b"",  # language
+        database.encode("utf-16-le"),
+    ]
+    header_length = 94
+    offsets = b""
+    data = b""
+    for field in fields:
+        offsets += struct.pack("<HH", header_length + len(data), len(field) // 2)
+        data += field
+    # client id, then empty SSPI, attach-db-file and change-password, and the long SSPI length
+    offsets += bytes(6) + struct.pack(
+        "<HHHHHHI", header_length + len(data), 0, header_length + len(data), 0, header_length + len(data), 0, 0
+    )
+    fixed = struct.pack(
+        "<IIIIIIBBBBiI",
+        header_length + len(data),
+        TDS_VERSION_7_4,
+        TDS_PACKET_SIZE,
+        0,
+        os.getpid(),
+        0,
+        0xE0,  # USE_DB_ON, INIT_DB_FATAL, SET_LANG_ON
+        0x03,  # INIT_LANG_FATAL, ODBC_ON
+        0,
+        0,
+        0,
+        0x0409,
+    )
+    return fixed + offsets + data
+
+
+def _tds_login(sock: socket.socket, user: str, password: str, database: str) -> None:
+    _write_tds_message(sock, TDS_PRELOGIN, _make_tds_prelogin())
+    _read_tds_message(sock)
+    _write_tds_message(sock, TDS_LOGIN7, _make_tds_login7(user, password, database))
+    login_ack, errors = _read_tds_tokens(_read_tds_message(sock))
+    if errors or not login_ack:
+        raise ProbeError("; ".join(errors) or "login was not acknowledged")
+
+
+def mssql_ping(host: str, port: int, user: str, password: str, database: str = "master", timeout: float = 2.0) -> bool:
+    """Check whether SQL Server accepts a login over TDS.
+
+    SQL Server accepts connections long before it has recovered its system
+    databases, so a login has to succeed. Servers forcing encryption are not
+    supported.
+    """
+    try:
+        with socket.create_connection((host, port), timeout=timeout) as sock:
+            _tds_login(sock, user, password, database)
+    except (OSError, ProbeError, struct.error, UnicodeDecodeError):
+        return False
+    return True
+
+
+def mssql_execute(
+    host: str, port: int, user: str, password: str, sql: str, database: str = "master", timeout: float = 30.0
+) -> None:
+    """Run ``sql`` on SQL Server as one batch over TDS.
+
+    Raises:
+        ProbeError: If the login or any statement of the batch fails. The batch
+            must not return rows.
+    """
+    with socket.create_connection((host, port), timeout=timeout) as sock:
+        _tds_login(sock, user, password, database)
+        # ALL_HEADERS with a transaction descriptor header for autocommit
+        headers = struct.pack("<IIHQI", 22, 18, 2, 0, 1)
+        _write_tds_message(sock, TDS_SQL_BATCH, headers + sql.encode("utf-16-le"))
+        _, errors = _read_tds_tokens(_read_tds_message(sock))
+    if errors:
+        raise ProbeError("; ".join(errors))
+
+
+def _make_tns_connect(connect_data: bytes) -> bytes:
+    if len(connect_data) > TNS_MAX_CONNECT_DATA:
+        msg = f"connect data longer than {TNS_MAX_CONNECT_DATA} bytes"
+        raise ValueError(msg)
+    header_length = 8
+    body = struct.pack(
+        ">HHHHHHHHHH",
+        TNS_VERSION,
+        TNS_LOWEST_VERSION,
+        0,  # service options
+        TNS_SDU,
+        TNS_TDU,
+        0x7F08,  # protocol characteristics
+        0,  # line turnaround
+        1,  # one in the byte order of the client
+        len(connect_data),
+        header_length + 50,
+    )
+    # maximum receivable connect data, connect flags and trace ids
+    body = body.ljust(50, b"\0")
+    return (
+        struct.pack(">HHBBH", header_length + len(body) + len(connect_data), 0, TNS_CONNECT, 0, 0) + body + connect_data
+    )
+
+
+def _tns_connect(sock: socket.socket, packet: bytes) -> int:
+    """Send a CONNECT packet and return the type of the listener's final answer."""
+    for _ in range(2):
+        sock.sendall(packet)
+        length, _, packet_type = struct.unpack(">HHB", _recv_exactly(sock, 5))
+        _recv_exactly(sock, length - 5)
+        if packet_type != TNS_RESEND:
+            return packet_type
+    return TNS_RESEND
+
+
+def oracle_ping(host: str, port: int, service_name: str, timeout: float = 2.0) -> bool:
+    """Check whether the Oracle listener hands out connections to ``service_name``.
+
+    The listener answers as soon as it runs, but refuses connections to a
+    service until the database has registered it, which it does once it is
+    open. No login is made.
+    """
+    connect_data = (
+        f"(DESCRIPTION=(CONNECT_DATA=(SERVICE_NAME={service_name})(CID=(PROGRAM=pytest-databases)))"
+        f"(ADDRESS=(PROTOCOL=TCP)(HOST={host})(PORT={port})))"
+    ).encode()
+    try:
+        with socket.create_connection((host, port), timeout=timeout) as sock:
+            packet_type = _tns_connect(sock, _make_tns_connect(connect_data))
+    except (OSError, ProbeError, ValueError, struct.error):
+        return False
+    # a redirect hands the connection to the dispatcher of a service that is up,
+    # and a refusal carries the error, e.g. ORA-12514 for an unknown service
+    return packet_type in {TNS_ACCEPT, TNS_REDIRECT}
+
+
+def _encode_bson(document: dict[str, Any]) -> bytes:
+    """Encode the subset of BSON that commands are made of."""
+    elements = b""
+    for key, value in document.items():
+        name = key.encode() + b"\0"
+        if isinstance(value, bool):
+            elements += bytes([BSON_BOOLEAN]) + name + bytes([value])
+        elif isinstance(value, int):
+            elements += bytes([BSON_INT32]) + name + struct.pack("<i", value)
+        elif isinstance(value, str):
+            encoded = value.encode() + b"\0"
+            elements += bytes([BSON_STRING]) + name + struct.pack("<i", len(encoded)) + encoded
+        elif isinstance(value, bytes):
+            elements += bytes([BSON_BINARY]) + name + struct.pack("<iB", len(value), 0) + value
+        elif isinstance(value, dict):
+            elements += bytes([BSON_DOCUMENT]) + name + _encode_bson(value)
+        else:
+            msg = f"cannot encode {type(value).__name__} as BSON"
+            raise TypeError(msg)
+    return struct.pack("<i", len(elements) + 5) + elements + b"\0"
+
+
+def _decode_bson(data: bytes) -> dict[str, Any]:
+    """Decode a BSON document.
+
+    Values of the types commands do not need for their replies, such as
+    ObjectIds and timestamps, are skipped and come back as ``None``.
+    """
+    (length,) = struct.unpack_from("<i", data)
+    document: dict[str, Any] = {}
+    position = 4
+    while position < length - 1:
+        element_type = data[position]
+        name_end = data.index(b"\0", position + 1)
+        name = data[position + 1 : name_end].decode()
+        position = name_end + 1
+        value: Any = None
+        if element_type == BSON_DOUBLE:
+            (value,) = struct.unpack_from("<d", data, position)
+            position += 8
+        elif element_type == BSON_STRING:
+            (size,) = struct.unpack_from("<i", data, position)
+            value = data[position + 4 : position + 3 + size].decode()
+            position += 4 + size
+        elif element_type in {BSON_DOCUMENT, BSON_ARRAY}:
+            (size,) = struct.unpack_from("<i", data, position)
+            value = _decode_bson(data[position : position + size])
+            if element_type == BSON_ARRAY:
+                value = list(value.values())
+            position += size
+        elif element_type == BSON_BINARY:
+            (size,) = struct.unpack_from("<i", data, position)
+            value = data[position + 5 : position + 5 + size]
+            position += 5 + size
+        elif element_type == BSON_BOOLEAN:
+            value = data[position] == 1
+            position += 1
+        elif element_type == BSON_INT32:
+            (value,) = struct.unpack_from("<i", data, position)
+            position += 4
+        elif element_type == BSON_INT64:
+            (value,) = struct.unpack_from("<q", data, position)
+            position += 8
+        elif element_type in BSON_FIXED_SIZES:
+            position += BSON_FIXED_SIZES[element_type]
+        else:
+            msg = f"unexpected BSON type {element_type:#x}"
+            raise ProbeError(msg)
+        document[name] = value
+    return document
+
+
+def _mongodb_command(sock: socket.socket, command: dict[str, Any]) -> dict[str, Any]:
+    """Run ``command`` in an OP_MSG and return the reply document."""
+    body = struct.pack("<IB", 0, 0) + _encode_bson(command)
+    sock.sendall(struct.pack("<iiii", len(body) + 16, 1, 0, MONGODB_OP_MSG) + body)
+    length, _, _, op_code = struct.unpack("<iiii", _recv_exactly(sock, 16))
+    payload = _recv_exactly(sock, length - 16)
+    if op_code != MONGODB_OP_MSG or payload[4] != 0:
+        msg = f"unexpected reply with op code {op_code}"
+        raise ProbeError(msg)
+    # a checksum may follow the document; the document's length excludes it
+    return _decode_bson(payload[5:])
+
+
+def _scram_escape(user: str) -> str:
+    return user.replace("=", "=3D").replace(",", "=2C")
+
+
+def _scram_sha256_final(
+    password: str, client_nonce: str, client_first_bare: str, server_first: str
+) -> tuple[bytes, bytes]:
+    """Return the final SCRAM-SHA-256 client message and the server's expected final message.
+
+    The password is not SASLprep-normalized, which only matters for non-ASCII
+    passwords.
+    """
+    attributes = dict(item.split("=", 1) for item in server_first.split(","))
+    if not attributes["r"].startswith(client_nonce):
+        msg = "the server nonce does not extend the client nonce"
+        raise ProbeError(msg)
+    salted = hashlib.pbkdf2_hmac("sha256", password.encode(), base64.b64decode(attributes["s"]), int(attributes["i"]))
+    client_key = hmac.digest(salted, b"Client Key", "sha256")
+    client_final = f"c=biws,r={attributes['r']}"
+    auth_message = f"{client_first_bare},{server_first},{client_final}".encode()
+    proof = _xor(client_key, hmac.digest(hashlib.sha256(client_key).digest(), auth_message, "sha256"))
+    server_signature = hmac.digest(hmac.digest(salted, b"Server Key", "sha256"), auth_message, "sha256")
+    return (
+        f"{client_final},p={base64.b64encode(proof).decode()}".encode(),
+        f"v={base64.b64encode(server_signature).decode()}".encode(),
+    )
+
+
+def _mongodb_authenticate(sock: socket.socket, user: str, password: str, database: str) -> bool:
+    client_nonce = base64.b64encode(os.urandom(24)).decode()
+    client_first_bare = f"n={_scram_escape(user)},r={client_nonce}"
+    reply = _mongodb_command(
+        sock,
+        {
+            "saslStart": 1,
+            "mechanism": "SCRAM-SHA-256",
+            "payload": f"n,,{client_first_bare}".encode(),
+            "autoAuthorize": 1,
+            "options": {"skipEmptyExchange": True},
+            "$db": database,
+        },
+    )
+    if reply.get("ok") != 1:
+        return False
+    client_final, server_final = _scram_sha256_final(
+        password, client_nonce, client_first_bare, reply["payload"].decode()
+    )
+    reply = _mongodb_command(
+        sock,
+        {"saslContinue": 1, "conversationId": reply["conversationId"], "payload": client_final, "$db": database},
+    )
+    return reply.get("ok") == 1 and reply["payload"] == server_final
+
+
+def mongodb_ping(
+    host: str, port: int, user: str | None = None, password: str = "", database: str = "admin", timeout: float = 2.0
+) -> bool:
+    """Check whether MongoDB answers a ``ping``, after logging in if ``user`` is given.
+
+    The images start a server that only listens inside the container while
+    they create the root user, so with ``user``, a successful login also means
+    the initialization is done.
+    """
+    try:
+        with socket.create_connection((host, port), timeout=timeout) as sock:
+            if user is not None and not _mongodb_authenticate(sock, user, password, database):
+                return False
+            return _mongodb_command(sock, {"ping": 1, "$db": database}).get("ok") == 1
+    except (OSError, ProbeError, ValueError, KeyError, IndexError, struct.error):
+        return False
+
+
+def _write_pg_message(sock: socket.socket, message_type: bytes, body: bytes) -> None:
+    sock.sendall(message_type + struct.pack(">i", len(body) + 4) + body)
+
+
+def _read_pg_message(sock: socket.socket) -> tuple[bytes, bytes]:
+    header = _recv_exactly(sock, 5)
+    (length,) = struct.unpack_from(">i", header, 1)
+    return header[:1], _recv_exactly(sock, length - 4)
+
+
+def _pg_error_message(body: bytes) -> str:
+    fields = {field[:1]: field[1:].decode(errors="replace") for field in body.split(b"\0") if field}
+    return fields.get(b"M", "unknown error")
+
+
+def _pg_authenticate(sock: socket.socket, user: str, password: str) -> None:
+    client_nonce = client_first_bare = server_final = ""
+    while True:
+        message_type, body = _read_pg_message(sock)
+        if message_type == b"E":
+            raise ProbeError(_pg_error_message(body))
+        if message_type != b"R":
+            msg = f"unexpected message {message_type!r} during authentication"
+            raise ProbeError(msg)
+        (request,) = struct.unpack_from(">i", body)
+        if request == PG_AUTH_OK:
+            return
+        if request == PG_AUTH_CLEARTEXT:
+            _write_pg_message(sock, b"p", password.encode() + b"\0")
+        elif request == PG_AUTH_MD5:
+            inner = _md5_hex(password.encode() + user.encode())
+            _write_pg_message(sock, b"p", b"md5" + _md5_hex(inner + body[4:8]) + b"\0")
+        elif request == PG_AUTH_SASL:
+            if b"SCRAM-SHA-256\0" not in body[4:]:
+                msg = "the server offers no supported SASL mechanism"
+                raise ProbeError(msg)
+            client_nonce = base64.b64encode(os.urandom(18)).decode()
+            # the server takes the user from the startup message
+            client_first_bare = f"n=,r={client_nonce}"
+            client_first = f"n,,{client_first_bare}".encode()
+            _write_pg_message(sock, b"p", b"SCRAM-SHA-256\0" + struct.pack(">i", len(client_first)) + client_first)
+        elif request == PG_AUTH_SASL_CONTINUE:
+            client_final, server_final = _scram_sha256_final(
+                password, client_nonce, client_first_bare, body[4:].decode()
+            )
+            _write_pg_message(sock, b"p", client_final)
+        elif request == PG_AUTH_SASL_FINAL:
+            if body[4:] != server_final:
+                msg = "the server signature does not match"
+                raise ProbeError(msg)
+        else:
+            msg = f"unsupported authentication request {request}"
+            raise ProbeError(msg)
+
+
+def _pg_wait_until_ready(sock: socket.socket) -> list[tuple[str | None, ...]]:
+    """Read messages up to ReadyForQuery and return the rows among them.
+
+    Raises:
+        ProbeError: If the server reported an error.
+    """
+    rows: list[tuple[str | None, ...]] = []
+    error = None
+    while True:
+        message_type, body = _read_pg_message(sock)
+        if message_type == b"Z":
+            if error is not None:
+                raise ProbeError(error)
+            return rows
+        if message_type == b"E":
+            error = _pg_error_message(body)
+        elif message_type == b"D":
+            (count,) = struct.unpack_from(">h", body)
+            position = 2
+            row: list[str | None] = []
+            for _ in range(count):
+                (size,) = struct.unpack_from(">i", body, position)
+                position += 4
+                row.append(None if size < 0 else body[position : position + size].decode())
+                position += max(size, 0)
+            rows.append(tuple(row))
+
+
+@contextmanager
+def postgres_session(
+    host: str, port: int, user: str, password: str, database: str, timeout: float = 30.0
+) -> Generator[Callable[[str], list[tuple[str | None, ...]]], None, None]:
+    """Open a session with a PostgreSQL-compatible server.
+
+    Yields:
+        A function that runs a query and returns its rows, with every value as
+        text. It raises :class:`ProbeError` if the query fails.
+
+    Raises:
+        ProbeError: If the login fails.
+    """
+    with socket.create_connection((host, port), timeout=timeout) as sock:
+        parameters = {"user": user, "database": database, "client_encoding": "UTF8"}
+        startup = b"".join(f"{key}\0{value}\0".encode() for key, value in parameters.items()) + b"\0"
+        sock.sendall(struct.pack(">ii", len(startup) + 8, PG_PROTOCOL_VERSION) + startup)
+        _pg_authenticate(sock, user, password)
+        _pg_wait_until_ready(sock)
+
+        def query(sql: str) -> list[tuple[str | None, ...]]:
+            _write_pg_message(sock, b"Q", sql.encode() + b"\0")
+            return _pg_wait_until_ready(sock)
+
+        try:
+            yield query
+        finally:
+            # say goodbye, so that the server does not log an unexpected EOF
+            with suppress(OSError):
+                _write_pg_message(sock, b"X", b"")
+
+
+def postgres_ping(host: str, port: int, user: str, password: str, database: str, timeout: float = 2.0) -> bool:
+    """Check whether a PostgreSQL-compatible server lets ``user`` run queries in ``database``."""
+    try:
+        with postgres_session(host, port, user, password, database, timeout=timeout) as query:
+            return query("SELECT 1") == [("1",)]
+    except (OSError, ProbeError, ValueError, KeyError, struct.error):
+        return False
@@ -0,0 +1,33 @@
+"""Remove pytest-databases containers from a detached process.
+
+Started by ``--databases-detach-teardown`` at the end of a session, so that
+pytest can exit while Docker is still killing and removing the containers::
+
+    python -m pytest_databases._reaper <container id>...
+
+Without container ids, it removes the containers of sessions that are gone or
+expired, which is also done at the start of every session::
+
+    python -m pytest_databases._reaper
+"""
+
+from __future__ import annotations
+
+import sys
+
+from pytest_databases._service import _reap_stale_containers, _remove_containers, get_docker_client
+
+
+def main(container_ids: list[str]) -> None:
+    client = get_docker_client()
+    try:
+        if container_ids:
+            _remove_containers(client, container_ids)
+        else:
+            _reap_stale_containers(client)
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,22 +1,30 @@
 from __future__ import annotations
 
-# ruff: noqa: PLW0717
 import contextlib
+import dataclasses
+import functools
+import inspect
 import json
 import os
+import socket
 import subprocess  # noqa: S404
+import sys
+import threading
 import time
-from contextlib import AbstractContextManager, contextmanager
-from typing import TYPE_CHECKING, Any, Callable
+import uuid
+import warnings
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import AbstractContextManager, ExitStack, contextmanager
+from typing import TYPE_CHECKING, Any, Callable, get_args
 
 import filelock
 import pytest
-from docker.errors import APIError, ImageNotFound
+from docker import DockerClient
+from docker.errors import APIError, ImageNotFound, NotFound, StreamParseError
 from typing_extensions import Self
 
-from docker import DockerClient
-from pytest_databases.helpers import get_xdist_worker_id
-from pytest_databases.types import ServiceContainer
+from pytest_databases.helpers import TRUE_VALUES, get_xdist_worker_id, simple_string_hash
+from pytest_databases.types import DatabaseProfile, ServiceContainer, ServiceTimings
 
 if TYPE_CHECKING:
     import pathlib
@@ -24,9 +32,11 @@ if TYPE_CHECKING:
     from types import TracebackType
 
     from docker.models.containers import Container
-    from docker.types import Ulimit
+    from docker.models.images import Image
+    from docker.types import CancellableStream, Ulimit
 
 
+@functools.lru_cache(maxsize=1)
 def get_docker_host() -> str:
     result = subprocess.run(
         ["docker", "context", "ls", "--format=json"],  # noqa: S607
@@ -49,38 +59,817 @@ def get_docker_host() -> str:
     return next(context["DockerEndpoint"] for context in contexts if context["Current"] is True)
 
 
-def get_docker_client() -> DockerClient:
+def get_docker_client(docker_host: str | None = None) -> DockerClient:
     env = {**os.environ}
     if "DOCKER_HOST" not in env:
-        env["DOCKER_HOST"] = get_docker_host()
+        env["DOCKER_HOST"] = docker_host or get_docker_host()
     return DockerClient.from_env(environment=env)
 
 
-def _stop_all_containers(client: DockerClient) -> None:
+def _get_cached_docker_host(cache_dir: pathlib.Path) -> str:
+    """Resolve the Docker endpoint once per session.
+
+    The result is written to ``cache_dir``, which all xdist processes share, so
+    only the first one has to shell out to the docker CLI.
+    """
+    cache_file = cache_dir / "docker-host"
+    with filelock.FileLock(cache_dir / "docker-host.lock"):
+        if cache_file.exists():
+            return cache_file.read_text()
+        docker_host = get_docker_host()
+        cache_file.write_text(docker_host)
+        return docker_host
+
+
+def _get_session_docker_client(config: pytest.Config) -> DockerClient:
+    """Return the client shared by the fixtures and the session hooks of this process."""
+    client = config.stash.get(_docker_client_key, None)
+    if client is None:
+        docker_host = None
+        if "DOCKER_HOST" not in os.environ:
+            docker_host = _get_cached_docker_host(_get_base_tmp_path(config._tmp_path_factory))  # type: ignore[attr-defined]
+        client = config.stash[_docker_client_key] = get_docker_client(docker_host)
+    return client
+
+
+LOG_TAIL_LINES = 50
+LOG_TAIL_BYTES = 8192
+FINGERPRINT_LABEL = "pytest_databases.fingerprint"
+SNAPSHOT_REPOSITORY = "pytest-databases-snapshot"
+DEFAULT_TMPFS_SIZE = "1g"
+PULL_ATTEMPTS = 3
+PORT_ALLOCATION_ATTEMPTS = 5
+# the base URLs docker-py gives daemons reached through a unix socket and a
+# named pipe; 'http+docker://ssh' is a remote daemon
+LOCAL_SOCKET_BASE_URLS = ("http+docker://localhost", "http+docker://localnpipe")
+# pytest versions, from inclusive to exclusive, whose fixture cache eager start fills in
+EAGER_START_PYTEST_VERSIONS = ((8, 0), (10, 0))
+DEFAULT_PREFETCH_WORKERS = 4
+
+# order of the columns in the --databases-timings report
+TIMING_PHASES = ("lock", "image", "pull", "create", "ports", "log", "health", "check", "exec", "teardown")
+TIMINGS_WORKEROUTPUT_KEY = "pytest_databases_timings"
+# the service of the timing record of removing all containers at the end of the session
+SESSION_TIMINGS_SERVICE = "(session)"
+
+# every container carries the id, pid and host of the session that owns it and
+# an expiry time, so that concurrent sessions can share a Docker daemon and only
+# clean up containers whose session is gone
+SESSION_LABEL = "pytest_databases.session"
+NAME_LABEL = "pytest_databases.name"
+OWNER_PID_LABEL = "pytest_databases.pid"
+OWNER_HOST_LABEL = "pytest_databases.host"
+EXPIRES_LABEL = "pytest_databases.expires"
+# containers kept for --reuse-databases belong to no session and never expire
+REUSE_LABEL = "pytest_databases.reuse"
+DEFAULT_CONTAINER_TTL = 6 * 60 * 60
+SESSION_WORKERINPUT_KEY = "pytest_databases_session"
+
+
+@dataclasses.dataclass(frozen=True)
+class _SessionOwner:
+    id: str
+    pid: int
+    host: str
+
+
+_owner_key = pytest.StashKey[_SessionOwner]()
+_docker_client_key = pytest.StashKey[DockerClient]()
+_timings_key = pytest.StashKey[list[dict[str, Any]]]()
+_eager_start_key = pytest.StashKey["_EagerStart"]()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("databases", "pytest-databases")
+    group.addoption(
+        "--reuse-databases",
+        action="store_true",
+        default=False,
+        help=(
+            "Keep service containers running after the session and reuse them in the next one, "
+            "as long as their image, environment, command and ports did not change."
+        ),
+    )
+    group.addoption(
+        "--databases-snapshots",
+        action="store_true",
+        default=False,
+        help=(
+            "Commit services to local images once their one-time initialization is done, "
+            "and start later sessions from those images."
+        ),
+    )
+    group.addoption(
+        "--databases-clear-snapshots",
+        action="store_true",
+        default=False,
+        help=f"Remove all {SNAPSHOT_REPOSITORY} images before starting any service.",
+    )
+    group.addoption(
+        "--databases-tmpfs-size",
+        default=DEFAULT_TMPFS_SIZE,
+        help=f"Size cap of the tmpfs data directories enabled by the *_use_tmpfs fixtures (default: {DEFAULT_TMPFS_SIZE}).",
+    )
+    group.addoption(
+        "--databases-detach-teardown",
+        action="store_true",
+        default=False,
+        help=(
+            "Remove the service containers from a detached background process at the end of the session "
+            "instead of waiting for Docker to remove them."
+        ),
+    )
+    group.addoption(
+        "--databases-container-ttl",
+        type=int,
+        default=DEFAULT_CONTAINER_TTL,
+        metavar="SECONDS",
+        help=(
+            "Seconds after which other sessions may remove the containers of this one if they cannot tell "
+            f"whether it is still running, e.g. because it runs on another host (default: {DEFAULT_CONTAINER_TTL})."
+        ),
+    )
+    group.addoption(
+        "--databases-timings",
+        action="store_true",
+        default=False,
+        help="Report how long each service spent in each phase of its startup and teardown.",
+    )
+    group.addoption(
+        "--databases-trace",
+        metavar="PATH",
+        default=None,
+        help=(
+            "Write a Chrome trace (viewable in Perfetto or chrome://tracing) of the lock waits, "
+            "pulls, container starts, readiness waits and teardowns of all services and xdist workers."
+        ),
+    )
+    group.addoption(
+        "--databases-prefetch-images",
+        action="store_true",
+        default=False,
+        help=(
+            "Pull the images of the services needed by the collected tests concurrently "
+            "before the first test runs, instead of one by one as the services start."
+        ),
+    )
+    group.addoption(
+        "--databases-prefetch-workers",
+        type=int,
+        default=DEFAULT_PREFETCH_WORKERS,
+        metavar="N",
+        help=f"Maximum number of images pulled at the same time by --databases-prefetch-images (default: {DEFAULT_PREFETCH_WORKERS}).",
+    )
+    group.addoption(
+        "--databases-image-cache",
+        metavar="DIR",
+        default=os.environ.get("DATABASES_IMAGE_CACHE"),
+        help=(
+            "Load missing images from docker save tarballs in DIR instead of pulling them, "
+            "if they are there (default: $DATABASES_IMAGE_CACHE)."
+        ),
+    )
+    group.addoption(
+        "--databases-image-cache-save",
+        action="store_true",
+        default=os.environ.get("DATABASES_IMAGE_CACHE_SAVE", "False") in TRUE_VALUES,
+        help="Save the images pulled during the session to --databases-image-cache (default: $DATABASES_IMAGE_CACHE_SAVE).",
+    )
+    group.addoption(
+        "--databases-eager-start",
+        action="store_true",
+        default=False,
+        help=(
+            "Start the services needed by the collected tests in the background as soon as the first test "
+            "sets up, instead of when the first test requesting each of them runs."
+        ),
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    session_owner = getattr(config, "workerinput", {}).get(SESSION_WORKERINPUT_KEY)
+    if session_owner is not None:
+        # xdist workers share the session of their controller
+        config.stash[_owner_key] = _SessionOwner(**session_owner)
+    else:
+        config.stash[_owner_key] = _SessionOwner(id=uuid.uuid4().hex[:12], pid=os.getpid(), host=socket.gethostname())
+
+    if config.getoption("databases_timings", default=False) or config.getoption("databases_trace", default=None):
+        config.stash[_timings_key] = []
+        if hasattr(config, "workerinput"):
+            # xdist sends workeroutput to the controller when the worker finishes,
+            # by which time all services of this worker have been recorded
+            config.workeroutput[TIMINGS_WORKEROUTPUT_KEY] = config.stash[_timings_key]  # type: ignore[attr-defined]
+
+
+def _reuse_enabled(config: pytest.Config) -> bool:
+    return bool(config.getoption("reuse_databases", default=False))
+
+
+def _detach_teardown_enabled(config: pytest.Config) -> bool:
+    return bool(config.getoption("databases_detach_teardown", default=False))
+
+
+def _make_timings_record(name: str, timings: ServiceTimings, starts: int = 1) -> dict[str, Any]:
+    return {
+        "service": name.removeprefix("pytest_databases_"),
+        "worker": get_xdist_worker_id() or "main",
+        "starts": starts,
+        "phases": dict(timings.phases),
+        "check_attempts": timings.check_attempts,
+        "pid": os.getpid(),
+        "spans": list(timings.spans),
+    }
+
+
+def _format_timings(records: list[dict[str, Any]]) -> list[str]:
+    """Sum the timing records per service and worker into the rows of a table."""
+    totals: dict[tuple[str, str], dict[str, Any]] = {}
+    for record in records:
+        keys = [(record["service"], record["worker"])]
+        if record["worker"] != "main":
+            keys.append((record["service"], "all"))
+        for key in keys:
+            total = totals.setdefault(key, {"starts": 0, "check_attempts": 0, "phases": {}})
+            total["starts"] += record.get("starts", 1)
+            total["check_attempts"] += record["check_attempts"]
+            for phase, seconds in record["phases"].items():
+                total["phases"][phase] = total["phases"].get(phase, 0.0) + seconds
+
+    phases = [phase for phase in TIMING_PHASES if any(phase in total["phases"] for total in totals.values())]
+    header = ["service", "worker", "starts", *phases, "checks", "total"]
+    rows = [header]
+    # per-worker rows of a service first, then its total across workers
+    for (service, worker), total in sorted(
+        totals.items(), key=lambda item: (item[0][0], item[0][1] == "all", item[0][1])
+    ):
+        rows.append([
+            service,
+            worker,
+            str(total["starts"]),
+            *(f"{total['phases'].get(phase, 0.0):.2f}s" for phase in phases),
+            str(total["check_attempts"]),
+            f"{sum(total['phases'].values()):.2f}s",
+        ])
+    widths = [max(len(row[column]) for row in rows) for column in range(len(header))]
+    lines = []
+    for row in rows:
+        names = [cell.ljust(width) for cell, width in zip(row[:2], widths)]
+        numbers = [cell.rjust(width) for cell, width in zip(row[2:], widths[2:])]
+        lines.append("  ".join([*names, *numbers]))
+    return lines
+
+
+def _make_trace(records: list[dict[str, Any]]) -> dict[str, Any]:
+    """Turn timing records into a Chrome trace, with a process per worker and a track per service."""
+    events: list[dict[str, Any]] = []
+    tracks: dict[tuple[int, str], int] = {}
+    for record in records:
+        pid = record["pid"]
+        if not any(track_pid == pid for track_pid, _ in tracks):
+            events.append({"name": "process_name", "ph": "M", "pid": pid, "args": {"name": record["worker"]}})
+        track = (pid, record["service"])
+        if track not in tracks:
+            tracks[track] = len(tracks) + 1
+            events.append({
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": tracks[track],
+                "args": {"name": record["service"]},
+            })
+        events.extend(
+            {
+                "name": phase,
+                "cat": "pytest-databases",
+                "ph": "X",
+                "ts": round(started_at * 1_000_000),
+                "dur": round(duration * 1_000_000),
+                "pid": pid,
+                "tid": tracks[track],
+                "args": {"service": record["service"], "worker": record["worker"]},
+            }
+            for phase, started_at, duration in record["spans"]
+        )
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def _make_fingerprint(**config: Any) -> str:
+    """Hash everything that shapes a container, to tell whether a running one can be reused."""
+    return simple_string_hash(json.dumps(config, sort_keys=True, default=str))
+
+
+def _make_snapshot_tag(**config: Any) -> str:
+    return f"{SNAPSHOT_REPOSITORY}:{_make_fingerprint(**config)}"
+
+
+def _stop_all_containers(
+    client: DockerClient,
+    session_id: str,
+    detach: bool = False,
+    timings: list[dict[str, Any]] | None = None,
+) -> None:
+    """Remove the containers of the session ``session_id``.
+
+    With ``timings``, the time it takes is added to it as the teardown of
+    :data:`SESSION_TIMINGS_SERVICE`.
+    """
+    if timings is None:
+        _remove_session_containers(client, session_id, detach)
+        return
+    session_timings = ServiceTimings()
+    with session_timings.measure("teardown"):
+        _remove_session_containers(client, session_id, detach)
+    timings.append(_make_timings_record(SESSION_TIMINGS_SERVICE, session_timings, starts=0))
+
+
+def _remove_session_containers(client: DockerClient, session_id: str, detach: bool) -> None:
+    containers: list[Container] = client.containers.list(
+        all=True,
+        filters={"label": ["pytest_databases", f"{SESSION_LABEL}={session_id}"]},
+        ignore_removed=True,
+    )
+    container_ids = [container.id for container in containers if container.status != "removing"]
+    if not container_ids:
+        return
+    if detach:
+        _spawn_reaper(container_ids)  # type: ignore[arg-type]
+    else:
+        _remove_containers(client, container_ids)  # type: ignore[arg-type]
+
+
+def _owner_alive(labels: dict[str, str]) -> bool | None:
+    """Tell whether the session process that created a container is still running.
+
+    Returns ``None`` when that cannot be checked, because the session runs on
+    another host or on Windows, where probing a pid has side effects.
+    """
+    if sys.platform == "win32" or labels.get(OWNER_HOST_LABEL) != socket.gethostname():
+        return None
+    try:
+        pid = int(labels[OWNER_PID_LABEL])
+    except (KeyError, ValueError):
+        return None
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # exists, but belongs to another user
+        return True
+    return True
+
+
+def _is_stale(labels: dict[str, str], now: float) -> bool:
+    if REUSE_LABEL in labels:
+        return False
+    if SESSION_LABEL not in labels:
+        # created by a version without session labels; nothing can be attached to it
+        return True
+    alive = _owner_alive(labels)
+    if alive is not None:
+        return not alive
+    try:
+        return float(labels[EXPIRES_LABEL]) < now
+    except (KeyError, ValueError):
+        return True
+
+
+def _reap_stale_containers(client: DockerClient) -> None:
+    """Remove containers left behind by sessions that are gone or expired."""
     containers: list[Container] = client.containers.list(
         all=True,
         filters={"label": "pytest_databases"},
         ignore_removed=True,
     )
-    for container in containers:
-        # Containers may disappear between the list and the kill/remove call -
-        # they are tagged remove=True so they vacate as soon as they stop, and
-        # transient teardown can race with this loop. Treat 404 (already gone)
-        # and 409 (removal already in progress) as success.
+    now = time.time()
+    container_ids = [
+        container.id for container in containers if container.status != "removing" and _is_stale(container.labels, now)
+    ]
+    if container_ids:
+        _remove_containers(client, container_ids)  # type: ignore[arg-type]
+
+
+def _remove_containers(client: DockerClient, container_ids: list[str]) -> None:
+    """Kill and remove containers concurrently.
+
+    Force-removal kills a container right away instead of waiting out the
+    SIGTERM grace period of a ``stop``; none of the containers hold data
+    worth shutting down cleanly for.
+    """
+
+    def remove(container_id: str) -> None:
+        # Containers may disappear between the list and the remove call -
+        # transient teardown and a crashed start clean up after themselves and
+        # can race with this loop. Treat 404 (already gone) and 409 (removal
+        # already in progress) as success.
         try:
-            if container.status == "running":
-                container.kill()
-            elif container.status in {"created", "stopped", "dead"}:
-                container.remove()
-            elif container.status == "removing":
-                continue
-            else:
-                msg = f"Cannot handle container in state {container.status}"
-                raise RuntimeError(msg)
+            client.api.remove_container(container_id, force=True)
         except APIError as exc:
             if exc.status_code not in {404, 409}:
                 raise
 
+    with ThreadPoolExecutor(max_workers=min(len(container_ids), 16) or 1) as pool:
+        # consume the results so the first failure is raised
+        list(pool.map(remove, container_ids))
+
+
+def _spawn_reaper(container_ids: list[str]) -> None:
+    """Hand the removal of ``container_ids`` to a detached process, so pytest can exit right away."""
+    subprocess.Popen(
+        [sys.executable, "-m", "pytest_databases._reaper", *container_ids],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def _with_tag(image: str) -> str:
+    if ":" in image.rsplit("/", maxsplit=1)[-1]:
+        return image
+    return f"{image}:latest"
+
+
+@dataclasses.dataclass(frozen=True)
+class _ImageCache:
+    """Directory of ``docker save`` tarballs that images are loaded from instead of pulled.
+
+    Tarballs are named by image ID, so an image pulled under several references
+    is stored once. ``refs/`` maps every reference to the ID it resolved to.
+    """
+
+    path: pathlib.Path
+    save: bool = False
+
+    def _ref_path(self, image: str) -> pathlib.Path:
+        return self.path / "refs" / simple_string_hash(_with_tag(image))
+
+    def _tarball_path(self, image_id: str) -> pathlib.Path:
+        return self.path / "images" / f"{image_id.replace('sha256:', '')}.tar"
+
+    def load(self, client: DockerClient, image: str) -> Image | None:
+        ref_path = self._ref_path(image)
+        if not ref_path.exists():
+            return None
+        tarball = self._tarball_path(ref_path.read_text().strip())
+        if not tarball.exists():
+            return None
+        with tarball.open("rb") as data:
+            client.images.load(data)
+        try:
+            return client.images.get(image)
+        except ImageNotFound:
+            return None
+
+    def store(self, client: DockerClient, image: str) -> None:
+        pulled = client.images.get(image)
+        tarball = self._tarball_path(pulled.id)  # pyright: ignore[reportArgumentType]
+        ref_path = self._ref_path(image)
+        # written under a temporary name first, so that concurrent sessions
+        # sharing the cache never load a partial tarball
+        partial_suffix = f".{os.getpid()}-{threading.get_ident()}.partial"
+        if not tarball.exists():
+            tarball.parent.mkdir(parents=True, exist_ok=True)
+            partial = tarball.with_suffix(partial_suffix)
+            with partial.open("wb") as data:
+                for chunk in pulled.save(named=_with_tag(image)):
+                    data.write(chunk)
+            partial.replace(tarball)
+        ref_path.parent.mkdir(parents=True, exist_ok=True)
+        partial = ref_path.with_suffix(partial_suffix)
+        partial.write_text(pulled.id)  # pyright: ignore[reportArgumentType]
+        partial.replace(ref_path)
+
+
+def _get_image_cache(config: pytest.Config) -> _ImageCache | None:
+    path = config.getoption("databases_image_cache", default=None)
+    if not path:
+        return None
+    return _ImageCache(
+        path=config.invocation_params.dir / path,
+        save=bool(config.getoption("databases_image_cache_save", default=False)),
+    )
+
+
+def _pull_image(
+    client: DockerClient,
+    image: str,
+    platform_kwarg: dict[str, str],
+    lock_dir: pathlib.Path | None = None,
+    cache: _ImageCache | None = None,
+    share_failure: bool = True,
+) -> Image:
+    """Pull ``image``, retrying transient registry errors.
+
+    With ``lock_dir``, which xdist workers share, only one process pulls a given
+    image at a time. The others wait for it and then find the image locally, or,
+    unless ``share_failure`` is off, fail with the same error without asking the
+    registry again. With ``cache``, the image is loaded from the cache if it is
+    there.
+    """
+    if lock_dir is None:
+        return _fetch_image(client, image, platform_kwarg, cache)
+
+    key = f"image-{simple_string_hash(image)}"
+    failed_marker = lock_dir / f"{key}.failed"
+    with filelock.FileLock(lock_dir / f"{key}.lock"):
+        with contextlib.suppress(ImageNotFound):
+            # pulled by another process while this one waited for the lock
+            return client.images.get(image)
+        if failed_marker.exists():
+            msg = f"Could not pull image {image!r}: {failed_marker.read_text()}"
+            raise RuntimeError(msg)
+        try:
+            return _fetch_image(client, image, platform_kwarg, cache)
+        except (APIError, ImageNotFound) as exc:
+            if share_failure:
+                failed_marker.write_text(str(exc))
+            raise
+
+
+def _fetch_image(client: DockerClient, image: str, platform_kwarg: dict[str, str], cache: _ImageCache | None) -> Image:
+    if cache is not None:
+        loaded = cache.load(client, image)
+        if loaded is not None:
+            return loaded
+    pulled = _pull_image_with_retries(client, image, platform_kwarg)
+    if cache is not None and cache.save:
+        try:
+            cache.store(client, image)
+        except (OSError, APIError) as exc:
+            warnings.warn(f"Could not save image {image!r} to {cache.path}: {exc}", stacklevel=1)
+    return pulled
+
+
+def _pull_image_with_retries(client: DockerClient, image: str, platform_kwarg: dict[str, str]) -> Image:
+    # Registries can fail transiently: Docker Hub rate-limits
+    # anonymous pulls with 500s, MCR's WAF returns 404s wrapping
+    # a block page. Retry a few times before giving up.
+    for attempt in range(PULL_ATTEMPTS):
+        try:
+            return client.images.pull(*image.rsplit(":", maxsplit=1), **platform_kwarg)  # pyright: ignore[reportCallIssue,reportArgumentType,reportReturnType]
+        except (APIError, ImageNotFound):
+            if attempt == PULL_ATTEMPTS - 1:
+                raise
+            time.sleep(2**attempt)
+    msg = f"Could not pull image {image!r}"
+    raise RuntimeError(msg)
+
+
+def _prefetch_images(
+    client: DockerClient,
+    images: list[str],
+    max_workers: int,
+    lock_dir: pathlib.Path | None = None,
+    cache: _ImageCache | None = None,
+    platforms: dict[str, str] | None = None,
+) -> None:
+    """Pull the missing ``images`` concurrently, warning about the ones that fail.
+
+    Images in ``platforms`` are pulled for the given platform. A failed pull is
+    retried by the service that needs the image, which then reports the error
+    in the test using it.
+    """
+    platforms = platforms or {}
+    missing = []
+    for image in images:
+        try:
+            client.images.get(image)
+        except ImageNotFound:
+            missing.append(image)
+    if not missing:
+        return
+    with ThreadPoolExecutor(max_workers=max(min(max_workers, len(missing)), 1)) as pool:
+        # a failure here must not fail the services, which pull again
+        futures = {
+            image: pool.submit(
+                _pull_image,
+                client,
+                image,
+                {"platform": platforms[image]} if image in platforms else {},
+                lock_dir,
+                cache,
+                share_failure=False,
+            )
+            for image in missing
+        }
+    for image, future in futures.items():
+        exc = future.exception()
+        if exc is not None:
+            warnings.warn(f"Could not prefetch image {image!r}: {exc}", stacklevel=1)
+
+
+def _allocate_host_port(lock_dir: pathlib.Path) -> int:
+    """Reserve a free local TCP port that was not handed out before in this session.
+
+    The ports already handed out are kept in ``lock_dir``, which xdist workers
+    share, since the OS may return a port again until a container binds it.
+    """
+    allocated = lock_dir / "ports"
+    with filelock.FileLock(lock_dir / "ports.lock"):
+        taken = set(allocated.read_text().split()) if allocated.exists() else set()
+        for _ in range(PORT_ALLOCATION_ATTEMPTS):
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+                sock.bind(("", 0))
+                port = sock.getsockname()[1]
+            if str(port) not in taken:
+                with allocated.open("a") as file:
+                    file.write(f"{port}\n")
+                return port
+    msg = "Could not find a free host port"
+    raise RuntimeError(msg)
+
+
+def _is_port_conflict(exc: APIError) -> bool:
+    return any(message in str(exc) for message in ("port is already allocated", "address already in use"))
+
+
+def _get_host_port(container: Container, container_port: int, protocol: str) -> int:
+    # Get port binding based on protocol configuration
+    binding = None
+    if protocol == "both":
+        binding = container.ports.get(f"{container_port}/tcp") or container.ports.get(f"{container_port}/udp")
+    elif protocol in {"tcp", "udp"}:
+        binding = container.ports.get(f"{container_port}/{protocol}")
+    else:
+        msg = f"Invalid protocol '{protocol}'. Must be 'tcp', 'udp', or 'both'."
+        raise ValueError(msg)
+
+    if not binding:
+        msg = (
+            f"Container port {container_port}/{protocol} not found in exposed ports. "
+            f"Available ports: {list(container.ports.keys())}"
+        )
+        raise RuntimeError(msg)
+
+    return int(binding[0]["HostPort"])
+
+
+def _raise_if_exited(container: Container, name: str) -> None:
+    """Raise if ``container`` stopped while we were waiting for it to come online.
+
+    Containers are not auto-removed, so the exit code, the OOM flag and the tail
+    of the logs are still available here; the container is removed afterwards.
+    """
+    container.reload()
+    if container.status not in {"exited", "dead"}:
+        return
+
+    state = container.attrs["State"]
+    logs = container.logs(tail=LOG_TAIL_LINES)[-LOG_TAIL_BYTES:].decode(errors="replace")
+    with contextlib.suppress(APIError):
+        container.remove(force=True)
+    msg = (
+        f"Service {name!r} exited while waiting for it to come online "
+        f"(exit code {state.get('ExitCode')}, OOMKilled={state.get('OOMKilled', False)}). "
+        f"Last {LOG_TAIL_LINES} log lines:\n{logs}"
+    )
+    raise RuntimeError(msg)
+
+
+def _wait_for_log(container: Container, pattern: bytes, timeout: float) -> bool:
+    """Follow the logs of ``container`` until ``pattern`` shows up.
+
+    The log stream is opened once and matched incrementally, keeping only enough
+    of the previous chunk to catch a match that spans two chunks. The stream ends
+    by itself when the container exits, in which case this returns early.
+
+    Args:
+        container: The container to watch.
+        pattern: The bytes to look for.
+        timeout: Maximum seconds to wait.
+
+    Returns:
+        Whether ``pattern`` was found before the timeout or the container exited.
+    """
+    stream = container.logs(stream=True, follow=True)
+    found = threading.Event()
+    keep = len(pattern) - 1
+
+    def watch() -> None:
+        tail = b""
+        try:
+            for chunk in stream:
+                window = tail + chunk
+                if pattern in window:
+                    found.set()
+                    return
+                tail = window[-keep:] if keep else b""
+        except Exception:  # noqa: BLE001
+            # closing the stream from the waiting thread surfaces as an error here
+            return
+
+    watcher = threading.Thread(target=watch, name=f"pytest-databases-logs-{container.name}", daemon=True)
+    watcher.start()
+    watcher.join(timeout)
+    stream.close()
+    return found.is_set()
+
+
+class _HealthWatcher:
+    """Dispatch container health events to the threads waiting on them.
+
+    One ``health_status`` event stream is opened lazily and shared by every
+    service started by the process, so the daemon runs the probes and waiting
+    costs no polling and no API calls.
+    """
+
+    def __init__(self, client: DockerClient) -> None:
+        self._client = client
+        self._condition = threading.Condition()
+        self._statuses: dict[str, str] = {}
+        self._stream: CancellableStream | None = None
+        self._watching = False
+        self._closed = False
+
+    def _ensure_watching(self) -> None:
+        with self._condition:
+            if self._watching:
+                return
+            self._stream = self._client.events(
+                decode=True,
+                filters={"type": "container", "label": "pytest_databases", "event": ["health_status", "die"]},
+            )
+            self._watching = True
+            threading.Thread(
+                target=self._watch,
+                args=(self._stream,),
+                name="pytest-databases-health",
+                daemon=True,
+            ).start()
+
+    def _record(self, event: dict[str, Any]) -> None:
+        # the legacy top-level 'id' and 'status' fields are left out by newer API versions
+        container_id = (event.get("Actor") or {}).get("ID") or event.get("id")
+        if container_id is None:
+            return
+        action = event.get("Action") or event.get("status", "")
+        # health events come as e.g. 'health_status: healthy'
+        status = "exited" if action == "die" else action.rpartition(":")[2].strip()
+        with self._condition:
+            self._statuses[container_id] = status
+            self._condition.notify_all()
+
+    def _watch(self, stream: CancellableStream) -> None:
+        try:
+            for event in stream:
+                self._record(event)
+        except (OSError, StreamParseError):
+            # raised when the stream is closed from another thread, possibly
+            # in the middle of an event
+            return
+        finally:
+            with self._condition:
+                self._watching = False
+                self._condition.notify_all()
+
+    def wait(self, container: Container, timeout: float, pause: float = 1.0) -> bool:
+        """Wait until ``container`` reports itself healthy.
+
+        If the event stream breaks, it is subscribed to again after ``pause``
+        seconds.
+
+        Returns:
+            ``False`` when the timeout expires or the container exits before it
+            became healthy.
+        """
+        deadline = time.monotonic() + timeout
+        while not self._closed:
+            self._ensure_watching()
+            # the container may have changed its state before the stream was subscribed
+            container.reload()
+            health = container.attrs["State"].get("Health") or {}
+            if health.get("Status") == "healthy":
+                return True
+            if container.status in {"exited", "dead"}:
+                return False
+
+            with self._condition:
+                while self._watching:
+                    status = self._statuses.get(container.id)  # type: ignore[arg-type]
+                    if status == "healthy":
+                        return True
+                    remaining = deadline - time.monotonic()
+                    if status == "exited" or remaining <= 0:
+                        return False
+                    self._condition.wait(remaining)
+            # the stream broke; resubscribe and look at the container again, but
+            # not right away, since a daemon restarting or a proxy closing long
+            # polls may end every new stream at once as well
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(pause, remaining))
+        return False
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            stream = self._stream if self._watching else None
+        if stream is not None:
+            stream.close()
+
 
 class DockerService(AbstractContextManager):
     def __init__(
@@ -93,16 +882,34 @@ class DockerService(AbstractContextManager):
         self._tmp_path = tmp_path
         self._session = session
         self._is_xdist = get_xdist_worker_id() is not None
+        self._reuse = _reuse_enabled(session.config)
+        self._snapshots = bool(session.config.getoption("databases_snapshots", default=False))
+        self._pending_snapshots: dict[str, str] = {}
+        self._tmpfs_size = session.config.getoption("databases_tmpfs_size", default=DEFAULT_TMPFS_SIZE)
+        self._image_cache = _get_image_cache(session.config)
+        self._allocate_ports = client.api.base_url in LOCAL_SOCKET_BASE_URLS
+        self._exit_stack = ExitStack()
+        self._services: dict[str, ServiceContainer] = {}
+        self._setups: dict[str, str] = {}
+        self._name_locks: dict[str, threading.Lock] = {}
+        self._registry_lock = threading.Lock()
+        self._health_watcher = _HealthWatcher(client)
+        self._timings = session.config.stash.get(_timings_key, None)
+        self._detach_teardown = _detach_teardown_enabled(session.config)
+        self._owner = session.config.stash[_owner_key]
+        self._ttl = session.config.getoption("databases_container_ttl", default=DEFAULT_CONTAINER_TTL)
 
     def __enter__(self) -> Self:
+        if self._session.config.getoption("databases_clear_snapshots", default=False):
+            self._clear_snapshots()
         if self._is_xdist:
             ctrl_file = _get_ctrl_file(self._session)
             with filelock.FileLock(ctrl_file.with_suffix(".lock")):
                 if not ctrl_file.exists():
                     ctrl_file.touch()
-                    self._stop_all_containers()
+                    _reap_stale_containers(self._client)
         else:
-            self._stop_all_containers()
+            _reap_stale_containers(self._client)
         return self
 
     def __exit__(
@@ -112,12 +919,17 @@ class DockerService(AbstractContextManager):
         __exc_value: BaseException | None,
         __traceback: TracebackType | None,
     ) -> None:
-        if not self._is_xdist:
-            self._stop_all_containers()
+        self._exit_stack.close()
+        self._health_watcher.close()
+        if not self._is_xdist and not self._reuse:
+            self._stop_all_containers(detach=self._detach_teardown)
 
-    def _get_container(self, name: str) -> Container | None:
+    def _get_container(self, name: str, include_stopped: bool = False) -> Container | None:
+        # only containers of this session, or the shared ones of --reuse-databases
+        scope = REUSE_LABEL if self._reuse else f"{SESSION_LABEL}={self._owner.id}"
         containers = self._client.containers.list(
-            filters={"name": name},
+            all=include_stopped,
+            filters={"label": [f"{NAME_LABEL}={name}", scope]},
         )
         if len(containers) > 1:
             msg = "More than one running container found"
@@ -126,8 +938,195 @@ class DockerService(AbstractContextManager):
             return containers[0]
         return None
 
-    def _stop_all_containers(self) -> None:
-        _stop_all_containers(self._client)
+    def _stop_all_containers(self, detach: bool = False) -> None:
+        _stop_all_containers(self._client, self._owner.id, detach=detach, timings=self._timings)
+
+    def _make_labels(self, name: str, fingerprint: str) -> dict[str, str]:
+        labels = {"pytest_databases": "", NAME_LABEL: name, FINGERPRINT_LABEL: fingerprint}
+        if self._reuse:
+            labels[REUSE_LABEL] = ""
+        else:
+            labels.update({
+                SESSION_LABEL: self._owner.id,
+                OWNER_PID_LABEL: str(self._owner.pid),
+                OWNER_HOST_LABEL: self._owner.host,
+                EXPIRES_LABEL: str(int(time.time()) + self._ttl),
+            })
+        return labels
+
+    def _clear_snapshots(self) -> None:
+        lock = filelock.FileLock(self._tmp_path / "snapshots.lock") if self._is_xdist else contextlib.nullcontext()
+        marker = self._tmp_path / "snapshots-cleared"
+        with lock:
+            if marker.exists():
+                return
+            for snapshot in self._client.images.list(name=SNAPSHOT_REPOSITORY):
+                with contextlib.suppress(APIError):
+                    self._client.images.remove(snapshot.id, force=True)
+            marker.touch()
+
+    def _has_image(self, image: str) -> bool:
+        try:
+            self._client.images.get(image)
+        except ImageNotFound:
+            return False
+        return True
+
+    def _ensure_image(self, image: str, platform_kwarg: dict[str, str], timings: ServiceTimings) -> Image:
+        with timings.measure("image"):
+            try:
+                return self._client.images.get(image)
+            except ImageNotFound:
+                pass
+        with timings.measure("pull"):
+            return _pull_image(
+                self._client,
+                image,
+                platform_kwarg,
+                lock_dir=self._tmp_path if self._is_xdist else None,
+                cache=self._image_cache,
+            )
+
+    def ensure_image(self, image: str, platform: str | None = None) -> Image:
+        """Return ``image``, pulling it first if it is not available locally.
+
+        Meant for helper images that fixtures run next to a service, such as
+        the client that creates the default MinIO bucket.
+        """
+        platform_kwarg = {} if platform is None else {"platform": platform}
+        return self._ensure_image(image, platform_kwarg, ServiceTimings())
+
+    def tmpfs(self, *paths: str) -> dict[str, str]:
+        """Build a ``tmpfs`` mapping for :meth:`run` that mounts each of ``paths`` in RAM.
+
+        Each mount is capped at ``--databases-tmpfs-size``.
+        """
+        return dict.fromkeys(paths, f"rw,size={self._tmpfs_size}")
+
+    @property
+    def snapshots_enabled(self) -> bool:
+        return self._snapshots
+
+    def commit_snapshot(self, service: ServiceContainer) -> None:
+        """Commit the container of ``service`` so later sessions can skip its initialization.
+
+        Call this once the one-time setup of a service started with ``run(snapshot=...)``
+        is done. It does nothing unless ``--databases-snapshots`` is set and this
+        process created the container from the base image. Containers that keep
+        their data in volumes or tmpfs mounts cannot be snapshotted, since
+        ``docker commit`` includes neither.
+        """
+        container = service.container
+        tag = self._pending_snapshots.pop(container.id, None)  # type: ignore[arg-type]
+        if tag is None:
+            return
+
+        container.reload()
+        mounts = [mount["Destination"] for mount in container.attrs.get("Mounts", []) if mount.get("Type") == "volume"]
+        mounts.extend(container.attrs["HostConfig"].get("Tmpfs") or {})
+        if mounts:
+            warnings.warn(
+                f"Not snapshotting {container.name!r}: its data lives in volumes or tmpfs mounts {mounts}, "
+                "which are not committed",
+                stacklevel=2,
+            )
+            return
+
+        repository, _, snapshot_key = tag.partition(":")
+        lock = filelock.FileLock(self._tmp_path / tag.replace(":", "_")) if self._is_xdist else contextlib.nullcontext()
+        with lock:
+            if not self._has_image(tag):
+                container.commit(repository=repository, tag=snapshot_key)
+
+    def _publish(self, name: str, fingerprint: str, service: ServiceContainer) -> None:
+        """Share a ready service with the other xdist workers through the base temp dir."""
+        record = {
+            "fingerprint": fingerprint,
+            "host": service.host,
+            "port": service.port,
+            "id": service.container.id,
+        }
+        published = self._tmp_path / f"{name}.json"
+        # workers read the record without the lock, so it must never be half-written
+        partial = published.with_name(f"{published.name}.{os.getpid()}.partial")
+        partial.write_text(json.dumps(record))
+        partial.replace(published)
+
+    def _attach_published(self, name: str, fingerprint: str, container_host: str) -> ServiceContainer | None:
+        """Return the service published by another worker, if its container still runs."""
+        published = self._tmp_path / f"{name}.json"
+        if not published.exists():
+            return None
+        record = json.loads(published.read_text())
+        if record["fingerprint"] != fingerprint or record["host"] != container_host:
+            return None
+        try:
+            container = self._client.containers.get(record["id"])
+        except NotFound:
+            return None
+        if container.status != "running":
+            return None
+        return ServiceContainer(container=container, host=record["host"], port=record["port"])
+
+    def _get_name_lock(self, name: str) -> threading.Lock:
+        with self._registry_lock:
+            return self._name_locks.setdefault(name, threading.Lock())
+
+    @contextmanager
+    def run_many(
+        self,
+        *specs: dict[str, Any],
+        max_workers: int | None = None,
+    ) -> Generator[list[ServiceContainer], None, None]:
+        """Start several services concurrently.
+
+        Every spec is a mapping of keyword arguments accepted by :meth:`run`. The
+        containers are created and their readiness checks run in a thread pool, so
+        startup takes as long as the slowest service instead of the sum of all of
+        them. While the context is active, :meth:`run` calls for one of these
+        services return the already-ready container without waiting again. They
+        must pass the same arguments, except for the readiness ones (``check``,
+        ``wait_for_log``, ``timeout``, ``pause``) and ``transient``, or they raise
+        ``ValueError``.
+
+        The service fixtures of pytest-databases are started concurrently with
+        ``--databases-eager-start`` instead.
+
+        Args:
+            *specs: Keyword arguments for :meth:`run`, one mapping per service.
+            max_workers: Maximum number of services started at the same time.
+                Defaults to starting all of them at once.
+
+        Yields:
+            The started services, in the order of ``specs``.
+        """
+        runs = [self.run(**spec) for spec in specs]
+        with ExitStack() as stack:
+            with ThreadPoolExecutor(max_workers=max_workers or max(len(runs), 1)) as pool:
+                futures = [pool.submit(run.__enter__) for run in runs]
+
+            services: list[ServiceContainer] = []
+            errors: list[BaseException] = []
+            for run, future in zip(runs, futures):
+                exc = future.exception()
+                if exc is None:
+                    stack.push(run.__exit__)
+                    services.append(future.result())
+                else:
+                    errors.append(exc)
+            if errors:
+                raise errors[0]
+
+            yield services
+
+    def warm_up(self, *specs: dict[str, Any], max_workers: int | None = None) -> list[ServiceContainer]:
+        """Start several services concurrently and keep them for the rest of the session.
+
+        This is :meth:`run_many` bound to the lifetime of this ``DockerService``,
+        meant to be called from a session-scoped fixture before the service
+        fixtures themselves are requested.
+        """
+        return self._exit_stack.enter_context(self.run_many(*specs, max_workers=max_workers))
 
     @contextmanager
     def run(
@@ -150,134 +1149,396 @@ class DockerService(AbstractContextManager):
         platform: str | None = None,
         protocol: str = "tcp",
         host_port: int | None = None,
+        healthcheck: dict[str, Any] | None = None,
+        snapshot: str | None = None,
+        tmpfs: dict[str, str] | None = None,
     ) -> Generator[ServiceContainer, None, None]:
         # ``host_port`` is honored only when a new container is created; if an
         # existing container is reused via ``_get_container(name)`` the request
         # is ignored and the existing port mapping wins (gh-131).
-        if check is None and wait_for_log is None:
-            msg = "Must set at least check or wait_for_log"
+        # ``healthcheck`` is passed to the container as its HEALTHCHECK; readiness
+        # then waits for the daemon's ``health_status`` events instead of polling.
+        # ``snapshot`` describes the one-time setup of the service (e.g. its setup
+        # SQL); with ``--databases-snapshots`` it keys the image committed by
+        # ``commit_snapshot()`` that later sessions start from.
+        # ``tmpfs`` maps container paths to tmpfs mount options (see ``tmpfs()``).
+        if check is None and wait_for_log is None and healthcheck is None:
+            msg = "Must set at least check, wait_for_log or healthcheck"
             raise ValueError(msg)
 
+        name = f"pytest_databases_{name}"
+        # what a run() of a service that is already running must agree on, as it
+        # is handed that service as it is
+        setup = _make_fingerprint(
+            image=image,
+            command=command,
+            env=env,
+            container_port=container_port,
+            container_host=container_host,
+            host_port=host_port,
+            protocol=protocol,
+            ulimits=ulimits,
+            shm_size=shm_size,
+            mem_limit=mem_limit,
+            platform=platform,
+            healthcheck=healthcheck,
+            tmpfs=tmpfs,
+            exec_after_start=exec_after_start,
+            snapshot=snapshot,
+        )
+        with self._get_name_lock(name):
+            service = self._services.get(name)
+            owner = service is None
+            if service is not None and self._setups[name] != setup:
+                msg = (
+                    f"Service {name!r} is already running with different settings; "
+                    "start it with the same arguments as the run() or run_many() that started it"
+                )
+                raise ValueError(msg)
+            if service is None:
+                service = self._start(
+                    image=image,
+                    container_port=container_port,
+                    name=name,
+                    container_host=container_host,
+                    command=command,
+                    env=env,
+                    exec_after_start=exec_after_start,
+                    check=check,
+                    wait_for_log=wait_for_log,
+                    timeout=timeout,
+                    pause=pause,
+                    ulimits=ulimits,
+                    shm_size=shm_size,
+                    mem_limit=mem_limit,
+                    platform=platform,
+                    protocol=protocol,
+                    host_port=host_port,
+                    healthcheck=healthcheck,
+                    snapshot=snapshot,
+                    tmpfs=tmpfs,
+                )
+                with self._registry_lock:
+                    self._services[name] = service
+                    self._setups[name] = setup
+
+        if not owner:
+            # already started (and checked) by an enclosing run(), e.g. through
+            # run_many(); the owning call is responsible for the teardown
+            yield service
+            return
+
+        try:
+            yield service
+        finally:
+            with self._registry_lock:
+                self._services.pop(name, None)
+                self._setups.pop(name, None)
+            if transient and not self._reuse:
+                with service.timings.measure("teardown"):
+                    # throwaway container: kill it rather than wait out a graceful stop
+                    _remove_containers(self._client, [service.container.id])  # type: ignore[list-item]
+                    (self._tmp_path / f"{name}.json").unlink(missing_ok=True)
+            if self._timings is not None:
+                self._timings.append(_make_timings_record(name, service.timings))
+
+    def _start(
+        self,
+        image: str,
+        container_port: int,
+        name: str,
+        container_host: str,
+        command: str | None,
+        env: dict[str, Any] | None,
+        exec_after_start: str | list[str] | None,
+        check: Callable[[ServiceContainer], bool] | None,
+        wait_for_log: str | bytes | None,
+        timeout: int,
+        pause: float,
+        ulimits: list[Ulimit] | None,
+        shm_size: int | None,
+        mem_limit: str | None,
+        platform: str | None,
+        protocol: str,
+        host_port: int | None,
+        healthcheck: dict[str, Any] | None,
+        snapshot: str | None,
+        tmpfs: dict[str, str] | None,
+    ) -> ServiceContainer:
         platform_kwarg = {}
         if platform is not None:
             platform_kwarg = {"platform": platform}
+        timings = ServiceTimings()
 
-        name = f"pytest_databases_{name}"
-        lock = filelock.FileLock(self._tmp_path / name) if self._is_xdist else contextlib.nullcontext()
-        with lock:
-            container = self._get_container(name)
-            try:
-                self._client.images.get(image)
-            except ImageNotFound:
-                # Registries can fail transiently: Docker Hub rate-limits
-                # anonymous pulls with 500s, MCR's WAF returns 404s wrapping
-                # a block page. Retry a few times before giving up.
-                for attempt in range(3):
-                    try:
-                        self._client.images.pull(*image.rsplit(":", maxsplit=1), **platform_kwarg)  # pyright: ignore[reportCallIssue,reportArgumentType]
-                        break
-                    except (APIError, ImageNotFound):
-                        if attempt == 2:
-                            raise
-                        time.sleep(2**attempt)
+        fingerprint = _make_fingerprint(
+            image=image,
+            command=command,
+            env=env,
+            container_port=container_port,
+            host_port=host_port,
+            protocol=protocol,
+            ulimits=ulimits,
+            shm_size=shm_size,
+            mem_limit=mem_limit,
+            platform=platform,
+            healthcheck=healthcheck,
+            tmpfs=tmpfs,
+        )
+        # under xdist, the first worker to get here starts the service and
+        # publishes it once it is ready; the others take it from there, without
+        # waiting for each other on the lock once it is published
+        service = self._attach_published(name, fingerprint, container_host) if self._is_xdist else None
+        lock = (
+            filelock.FileLock(self._tmp_path / name) if self._is_xdist and service is None else contextlib.nullcontext()
+        )
+        with ExitStack() as locked:
+            with timings.measure("lock"):
+                locked.enter_context(lock)
+            if service is None and self._is_xdist:
+                service = self._attach_published(name, fingerprint, container_host)
+            if service is None:
+                container, port = self._get_or_create_container(
+                    name,
+                    fingerprint,
+                    image=image,
+                    command=command,
+                    env=env,
+                    container_port=container_port,
+                    host_port=host_port,
+                    protocol=protocol,
+                    ulimits=ulimits,
+                    shm_size=shm_size,
+                    mem_limit=mem_limit,
+                    platform_kwarg=platform_kwarg,
+                    healthcheck=healthcheck,
+                    snapshot=snapshot,
+                    tmpfs=tmpfs,
+                    timings=timings,
+                )
+
+                service = ServiceContainer(
+                    container=container,
+                    host=container_host,
+                    port=port,
+                )
+                service.timings = timings
+                self._wait_until_ready(
+                    service,
+                    name,
+                    check=check,
+                    wait_for_log=wait_for_log,
+                    healthcheck=healthcheck is not None,
+                    timeout=timeout,
+                    pause=pause,
+                )
+                if self._is_xdist:
+                    self._publish(name, fingerprint, service)
+
+        service.timings = timings
+        if exec_after_start:
+            with timings.measure("exec"):
+                service.container.exec_run(exec_after_start)
+
+        return service
+
+    def _get_or_create_container(
+        self,
+        name: str,
+        fingerprint: str,
+        image: str,
+        command: str | None,
+        env: dict[str, Any] | None,
+        container_port: int,
+        host_port: int | None,
+        protocol: str,
+        ulimits: list[Ulimit] | None,
+        shm_size: int | None,
+        mem_limit: str | None,
+        platform_kwarg: dict[str, str],
+        healthcheck: dict[str, Any] | None,
+        snapshot: str | None,
+        tmpfs: dict[str, str] | None,
+        timings: ServiceTimings,
+    ) -> tuple[Container, int]:
+        container = self._get_container(name, include_stopped=self._reuse)
+        if (
+            container is not None
+            and self._reuse
+            and (container.status != "running" or container.labels.get(FINGERPRINT_LABEL) != fingerprint)
+        ):
+            # left behind by an earlier session with a different configuration,
+            # or not running anymore; replace it
+            container.remove(force=True)
+            container = None
+        base_image = self._ensure_image(image, platform_kwarg, timings)
+        snapshot_tag = None
+        if snapshot is not None and self._snapshots:
+            snapshot_tag = _make_snapshot_tag(image_id=base_image.id, command=command, env=env, snapshot=snapshot)
+
+        if container is None:
+            run_image = image
+            if snapshot_tag is not None and self._has_image(snapshot_tag):
+                # initialized by an earlier session; start from the committed state
+                run_image = snapshot_tag
+                snapshot_tag = None
+            container, allocated_port = self._create_container(
+                name,
+                fingerprint,
+                run_image,
+                command=command,
+                env=env,
+                container_port=container_port,
+                host_port=host_port,
+                protocol=protocol,
+                ulimits=ulimits,
+                shm_size=shm_size,
+                mem_limit=mem_limit,
+                platform_kwarg=platform_kwarg,
+                healthcheck=healthcheck,
+                tmpfs=tmpfs,
+                timings=timings,
+            )
+            if snapshot_tag is not None:
+                self._pending_snapshots[container.id] = snapshot_tag  # type: ignore[index]
+            if allocated_port is not None:
+                return container, allocated_port
+
+        return container, _get_host_port(container, container_port, protocol)
+
+    def _create_container(
+        self,
+        name: str,
+        fingerprint: str,
+        image: str,
+        command: str | None,
+        env: dict[str, Any] | None,
+        container_port: int,
+        host_port: int | None,
+        protocol: str,
+        ulimits: list[Ulimit] | None,
+        shm_size: int | None,
+        mem_limit: str | None,
+        platform_kwarg: dict[str, str],
+        healthcheck: dict[str, Any] | None,
+        tmpfs: dict[str, str] | None,
+        timings: ServiceTimings,
+    ) -> tuple[Container, int | None]:
+        """Create and start a container.
 
-            if container is None:
-                container = self._client.containers.run(  # pyright: ignore[reportCallIssue,reportArgumentType]
+        Returns the container and, if the host port was allocated here, that port.
+        Otherwise the port is only known once Docker reports the binding.
+        """
+        # a port reserved up front is known without asking Docker for the binding;
+        # only possible when the daemon shares our network namespace, i.e. is
+        # reached through a local socket
+        allocate = host_port is None and protocol == "tcp" and self._allocate_ports
+        for attempt in range(PORT_ALLOCATION_ATTEMPTS):
+            port = _allocate_host_port(self._tmp_path) if allocate else host_port
+            with timings.measure("create"):
+                container = self._client.containers.create(  # pyright: ignore[reportCallIssue,reportArgumentType]
                     image,
                     command,
-                    detach=True,
-                    remove=True,
-                    ports={container_port: host_port},  # pyright: ignore[reportArgumentType]
-                    labels=["pytest_databases"],
-                    name=name,
+                    ports={container_port: port},  # pyright: ignore[reportArgumentType]
+                    labels=self._make_labels(name, fingerprint),
+                    # reused containers keep their name across sessions, the others
+                    # must not clash with those of concurrent sessions
+                    name=name if self._reuse else f"{name}_{self._owner.id}",
                     environment=env,
                     ulimits=ulimits,
                     mem_limit=mem_limit,
+                    shm_size=shm_size,
+                    tmpfs=tmpfs,
+                    healthcheck=healthcheck,
                     **platform_kwarg,  # pyright: ignore[reportArgumentType]
                 )
+                try:
+                    container.start()
+                except APIError as exc:
+                    container.remove(force=True)
+                    # another process took the port between its allocation and now
+                    if not allocate or attempt == PORT_ALLOCATION_ATTEMPTS - 1 or not _is_port_conflict(exc):
+                        raise
+                    continue
+            if allocate:
+                return container, port
+            break
 
-                # reload the container; sometimes it can take a while before docker
-                # spins it up and the metadata becomes available, so we're redoing the
-                # check with a small incremental backup here
-                for i in range(10):
-                    container.reload()
-                    if any(v for v in container.ports.values()):
-                        break
-                    time.sleep(0.1 + (i / 10))
-                else:
-                    msg = f"Service {name!r} failed to create container"
-                    raise ValueError(msg)
-
-        # Get port binding based on protocol configuration
-        binding = None
-        if protocol == "both":
-            binding = container.ports.get(f"{container_port}/tcp") or container.ports.get(f"{container_port}/udp")
-        elif protocol in {"tcp", "udp"}:
-            binding = container.ports.get(f"{container_port}/{protocol}")
-        else:
-            msg = f"Invalid protocol '{protocol}'. Must be 'tcp', 'udp', or 'both'."
-            raise ValueError(msg)
-
-        if not binding:
-            msg = (
-                f"Container port {container_port}/{protocol} not found in exposed ports. "
-                f"Available ports: {list(container.ports.keys())}"
-            )
-            raise RuntimeError(msg)
-
-        host_port = int(binding[0]["HostPort"])
-        service = ServiceContainer(
-            container=container,
-            host=container_host,
-            port=host_port,
-        )
+        # reload the container; sometimes it can take a while before docker
+        # spins it up and the metadata becomes available, so we're redoing the
+        # check with a small incremental backup here
+        with timings.measure("ports"):
+            for i in range(10):
+                container.reload()
+                if any(v for v in container.ports.values()):
+                    break
+                time.sleep(0.1 + (i / 10))
+            else:
+                msg = f"Service {name!r} failed to create container"
+                raise ValueError(msg)
+        return container, None
 
+    def _wait_until_ready(
+        self,
+        service: ServiceContainer,
+        name: str,
+        check: Callable[[ServiceContainer], bool] | None,
+        wait_for_log: str | bytes | None,
+        healthcheck: bool,
+        timeout: int,
+        pause: float,
+    ) -> None:
+        container = service.container
+        timings = service.timings
         started = time.time()
         if wait_for_log:
             if isinstance(wait_for_log, str):
                 wait_for_log = wait_for_log.encode()
-            while time.time() - started < timeout:
-                if wait_for_log in container.logs():
-                    break
-                time.sleep(pause)
-            else:
+            with timings.measure("log"):
+                found = _wait_for_log(container, wait_for_log, timeout=timeout)
+            if not found:
+                _raise_if_exited(container, name)
                 msg = f"Service {name!r} failed to come online"
                 raise ValueError(msg)
 
-        if check:
-            while time.time() - started < timeout:
-                if check(service) is True:
-                    break
-                time.sleep(pause)
-            else:
+        if healthcheck:
+            with timings.measure("health"):
+                healthy = self._health_watcher.wait(container, timeout=timeout - (time.time() - started), pause=pause)
+            if not healthy:
+                _raise_if_exited(container, name)
                 msg = f"Service {name!r} failed to come online"
                 raise ValueError(msg)
 
-        if exec_after_start:
-            container.exec_run(exec_after_start)
+        if check:
+            with timings.measure("check"):
+                while time.time() - started < timeout:
+                    timings.check_attempts += 1
+                    if check(service) is True:
+                        break
+                    _raise_if_exited(container, name)
+                    time.sleep(pause)
+                else:
+                    msg = f"Service {name!r} failed to come online"
+                    raise ValueError(msg)
 
-        try:
-            yield service
-        finally:
-            if transient:
-                try:
-                    container.stop()
-                    container.remove(force=True)
-                except APIError as exc:  # pyright: ignore[reportAttributeAccessIssue]
-                    # '409 - Conflict' means removal is already in progress. this is the
-                    # safest way of delaying with it, since the API is a bit borked when it
-                    # comes to concurrent requests
-                    if exc.status_code not in {409, 404}:
-                        raise
+
+@pytest.fixture(scope="session")
+def docker_client(request: pytest.FixtureRequest) -> DockerClient:
+    return _get_session_docker_client(request.config)
 
 
 @pytest.fixture(scope="session")
-def docker_client() -> Generator[DockerClient, None, None]:
-    client = get_docker_client()
-    try:
-        yield client
-    finally:
-        client.close()
+def database_profile() -> DatabaseProfile:
+    """Server settings profile the database fixtures start with.
+
+    ``"fast"`` turns off the durability settings (``fsync``, log flushing on
+    commit, binary logs) of the engines that support it. The data is then lost
+    if the server crashes, which is fine for throwaway test databases.
+    """
+    profile = os.environ.get("DATABASE_PROFILE", "default")
+    if profile not in get_args(DatabaseProfile):
+        msg = f"DATABASE_PROFILE must be one of {get_args(DatabaseProfile)}, got {profile!r}"
+        raise ValueError(msg)
+    return profile  # type: ignore[return-value]
 
 
 @pytest.fixture(scope="session")
@@ -295,6 +1556,234 @@ def docker_service(
         yield service
 
 
+class _EagerStart:
+    """Runs the session-scoped service fixtures of pytest-databases ahead of the tests using them.
+
+    The fixture functions are called in a thread pool with their arguments resolved
+    through pytest, and :func:`pytest_fixture_setup` hands their result to pytest
+    when a test requests them, so teardown order is the same as without eager start.
+    """
+
+    def __init__(self, fixturedefs: list[pytest.FixtureDef[Any]]) -> None:
+        self._fixturedefs = fixturedefs
+        self._futures: dict[pytest.FixtureDef[Any], Future[tuple[Any, Generator[Any, None, None] | None]]] = {}
+        self._pool: ThreadPoolExecutor | None = None
+
+    @staticmethod
+    def _call(func: Callable[..., Any], kwargs: dict[str, Any]) -> tuple[Any, Generator[Any, None, None] | None]:
+        if not inspect.isgeneratorfunction(func):
+            return func(**kwargs), None
+        generator = func(**kwargs)
+        return next(generator), generator
+
+    def start(self, request: pytest.FixtureRequest) -> None:
+        names = {fixturedef.argname for fixturedef in self._fixturedefs}
+        fixturedefs = [
+            fixturedef
+            for fixturedef in self._fixturedefs
+            # aliases like postgres_service -> postgres_17_service get the started
+            # service from their dependency once a test requests them
+            if not names.intersection(fixturedef.argnames) and "request" not in fixturedef.argnames
+        ]
+        if not fixturedefs:
+            return
+        self._pool = ThreadPoolExecutor(max_workers=len(fixturedefs), thread_name_prefix="pytest-databases-eager")
+        for fixturedef in fixturedefs:
+            kwargs = {argname: request.getfixturevalue(argname) for argname in fixturedef.argnames}
+            self._futures[fixturedef] = self._pool.submit(self._call, fixturedef.func, kwargs)
+
+    def join(self, fixturedef: pytest.FixtureDef[Any], request: pytest.FixtureRequest) -> Any:
+        future = self._futures.pop(fixturedef, None)
+        if future is None or future.exception() is not None:
+            # pytest runs the fixture itself, and reports and caches its error
+            return None
+        result, generator = future.result()
+        if generator is not None:
+            fixturedef.addfinalizer(functools.partial(self._finish, generator))
+        # the layout of pytest's own pytest_fixture_setup for a successful setup,
+        # the same in all versions of EAGER_START_PYTEST_VERSIONS
+        fixturedef.cached_result = (result, fixturedef.cache_key(request), None)  # type: ignore[arg-type]
+        return result
+
+    @staticmethod
+    def _finish(generator: Generator[Any, None, None]) -> None:
+        with contextlib.suppress(StopIteration):
+            next(generator)
+
+    def close(self) -> None:
+        """Tear down the services that were started but never requested, e.g. after ``-x``."""
+        futures, self._futures = self._futures, {}
+        for future in futures.values():
+            # a service that failed to start is reported by the tests requesting it, if any ran
+            if future.exception() is None:
+                _, generator = future.result()
+                if generator is not None:
+                    self._finish(generator)
+        if self._pool is not None:
+            self._pool.shutdown()
+
+
+def _is_bundled_fixture(fixturedef: pytest.FixtureDef[Any]) -> bool:
+    return getattr(fixturedef.func, "__module__", "").startswith("pytest_databases.docker.")
+
+
+def _is_eager_fixture(fixturedef: pytest.FixtureDef[Any]) -> bool:
+    return (
+        fixturedef.scope == "session"
+        and fixturedef.argname.endswith("_service")
+        and fixturedef.params is None
+        and _is_bundled_fixture(fixturedef)
+    )
+
+
+def _is_constant_fixture(fixturedef: pytest.FixtureDef[Any]) -> bool:
+    # bundled fixtures like these return a constant, so they can be called
+    # outside a test; fixtures defined by users may have side effects
+    return (
+        fixturedef.scope == "session"
+        and fixturedef.params is None
+        and not fixturedef.argnames
+        and _is_bundled_fixture(fixturedef)
+    )
+
+
+def _is_image_fixture(fixturedef: pytest.FixtureDef[Any]) -> bool:
+    return fixturedef.argname.endswith("_image") and _is_constant_fixture(fixturedef)
+
+
+def _resolves_globally(fixturedef: pytest.FixtureDef[Any], name2fixturedefs: dict[str, Any]) -> bool:
+    """Whether the arguments of ``fixturedef`` resolve the same way for every test.
+
+    Eager start resolves them for the first test, so a dependency overridden
+    for a directory or module, e.g. ``postgres_image`` in a nested
+    ``conftest.py``, would otherwise be used for tests elsewhere.
+    """
+    seen: set[str] = set()
+    pending = list(fixturedef.argnames)
+    while pending:
+        name = pending.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        for definition in name2fixturedefs.get(name, ()):
+            # plugins and the root conftest.py have an empty base id
+            if definition.baseid:
+                return False
+            pending.extend(definition.argnames)
+    return True
+
+
+def _eager_start_supported(version: str) -> bool:
+    major, minor = (int(part) for part in version.split(".")[:2])
+    return EAGER_START_PYTEST_VERSIONS[0] <= (major, minor) < EAGER_START_PYTEST_VERSIONS[1]
+
+
+def _collect_eager_fixturedefs(items: list[pytest.Item]) -> list[pytest.FixtureDef[Any]]:
+    fixturedefs: dict[pytest.FixtureDef[Any], None] = {}
+    local: set[pytest.FixtureDef[Any]] = set()
+    for item in items:
+        fixtureinfo = getattr(item, "_fixtureinfo", None)
+        if fixtureinfo is None:
+            continue
+        for fixturedef in _visible_fixturedefs(item).values():
+            if not _is_eager_fixture(fixturedef):
+                continue
+            if _resolves_globally(fixturedef, fixtureinfo.name2fixturedefs):
+                fixturedefs[fixturedef] = None
+            else:
+                local.add(fixturedef)
+    return [fixturedef for fixturedef in fixturedefs if fixturedef not in local]
+
+
+def _visible_fixturedefs(item: pytest.Item) -> dict[str, pytest.FixtureDef[Any]]:
+    fixtureinfo = getattr(item, "_fixtureinfo", None)
+    if fixtureinfo is None:
+        return {}
+    visible = {}
+    for name in fixtureinfo.names_closure:
+        # the last definition is the one visible to this item, so fixtures
+        # overridden in a conftest are honoured
+        definitions = fixtureinfo.name2fixturedefs.get(name)
+        if definitions:
+            visible[name] = definitions[-1]
+    return visible
+
+
+def _collect_images(items: list[pytest.Item]) -> tuple[list[str], dict[str, str]]:
+    """Return the images of the bundled services the ``items`` use, and the platforms they are pinned to."""
+    images: set[str] = set()
+    platforms: dict[str, str] = {}
+    for item in items:
+        visible = _visible_fixturedefs(item)
+        for fixturedef in visible.values():
+            if not _is_image_fixture(fixturedef):
+                continue
+            image = fixturedef.func()
+            if not isinstance(image, str):
+                continue
+            if hasattr(sys.modules.get(fixturedef.func.__module__), "platform"):
+                # the provider runs its images on the platform of the `platform`
+                # fixture; an image pulled for another one would not be used
+                platform_fixturedef = visible.get("platform")
+                if platform_fixturedef is None or not _is_constant_fixture(platform_fixturedef):
+                    continue
+                platforms[image] = platform_fixturedef.func()
+            images.add(image)
+    return sorted(images), platforms
+
+
+def pytest_collection_finish(session: pytest.Session) -> None:
+    config = session.config
+    if config.getoption("databases_prefetch_images", default=False) and not config.option.collectonly:
+        images, platforms = _collect_images(session.items)
+        _prefetch_images(
+            _get_session_docker_client(config),
+            images,
+            max_workers=config.getoption("databases_prefetch_workers"),
+            lock_dir=_get_base_tmp_path(config._tmp_path_factory) if get_xdist_worker_id() is not None else None,  # type: ignore[attr-defined]
+            cache=_get_image_cache(config),
+            platforms=platforms,
+        )
+
+    if config.getoption("databases_eager_start", default=False):
+        if not _eager_start_supported(pytest.__version__):
+            warnings.warn(
+                f"--databases-eager-start is not supported with pytest {pytest.__version__}, "
+                "the services start when they are requested",
+                stacklevel=1,
+            )
+            return
+        fixturedefs = _collect_eager_fixturedefs(session.items)
+        if fixturedefs:
+            config.stash[_eager_start_key] = _EagerStart(fixturedefs)
+            for item in session.items:
+                if isinstance(item, pytest.Function):
+                    # set up before the other fixtures of the first test, and so
+                    # torn down after all of them
+                    item.fixturenames.insert(0, "_databases_eager_start")
+
+
+@pytest.fixture(scope="session")
+def _databases_eager_start(request: pytest.FixtureRequest) -> Generator[None, None, None]:
+    # requested by every test once --databases-eager-start found services to
+    # start, so the services start with the first test, after pytest has set up
+    # the session
+    eager_start = request.config.stash[_eager_start_key]
+    eager_start.start(request)
+    try:
+        yield
+    finally:
+        eager_start.close()
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_fixture_setup(fixturedef: pytest.FixtureDef[Any], request: pytest.FixtureRequest) -> Any:
+    eager_start = request.config.stash.get(_eager_start_key, None)
+    if eager_start is None:
+        return None
+    return eager_start.join(fixturedef, request)
+
+
 def _get_base_tmp_path(tmp_path_factory: pytest.TempPathFactory) -> pathlib.Path:
     tmp_path = tmp_path_factory.getbasetemp()
     if get_xdist_worker_id() is not None:
@@ -307,13 +1796,56 @@ def _get_ctrl_file(session: pytest.Session) -> pathlib.Path:
     return tmp_path / "ctrl"
 
 
-@pytest.hookimpl(wrapper=True)
+# innermost, so the containers are removed before the terminal summary is written
+@pytest.hookimpl(wrapper=True, trylast=True)
 def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> Generator[Any, Any, Any]:
     try:
         return (yield)
     finally:
-        if not hasattr(session.config, "workerinput") and _get_ctrl_file(session).exists():
+        if (
+            not hasattr(session.config, "workerinput")
+            and not _reuse_enabled(session.config)
+            and _get_ctrl_file(session).exists()
+        ):
             # if we're running on xdist, delete the ctrl file, telling the deamon proc
             # to stop all running containers.
             # when not running on xdist, containers are stopped by the service itself
-            _stop_all_containers(get_docker_client())
+            _stop_all_containers(
+                _get_session_docker_client(session.config),
+                session.config.stash[_owner_key].id,
+                detach=_detach_teardown_enabled(session.config),
+                timings=session.config.stash.get(_timings_key, None),
+            )
+
+        trace_path = session.config.getoption("databases_trace", default=None)
+        if trace_path and not hasattr(session.config, "workerinput"):
+            # by now the records of all xdist workers have arrived through pytest_testnodedown
+            trace = _make_trace(session.config.stash.get(_timings_key, []))
+            (session.config.invocation_params.dir / trace_path).write_text(json.dumps(trace))
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    client = config.stash.get(_docker_client_key, None)
+    if client is not None:
+        client.close()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node: Any) -> None:
+    node.workerinput[SESSION_WORKERINPUT_KEY] = dataclasses.asdict(node.config.stash[_owner_key])
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node: Any, error: Any) -> None:
+    records = node.config.stash.get(_timings_key, None)
+    if records is not None:
+        records.extend(getattr(node, "workeroutput", {}).get(TIMINGS_WORKEROUTPUT_KEY, []))
+
+
+def pytest_terminal_summary(terminalreporter: pytest.TerminalReporter, exitstatus: int, config: pytest.Config) -> None:
+    records = config.stash.get(_timings_key, None)
+    if not records or not config.getoption("databases_timings", default=False):
+        return
+    terminalreporter.write_sep("=", "pytest-databases timings")
+    for line in _format_timings(records):
+        terminalreporter.write_line(line)
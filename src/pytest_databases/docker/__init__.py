@@ -8,15 +8,13 @@ import timeit
 from contextlib import AbstractContextManager
 from typing import TYPE_CHECKING, Any, Callable
 
-from pytest_databases.helpers import simple_string_hash
+from pytest_databases.helpers import TRUE_VALUES, simple_string_hash
 
 if TYPE_CHECKING:
     from collections.abc import Awaitable, Generator, Iterable
     from pathlib import Path
     from types import TracebackType
 
-TRUE_VALUES = {"True", "true", "1", "yes", "y", "Y", "T", "on", "enabled", "ok"}
-
 
 def wait_until_responsive(
     check: Callable[..., bool],
@@ -42,9 +42,15 @@ def _create_account_options(number: int) -> list[tuple[str, str]]:
     return [(f"test_account_{i}", DEFAULT_ACCOUNT_KEY) for i in range(number)]
 
 
+@pytest.fixture(scope="session")
+def azure_blob_image() -> str:
+    return "mcr.microsoft.com/azure-storage/azurite"
+
+
 @pytest.fixture(scope="session")
 def azure_blob_service(
     docker_service: DockerService,
+    azure_blob_image: str,
     azurite_in_memory: bool,
     azure_blob_xdist_isolation_level: XdistIsolationLevel,
 ) -> Generator[ServiceContainer, None, None]:
@@ -68,7 +74,7 @@ def azure_blob_service(
             account_name, account_key = accounts[worker_num]
 
     with docker_service.run(
-        image="mcr.microsoft.com/azure-storage/azurite",
+        image=azure_blob_image,
         name=name,
         command=command,
         wait_for_log="Azurite Blob service successfully listens on",
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import dataclasses
+import os
 import time
 from typing import TYPE_CHECKING
 
 import pytest
 
-from pytest_databases.helpers import get_xdist_worker_num
+from pytest_databases.docker import TRUE_VALUES
+from pytest_databases.helpers import get_xdist_shard_num, get_xdist_worker_num
 from pytest_databases.types import ServiceContainer
 
 if TYPE_CHECKING:
@@ -83,6 +85,11 @@ def xdist_cockroachdb_isolation_level() -> XdistIsolationLevel:
     return "database"
 
 
+@pytest.fixture(scope="session")
+def xdist_cockroachdb_workers_per_server() -> int:
+    return 4
+
+
 @dataclasses.dataclass
 class CockroachDBService(ServiceContainer):
     database: str
@@ -93,11 +100,18 @@ def cockroachdb_image() -> str:
     return "cockroachdb/cockroach:latest"
 
 
+@pytest.fixture(scope="session")
+def cockroachdb_use_tmpfs() -> bool:
+    return os.environ.get("COCKROACHDB_USE_TMPFS", "False") in TRUE_VALUES
+
+
 @pytest.fixture(scope="session")
 def cockroachdb_service(
     docker_service: DockerService,
     xdist_cockroachdb_isolation_level: XdistIsolationLevel,
+    xdist_cockroachdb_workers_per_server: int,
     cockroachdb_image: str,
+    cockroachdb_use_tmpfs: bool,
 ) -> Generator[CockroachDBService, None, None]:
     def check(_service: ServiceContainer) -> bool:
         exit_code, _ = _exec_cockroach_sql(_service.container, "SELECT 1")
@@ -112,6 +126,8 @@ def cockroachdb_service(
             container_name += suffix
         else:
             db_name += suffix
+            if xdist_cockroachdb_isolation_level == "shard":
+                container_name += f"_shard_{get_xdist_shard_num(xdist_cockroachdb_workers_per_server)}"
 
     with docker_service.run(
         image=cockroachdb_image,
@@ -120,6 +136,7 @@ def cockroachdb_service(
         name=container_name,
         command="start-single-node --insecure",
         transient=xdist_cockroachdb_isolation_level == "server",
+        tmpfs=docker_service.tmpfs("/cockroach/cockroach-data") if cockroachdb_use_tmpfs else None,
     ) as service:
         _prepare_database(service.container, db_name)
 
@@ -9,6 +9,7 @@ from typing import TYPE_CHECKING
 import pytest
 from docker.errors import APIError, NotFound
 
+from pytest_databases._probes import mysql_ping
 from pytest_databases.helpers import get_xdist_worker_num
 from pytest_databases.types import ServiceContainer, XdistIsolationLevel
 
@@ -68,16 +69,7 @@ def _provide_dolt_service(
     database: str,
 ) -> Generator[DoltService, None, None]:
     def check(_service: ServiceContainer) -> bool:
-        container_name = f"pytest_databases_{name}"
-        container = docker_service._get_container(container_name)
-        if not container:
-            return False
-
-        # Attempt to run a simple SELECT 1 to ensure the server is fully ready
-        res = container.exec_run(
-            ["dolt", "sql", "-q", "SELECT 1"],
-        )
-        return res.exit_code == 0
+        return mysql_ping(_service.host, _service.port, user="root", password=root_password)
 
     worker_num = get_xdist_worker_num()
     db_name = "pytest_databases"
@@ -150,9 +142,15 @@ def _provide_dolt_service(
         )
 
 
+@pytest.fixture(scope="session")
+def dolt_image() -> str:
+    return "dolthub/dolt-sql-server:latest"
+
+
 @pytest.fixture(scope="session")
 def dolt_service(
     docker_service: DockerService,
+    dolt_image: str,
     xdist_dolt_isolation_level: XdistIsolationLevel,
     platform: str,
     dolt_user: str,
@@ -161,7 +159,7 @@ def dolt_service(
     dolt_database: str,
 ) -> Generator[DoltService, None, None]:
     with _provide_dolt_service(
-        image="dolthub/dolt-sql-server:latest",
+        image=dolt_image,
         name="dolt",
         docker_service=docker_service,
         isolation_level=xdist_dolt_isolation_level,
@@ -100,14 +100,20 @@ def _provide_elasticsearch_service(
         )
 
 
+@pytest.fixture(autouse=False, scope="session")
+def elasticsearch_7_image() -> str:
+    return "elasticsearch:7.17.19"
+
+
 @pytest.fixture(autouse=False, scope="session")
 def elasticsearch_7_service(
     docker_service: DockerService,
+    elasticsearch_7_image: str,
     elasticsearch_service_memory_limit: str,
 ) -> Generator[ElasticsearchService, None, None]:
     with _provide_elasticsearch_service(
         docker_service=docker_service,
-        image="elasticsearch:7.17.19",
+        image=elasticsearch_7_image,
         name="elasticsearch-7",
         client_cls=Elasticsearch7,
         memory_limit=elasticsearch_service_memory_limit,
@@ -115,14 +121,20 @@ def elasticsearch_7_service(
         yield service
 
 
+@pytest.fixture(autouse=False, scope="session")
+def elasticsearch_8_image() -> str:
+    return "elasticsearch:8.13.0"
+
+
 @pytest.fixture(autouse=False, scope="session")
 def elasticsearch_8_service(
     docker_service: DockerService,
+    elasticsearch_8_image: str,
     elasticsearch_service_memory_limit: str,
 ) -> Generator[ElasticsearchService, None, None]:
     with _provide_elasticsearch_service(
         docker_service=docker_service,
-        image="elasticsearch:8.13.0",
+        image=elasticsearch_8_image,
         name="elasticsearch-8",
         client_cls=Elasticsearch8,
         memory_limit=elasticsearch_service_memory_limit,
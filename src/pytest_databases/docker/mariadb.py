@@ -8,8 +8,10 @@ from typing import TYPE_CHECKING
 
 import pytest
 
-from pytest_databases.helpers import get_xdist_worker_num
-from pytest_databases.types import ServiceContainer, XdistIsolationLevel
+from pytest_databases._probes import mysql_ping
+from pytest_databases.docker import TRUE_VALUES
+from pytest_databases.helpers import get_xdist_shard_num, get_xdist_worker_num
+from pytest_databases.types import DatabaseProfile, ServiceContainer, XdistIsolationLevel
 
 if TYPE_CHECKING:
     from collections.abc import Generator, Iterator
@@ -17,6 +19,13 @@ if TYPE_CHECKING:
     from pytest_databases._service import DockerService
 
 
+FAST_PROFILE_COMMAND = "--innodb-flush-log-at-trx-commit=0 --sync-binlog=0"
+
+
+def _make_command(profile: DatabaseProfile) -> str | None:
+    return FAST_PROFILE_COMMAND if profile == "fast" else None
+
+
 def _output_to_bytes(output: bytes | Iterator[bytes]) -> bytes:
     if isinstance(output, bytes):
         return output
@@ -35,6 +44,16 @@ def xdist_mariadb_isolation_level() -> XdistIsolationLevel:
     return "database"
 
 
+@pytest.fixture(scope="session")
+def xdist_mariadb_workers_per_server() -> int:
+    return 4
+
+
+@pytest.fixture(scope="session")
+def mariadb_use_tmpfs() -> bool:
+    return os.environ.get("MARIADB_USE_TMPFS", "False") in TRUE_VALUES
+
+
 @pytest.fixture(scope="session")
 def mariadb_user() -> str:
     return os.getenv("MARIADB_USER", "app")
@@ -61,22 +80,16 @@ def _provide_mariadb_service(
     image: str,
     name: str,
     isolation_level: XdistIsolationLevel,
+    workers_per_server: int,
     user: str,
     password: str,
     root_password: str,
     database: str,
+    use_tmpfs: bool = False,
+    profile: DatabaseProfile = "default",
 ) -> Generator[MariaDBService, None, None]:
     def check(_service: ServiceContainer) -> bool:
-        container_name = f"pytest_databases_{name}"
-        container = docker_service._get_container(container_name)
-        if not container:
-            return False
-
-        # Attempt to run a simple SELECT 1 to ensure the server is fully ready
-        res = container.exec_run(
-            ["mariadb", "--user=root", f"--password={root_password}", "-e", "SELECT 1"],
-        )
-        return res.exit_code == 0
+        return mysql_ping(_service.host, _service.port, user="root", password=root_password)
 
     worker_num = get_xdist_worker_num()
     db_name = "pytest_databases"
@@ -86,12 +99,16 @@ def _provide_mariadb_service(
             name += suffix
         else:
             db_name += suffix
+            if isolation_level == "shard":
+                name += f"_shard_{get_xdist_shard_num(workers_per_server)}"
 
     with docker_service.run(
         image=image,
         check=check,
         container_port=3306,
         name=name,
+        # the binary log is off by default in the mariadb images
+        command=_make_command(profile),
         env={
             "MARIADB_ROOT_PASSWORD": root_password,
             "MARIADB_PASSWORD": password,
@@ -103,16 +120,13 @@ def _provide_mariadb_service(
         timeout=120,
         pause=1.0,
         transient=isolation_level == "server",
+        tmpfs=docker_service.tmpfs("/var/lib/mysql") if use_tmpfs else None,
     ) as service:
         # check() above only verifies root SELECT 1; that becomes true before
         # mariadb has fully provisioned the app user with the @'%' grant. Verify
         # the app user can actually reach db_name from any host before yielding,
         # otherwise tests race into 'Host not allowed' / 'access denied'.
-        container_name = f"pytest_databases_{name}"
-        container = docker_service._get_container(container_name)
-        if container is None:
-            msg = f"MariaDB container {container_name!r} disappeared after startup"
-            raise RuntimeError(msg)
+        container = service.container
 
         setup_sql = (
             f"CREATE DATABASE IF NOT EXISTS {db_name}; "
@@ -157,10 +171,19 @@ def _provide_mariadb_service(
         )
 
 
+@pytest.fixture(autouse=False, scope="session")
+def mariadb_113_image() -> str:
+    return "mariadb:11.3"
+
+
 @pytest.fixture(autouse=False, scope="session")
 def mariadb_113_service(
     docker_service: DockerService,
+    mariadb_113_image: str,
     xdist_mariadb_isolation_level: XdistIsolationLevel,
+    xdist_mariadb_workers_per_server: int,
+    mariadb_use_tmpfs: bool,
+    database_profile: DatabaseProfile,
     mariadb_user: str,
     mariadb_password: str,
     mariadb_root_password: str,
@@ -168,9 +191,12 @@ def mariadb_113_service(
 ) -> Generator[MariaDBService, None, None]:
     with _provide_mariadb_service(
         docker_service=docker_service,
-        image="mariadb:11.3",
+        image=mariadb_113_image,
         name="mariadb-11.3",
         isolation_level=xdist_mariadb_isolation_level,
+        workers_per_server=xdist_mariadb_workers_per_server,
+        use_tmpfs=mariadb_use_tmpfs,
+        profile=database_profile,
         user=mariadb_user,
         password=mariadb_password,
         root_password=mariadb_root_password,
@@ -179,10 +205,19 @@ def mariadb_113_service(
         yield service
 
 
+@pytest.fixture(autouse=False, scope="session")
+def mariadb_114_image() -> str:
+    return "mariadb:11.4"
+
+
 @pytest.fixture(autouse=False, scope="session")
 def mariadb_114_service(
     docker_service: DockerService,
+    mariadb_114_image: str,
     xdist_mariadb_isolation_level: XdistIsolationLevel,
+    xdist_mariadb_workers_per_server: int,
+    mariadb_use_tmpfs: bool,
+    database_profile: DatabaseProfile,
     mariadb_user: str,
     mariadb_password: str,
     mariadb_root_password: str,
@@ -190,9 +225,12 @@ def mariadb_114_service(
 ) -> Generator[MariaDBService, None, None]:
     with _provide_mariadb_service(
         docker_service=docker_service,
-        image="mariadb:11.4",
+        image=mariadb_114_image,
         name="mariadb-11.4",
         isolation_level=xdist_mariadb_isolation_level,
+        workers_per_server=xdist_mariadb_workers_per_server,
+        use_tmpfs=mariadb_use_tmpfs,
+        profile=database_profile,
         user=mariadb_user,
         password=mariadb_password,
         root_password=mariadb_root_password,
@@ -201,10 +239,19 @@ def mariadb_114_service(
         yield service
 
 
+@pytest.fixture(autouse=False, scope="session")
+def mariadb_122_image() -> str:
+    return "mariadb:12.2"
+
+
 @pytest.fixture(autouse=False, scope="session")
 def mariadb_122_service(
     docker_service: DockerService,
+    mariadb_122_image: str,
     xdist_mariadb_isolation_level: XdistIsolationLevel,
+    xdist_mariadb_workers_per_server: int,
+    mariadb_use_tmpfs: bool,
+    database_profile: DatabaseProfile,
     mariadb_user: str,
     mariadb_password: str,
     mariadb_root_password: str,
@@ -212,9 +259,12 @@ def mariadb_122_service(
 ) -> Generator[MariaDBService, None, None]:
     with _provide_mariadb_service(
         docker_service=docker_service,
-        image="mariadb:12.2",
+        image=mariadb_122_image,
         name="mariadb-12.2",
         isolation_level=xdist_mariadb_isolation_level,
+        workers_per_server=xdist_mariadb_workers_per_server,
+        use_tmpfs=mariadb_use_tmpfs,
+        profile=database_profile,
         user=mariadb_user,
         password=mariadb_password,
         root_password=mariadb_root_password,
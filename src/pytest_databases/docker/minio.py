@@ -8,7 +8,6 @@ from urllib.error import URLError
 from urllib.request import Request, urlopen
 
 import pytest
-from docker.errors import ImageNotFound
 
 from pytest_databases.docker import TRUE_VALUES
 from pytest_databases.helpers import get_xdist_worker_num
@@ -58,9 +57,22 @@ def minio_default_bucket_name(xdist_minio_isolation_level: XdistIsolationLevel)
     return "pytest-databases"
 
 
+@pytest.fixture(scope="session")
+def minio_image() -> str:
+    return "quay.io/minio/minio"
+
+
+@pytest.fixture(scope="session")
+def minio_client_image() -> str:
+    """Image of the ``mc`` client that creates the default bucket."""
+    return "minio/mc:latest"
+
+
 @pytest.fixture(scope="session")
 def minio_service(
     docker_service: "DockerService",
+    minio_image: str,
+    minio_client_image: str,
     minio_access_key: str,
     minio_secret_key: str,
     minio_secure: bool,
@@ -94,7 +106,7 @@ def minio_service(
     }
 
     with docker_service.run(
-        image="quay.io/minio/minio",
+        image=minio_image,
         name=name,
         command=command,
         container_port=9000,
@@ -110,10 +122,7 @@ def minio_service(
 
         client = docker_service._client
 
-        try:
-            client.images.get("minio/mc:latest")
-        except ImageNotFound:
-            client.images.pull("minio/mc:latest")
+        docker_service.ensure_image(minio_client_image)
 
         command = " ".join([
             "sh",
@@ -126,7 +135,7 @@ def minio_service(
 
         with contextlib.suppress(Exception):
             client.containers.run(
-                image="minio/mc:latest",
+                image=minio_client_image,
                 command=command,
                 remove=True,
                 network_mode="host",
@@ -1,61 +1,24 @@
 from __future__ import annotations
 
 import contextlib
+import os
 from collections.abc import Generator
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 import pytest
 
-from pytest_databases.helpers import get_xdist_worker_num
+from pytest_databases._probes import mongodb_ping
+from pytest_databases.docker import TRUE_VALUES
+from pytest_databases.helpers import get_xdist_shard_num, get_xdist_worker_num
 from pytest_databases.types import ServiceContainer, XdistIsolationLevel
 
 if TYPE_CHECKING:
-    from collections.abc import Generator, Iterator
-
-    from docker.models.containers import Container
+    from collections.abc import Generator
 
     from pytest_databases._service import DockerService
 
 
-def _output_to_bytes(output: bytes | str | Iterator[bytes]) -> bytes:
-    if isinstance(output, bytes):
-        return output
-    if isinstance(output, str):
-        return output.encode()
-    return b"".join(output)
-
-
-def _exec_mongosh(
-    container: Container,
-    eval_script: str,
-    *,
-    user: str,
-    password: str,
-    database: str | None = None,
-) -> tuple[int, bytes]:
-    cmd = [
-        "mongosh",
-        "--quiet",
-        "--host",
-        "localhost",
-        "--port",
-        "27017",
-        "-u",
-        user,
-        "-p",
-        password,
-        "--authenticationDatabase",
-        "admin",
-    ]
-    if database is not None:
-        cmd.append(database)
-    cmd.extend(["--eval", eval_script])
-    result = container.exec_run(cmd)
-    exit_code = result.exit_code if result.exit_code is not None else -1
-    return exit_code, _output_to_bytes(result.output)
-
-
 @dataclass
 class MongoDBService(ServiceContainer):
     username: str
@@ -68,12 +31,24 @@ def xdist_mongodb_isolation_level() -> XdistIsolationLevel:
     return "database"
 
 
+@pytest.fixture(scope="session")
+def xdist_mongodb_workers_per_server() -> int:
+    return 4
+
+
+@pytest.fixture(scope="session")
+def mongodb_use_tmpfs() -> bool:
+    return os.environ.get("MONGODB_USE_TMPFS", "False") in TRUE_VALUES
+
+
 @contextlib.contextmanager
 def _provide_mongodb_service(
     docker_service: DockerService,
     image: str,
     name: str,
     isolation_level: XdistIsolationLevel,
+    use_tmpfs: bool = False,
+    workers_per_server: int = 4,
 ) -> Generator[MongoDBService, None, None]:
     username = "mongo_user"
     password = "mongo_password"
@@ -88,15 +63,11 @@ def _provide_mongodb_service(
             container_name += suffix
         else:
             database_name += suffix
+            if isolation_level == "shard":
+                container_name += f"_shard_{get_xdist_shard_num(workers_per_server)}"
 
     def check(_service: ServiceContainer) -> bool:
-        exit_code, output = _exec_mongosh(
-            _service.container,
-            "print(db.adminCommand('ping').ok)",
-            user=username,
-            password=password,
-        )
-        return exit_code == 0 and output.strip().endswith(b"1")
+        return mongodb_ping(_service.host, _service.port, user=username, password=password)
 
     with docker_service.run(
         image=image,
@@ -110,6 +81,7 @@ def _provide_mongodb_service(
         pause=0.5,
         timeout=120,
         transient=isolation_level == "server",
+        tmpfs=docker_service.tmpfs("/data/db") if use_tmpfs else None,
     ) as service:
         yield MongoDBService(
             host=service.host,
@@ -130,7 +102,16 @@ def mongodb_image() -> str:
 def mongodb_service(
     docker_service: DockerService,
     xdist_mongodb_isolation_level: XdistIsolationLevel,
+    xdist_mongodb_workers_per_server: int,
     mongodb_image: str,
+    mongodb_use_tmpfs: bool,
 ) -> Generator[MongoDBService, None, None]:
-    with _provide_mongodb_service(docker_service, mongodb_image, "mongodb", xdist_mongodb_isolation_level) as service:
+    with _provide_mongodb_service(
+        docker_service,
+        mongodb_image,
+        "mongodb",
+        xdist_mongodb_isolation_level,
+        use_tmpfs=mongodb_use_tmpfs,
+        workers_per_server=xdist_mongodb_workers_per_server,
+    ) as service:
         yield service
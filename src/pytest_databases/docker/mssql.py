@@ -1,35 +1,27 @@
 from __future__ import annotations
 
 import dataclasses
+import os
 import time
 from typing import TYPE_CHECKING
 
 import pytest
 
-from pytest_databases.helpers import get_xdist_worker_num
+from pytest_databases._probes import ProbeError, mssql_execute, mssql_ping
+from pytest_databases.docker import TRUE_VALUES
+from pytest_databases.helpers import get_xdist_shard_num, get_xdist_worker_num
 from pytest_databases.types import ServiceContainer
 
 if TYPE_CHECKING:
-    from collections.abc import Generator, Iterator
-
-    from docker.models.containers import Container
+    from collections.abc import Generator
 
     from pytest_databases._service import DockerService
-    from pytest_databases.types import XdistIsolationLevel
+    from pytest_databases.types import DatabaseProfile, XdistIsolationLevel
 
 
 MSSQL_USER = "sa"
 MSSQL_PASSWORD = "Super-secret1"
 MSSQL_DATABASE = "pytest_databases"
-SQLCMD = "/opt/mssql-tools18/bin/sqlcmd"
-
-
-def _output_to_bytes(output: bytes | str | Iterator[bytes]) -> bytes:
-    if isinstance(output, bytes):
-        return output
-    if isinstance(output, str):
-        return output.encode()
-    return b"".join(output)
 
 
 def _quote_identifier(value: str) -> str:
@@ -40,37 +32,6 @@ def _quote_literal(value: str) -> str:
     return f"N'{value.replace(chr(39), chr(39) * 2)}'"
 
 
-def _exec_sqlcmd(
-    container: Container,
-    sql: str,
-    *,
-    database: str = "master",
-    user: str = MSSQL_USER,
-    password: str = MSSQL_PASSWORD,
-) -> tuple[int, bytes]:
-    result = container.exec_run([
-        SQLCMD,
-        "-C",
-        "-b",
-        "-S",
-        "localhost,1433",
-        "-U",
-        user,
-        "-P",
-        password,
-        "-d",
-        database,
-        "-l",
-        "2",
-        "-h",
-        "-1",
-        "-W",
-        "-Q",
-        sql,
-    ])
-    return result.exit_code if result.exit_code is not None else -1, _output_to_bytes(result.output)
-
-
 def _make_login_sql(user: str, password: str) -> str:
     quoted_user = _quote_identifier(user)
     quoted_user_literal = _quote_literal(user)
@@ -88,6 +49,10 @@ def _make_database_sql(database: str) -> str:
     return f"IF DB_ID({quoted_database_literal}) IS NULL CREATE DATABASE {quoted_database};"
 
 
+def _make_delayed_durability_sql(database: str) -> str:
+    return f"ALTER DATABASE {_quote_identifier(database)} SET DELAYED_DURABILITY = FORCED;"
+
+
 def _make_user_sql(database: str, user: str) -> str:
     quoted_database = _quote_identifier(database)
     quoted_user = _quote_identifier(user)
@@ -100,32 +65,45 @@ def _make_user_sql(database: str, user: str) -> str:
     )
 
 
-def _prepare_database(
-    container: Container,
-    database: str,
-    user: str,
-    password: str,
-) -> None:
+def _deferred(sql: str) -> str:
+    # compiled when it runs rather than with the batch, so it may refer to a
+    # database created earlier in the same batch
+    return f"EXEC({_quote_literal(sql)});"
+
+
+def _make_setup_sql(database: str, user: str, password: str, profile: DatabaseProfile = "default") -> str:
     setup_sql = [_make_database_sql(database)]
+    if profile == "fast":
+        setup_sql.append(_deferred(_make_delayed_durability_sql(database)))
     if user != MSSQL_USER:
         setup_sql = [
             _make_login_sql(user, password),
             *setup_sql,
-            _make_user_sql(database, user),
+            _deferred(_make_user_sql(database, user)),
         ]
+    return " ".join(setup_sql)
 
-    last_output = b""
+
+def _prepare_database(
+    service: ServiceContainer,
+    database: str,
+    user: str,
+    password: str,
+    profile: DatabaseProfile = "default",
+) -> None:
+    setup_sql = _make_setup_sql(database, user, password, profile)
+    last_error = ""
     for attempt in range(5):
-        for sql in setup_sql:
-            exit_code, output = _exec_sqlcmd(container, sql, password=password)
-            if exit_code != 0:
-                last_output = output
-                break
+        try:
+            # a single batch, sent from here instead of through sqlcmd in the container
+            mssql_execute(service.host, service.port, MSSQL_USER, password, setup_sql)
+        except (OSError, ProbeError) as exc:
+            last_error = str(exc)
         else:
             return
         time.sleep(1 + attempt * 0.5)
 
-    msg = f"SQL Server database {database!r} could not be prepared. Last output: {last_output!r}"
+    msg = f"SQL Server database {database!r} could not be prepared. Last error: {last_error}"
     raise RuntimeError(msg)
 
 
@@ -134,11 +112,22 @@ def xdist_mssql_isolation_level() -> XdistIsolationLevel:
     return "database"
 
 
+@pytest.fixture(scope="session")
+def xdist_mssql_workers_per_server() -> int:
+    return 4
+
+
 @pytest.fixture(scope="session")
 def mssql_image() -> str:
     return "mcr.microsoft.com/mssql/server:2022-latest"
 
 
+@pytest.fixture(scope="session")
+def mssql_use_tmpfs() -> bool:
+    # SQL Server opens its data files with O_DIRECT, which tmpfs only supports from Linux 6.6
+    return os.environ.get("MSSQL_USE_TMPFS", "False") in TRUE_VALUES
+
+
 @pytest.fixture(scope="session")
 def mssql_user() -> str:
     return MSSQL_USER
@@ -177,18 +166,16 @@ class MSSQLService(ServiceContainer):
 def mssql_service(
     docker_service: DockerService,
     xdist_mssql_isolation_level: XdistIsolationLevel,
+    xdist_mssql_workers_per_server: int,
     mssql_image: str,
     mssql_user: str,
     mssql_password: str,
     mssql_database: str,
+    mssql_use_tmpfs: bool,
+    database_profile: DatabaseProfile,
 ) -> Generator[MSSQLService, None, None]:
     def check(_service: ServiceContainer) -> bool:
-        exit_code, output = _exec_sqlcmd(
-            _service.container,
-            "SET NOCOUNT ON; SELECT 1 AS is_available",
-            password=mssql_password,
-        )
-        return exit_code == 0 and output.strip() == b"1"
+        return mssql_ping(_service.host, _service.port, MSSQL_USER, mssql_password)
 
     worker_num = get_xdist_worker_num()
     db_name = mssql_database
@@ -199,6 +186,8 @@ def mssql_service(
             name += suffix
         else:
             db_name += suffix
+            if xdist_mssql_isolation_level == "shard":
+                name += f"_shard_{get_xdist_shard_num(xdist_mssql_workers_per_server)}"
 
     with docker_service.run(
         image=mssql_image,
@@ -214,8 +203,11 @@ def mssql_service(
         timeout=100,
         pause=1,
         transient=xdist_mssql_isolation_level == "server",
+        tmpfs=docker_service.tmpfs("/var/opt/mssql") if mssql_use_tmpfs else None,
+        snapshot=_make_login_sql(mssql_user, mssql_password),
     ) as service:
-        _prepare_database(service.container, db_name, mssql_user, mssql_password)
+        _prepare_database(service, db_name, mssql_user, mssql_password, profile=database_profile)
+        docker_service.commit_snapshot(service)
 
         yield MSSQLService(
             host=service.host,
@@ -8,13 +8,31 @@ from typing import TYPE_CHECKING
 
 import pytest
 
+from pytest_databases._probes import mysql_ping
 from pytest_databases._service import DockerService, ServiceContainer
-from pytest_databases.helpers import get_xdist_worker_num
+from pytest_databases.docker import TRUE_VALUES
+from pytest_databases.helpers import get_xdist_shard_num, get_xdist_worker_num
 
 if TYPE_CHECKING:
     from collections.abc import Generator, Iterator
 
-    from pytest_databases.types import XdistIsolationLevel
+    from pytest_databases.types import DatabaseProfile, XdistIsolationLevel
+
+
+FAST_PROFILE_ARGS = ("--innodb-flush-log-at-trx-commit=0", "--sync-binlog=0")
+
+
+def _make_command(image: str, profile: DatabaseProfile, datadir: str = "/var/lib/mysql") -> str | None:
+    args: list[str] = []
+    if datadir != "/var/lib/mysql":
+        args.append(f"--datadir={datadir}")
+    if profile == "fast":
+        args.extend(FAST_PROFILE_ARGS)
+        # 5.x has no --skip-log-bin, but also leaves the binary log off by default.
+        # Decided from the tag, as the image may be registry-qualified.
+        if not image.rsplit(":", 1)[-1].startswith("5"):
+            args.append("--skip-log-bin")
+    return " ".join(args) or None
 
 
 def _output_to_bytes(output: bytes | Iterator[bytes]) -> bytes:
@@ -35,11 +53,21 @@ def xdist_mysql_isolation_level() -> XdistIsolationLevel:
     return "database"
 
 
+@pytest.fixture(scope="session")
+def xdist_mysql_workers_per_server() -> int:
+    return 4
+
+
 @pytest.fixture(scope="session")
 def platform() -> str:
     return "linux/x86_64"
 
 
+@pytest.fixture(scope="session")
+def mysql_use_tmpfs() -> bool:
+    return os.environ.get("MYSQL_USE_TMPFS", "False") in TRUE_VALUES
+
+
 @pytest.fixture(scope="session")
 def mysql_user() -> str:
     return os.getenv("MYSQL_USER", "app")
@@ -66,23 +94,17 @@ def _provide_mysql_service(
     image: str,
     name: str,
     isolation_level: XdistIsolationLevel,
+    workers_per_server: int,
     platform: str,
     user: str,
     password: str,
     root_password: str,
     database: str,
+    use_tmpfs: bool = False,
+    profile: DatabaseProfile = "default",
 ) -> Generator[MySQLService, None, None]:
     def check(_service: ServiceContainer) -> bool:
-        container_name = f"pytest_databases_{name}"
-        container = docker_service._get_container(container_name)
-        if not container:
-            return False
-
-        # Attempt to run a simple SELECT 1 to ensure the server is fully ready
-        res = container.exec_run(
-            ["mysql", "--user=root", f"--password={root_password}", "-e", "SELECT 1"],
-        )
-        return res.exit_code == 0
+        return mysql_ping(_service.host, _service.port, user="root", password=root_password)
 
     worker_num = get_xdist_worker_num()
     db_name = "pytest_databases"
@@ -92,12 +114,22 @@ def _provide_mysql_service(
             name += suffix
         else:
             db_name += suffix
+            if isolation_level == "shard":
+                name += f"_shard_{get_xdist_shard_num(workers_per_server)}"
+
+    grant_sql = f"GRANT ALL PRIVILEGES ON *.* TO '{user}'@'%'; FLUSH PRIVILEGES;"
+    datadir = "/var/lib/mysql"
+    if docker_service.snapshots_enabled and not use_tmpfs:
+        # /var/lib/mysql is a volume, which `docker commit` leaves out of a snapshot
+        datadir = "/var/lib/pytest-databases"
 
     with docker_service.run(
         image=image,
         check=check,
         container_port=3306,
         name=name,
+        command=_make_command(image, profile, datadir),
+        tmpfs=docker_service.tmpfs(datadir) if use_tmpfs else None,
         env={
             "MYSQL_ROOT_PASSWORD": root_password,
             "MYSQL_PASSWORD": password,
@@ -110,22 +142,15 @@ def _provide_mysql_service(
         pause=1.0,
         transient=isolation_level == "server",
         platform=platform,
+        snapshot=grant_sql,
     ) as service:
         # The check() above only verifies root can SELECT 1; that signal is true
         # before mysql has finished provisioning the app user and applying our
         # post-start grants. Verify the app user can actually reach db_name
         # before yielding so tests don't race the fixture into 'access denied'.
-        container_name = f"pytest_databases_{name}"
-        container = docker_service._get_container(container_name)
-        if container is None:
-            msg = f"MySQL container {container_name!r} disappeared after startup"
-            raise RuntimeError(msg)
+        container = service.container
 
-        setup_sql = (
-            f"CREATE DATABASE IF NOT EXISTS {db_name}; "
-            f"GRANT ALL PRIVILEGES ON *.* TO '{user}'@'%'; "
-            "FLUSH PRIVILEGES;"
-        )
+        setup_sql = f"CREATE DATABASE IF NOT EXISTS {db_name}; {grant_sql}"
         verify_cmd = [
             "mysql",
             f"--user={user}",
@@ -154,6 +179,8 @@ def _provide_mysql_service(
             )
             raise RuntimeError(msg)
 
+        docker_service.commit_snapshot(service)
+
         yield MySQLService(
             host=service.host,
             port=service.port,
@@ -169,10 +196,19 @@ def mysql_service(mysql_84_service: MySQLService) -> MySQLService:
     return mysql_84_service
 
 
+@pytest.fixture(scope="session")
+def mysql_56_image() -> str:
+    return "mysql:5.6"
+
+
 @pytest.fixture(scope="session")
 def mysql_56_service(
     docker_service: DockerService,
+    mysql_56_image: str,
     xdist_mysql_isolation_level: XdistIsolationLevel,
+    xdist_mysql_workers_per_server: int,
+    mysql_use_tmpfs: bool,
+    database_profile: DatabaseProfile,
     platform: str,
     mysql_user: str,
     mysql_password: str,
@@ -180,10 +216,13 @@ def mysql_56_service(
     mysql_database: str,
 ) -> Generator[MySQLService, None, None]:
     with _provide_mysql_service(
-        image="mysql:5.6",
+        image=mysql_56_image,
         name="mysql-56",
         docker_service=docker_service,
         isolation_level=xdist_mysql_isolation_level,
+        workers_per_server=xdist_mysql_workers_per_server,
+        use_tmpfs=mysql_use_tmpfs,
+        profile=database_profile,
         platform=platform,
         user=mysql_user,
         password=mysql_password,
@@ -193,10 +232,19 @@ def mysql_56_service(
         yield service
 
 
+@pytest.fixture(scope="session")
+def mysql_57_image() -> str:
+    return "mysql:5.7"
+
+
 @pytest.fixture(scope="session")
 def mysql_57_service(
     docker_service: DockerService,
+    mysql_57_image: str,
     xdist_mysql_isolation_level: XdistIsolationLevel,
+    xdist_mysql_workers_per_server: int,
+    mysql_use_tmpfs: bool,
+    database_profile: DatabaseProfile,
     platform: str,
     mysql_user: str,
     mysql_password: str,
@@ -204,10 +252,13 @@ def mysql_57_service(
     mysql_database: str,
 ) -> Generator[MySQLService, None, None]:
     with _provide_mysql_service(
-        image="mysql:5.7",
+        image=mysql_57_image,
         name="mysql-57",
         docker_service=docker_service,
         isolation_level=xdist_mysql_isolation_level,
+        workers_per_server=xdist_mysql_workers_per_server,
+        use_tmpfs=mysql_use_tmpfs,
+        profile=database_profile,
         platform=platform,
         user=mysql_user,
         password=mysql_password,
@@ -217,10 +268,19 @@ def mysql_57_service(
         yield service
 
 
+@pytest.fixture(scope="session")
+def mysql_8_image() -> str:
+    return "mysql:8"
+
+
 @pytest.fixture(scope="session")
 def mysql_8_service(
     docker_service: DockerService,
+    mysql_8_image: str,
     xdist_mysql_isolation_level: XdistIsolationLevel,
+    xdist_mysql_workers_per_server: int,
+    mysql_use_tmpfs: bool,
+    database_profile: DatabaseProfile,
     platform: str,
     mysql_user: str,
     mysql_password: str,
@@ -228,10 +288,13 @@ def mysql_8_service(
     mysql_database: str,
 ) -> Generator[MySQLService, None, None]:
     with _provide_mysql_service(
-        image="mysql:8",
+        image=mysql_8_image,
         name="mysql-8",
         docker_service=docker_service,
         isolation_level=xdist_mysql_isolation_level,
+        workers_per_server=xdist_mysql_workers_per_server,
+        use_tmpfs=mysql_use_tmpfs,
+        profile=database_profile,
         platform=platform,
         user=mysql_user,
         password=mysql_password,
@@ -241,10 +304,19 @@ def mysql_8_service(
         yield service
 
 
+@pytest.fixture(scope="session")
+def mysql_84_image() -> str:
+    return "mysql:8.4"
+
+
 @pytest.fixture(scope="session")
 def mysql_84_service(
     docker_service: DockerService,
+    mysql_84_image: str,
     xdist_mysql_isolation_level: XdistIsolationLevel,
+    xdist_mysql_workers_per_server: int,
+    mysql_use_tmpfs: bool,
+    database_profile: DatabaseProfile,
     platform: str,
     mysql_user: str,
     mysql_password: str,
@@ -252,10 +324,13 @@ def mysql_84_service(
     mysql_database: str,
 ) -> Generator[MySQLService, None, None]:
     with _provide_mysql_service(
-        image="mysql:8.4",
+        image=mysql_84_image,
         name="mysql-8.4",
         docker_service=docker_service,
         isolation_level=xdist_mysql_isolation_level,
+        workers_per_server=xdist_mysql_workers_per_server,
+        use_tmpfs=mysql_use_tmpfs,
+        profile=database_profile,
         platform=platform,
         user=mysql_user,
         password=mysql_password,
@@ -265,10 +340,19 @@ def mysql_84_service(
         yield service
 
 
+@pytest.fixture(scope="session")
+def mysql_96_image() -> str:
+    return "mysql:9.6"
+
+
 @pytest.fixture(scope="session")
 def mysql_96_service(
     docker_service: DockerService,
+    mysql_96_image: str,
     xdist_mysql_isolation_level: XdistIsolationLevel,
+    xdist_mysql_workers_per_server: int,
+    mysql_use_tmpfs: bool,
+    database_profile: DatabaseProfile,
     platform: str,
     mysql_user: str,
     mysql_password: str,
@@ -276,10 +360,13 @@ def mysql_96_service(
     mysql_database: str,
 ) -> Generator[MySQLService, None, None]:
     with _provide_mysql_service(
-        image="mysql:9.6",
+        image=mysql_96_image,
         name="mysql-9.6",
         docker_service=docker_service,
         isolation_level=xdist_mysql_isolation_level,
+        workers_per_server=xdist_mysql_workers_per_server,
+        use_tmpfs=mysql_use_tmpfs,
+        profile=database_profile,
         platform=platform,
         user=mysql_user,
         password=mysql_password,
@@ -1,19 +1,17 @@
 from __future__ import annotations
 
 import contextlib
-import shlex
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 import pytest
 
+from pytest_databases._probes import oracle_ping
 from pytest_databases.helpers import get_xdist_worker_num
 from pytest_databases.types import ServiceContainer
 
 if TYPE_CHECKING:
-    from collections.abc import Generator, Iterator
-
-    from docker.models.containers import Container
+    from collections.abc import Generator
 
     from pytest_databases._service import DockerService
 
@@ -23,42 +21,6 @@ ORACLE_PASSWORD = "super-secret"
 ORACLE_SYSTEM_PASSWORD = "super-secret"
 
 
-def _output_to_bytes(output: bytes | str | Iterator[bytes]) -> bytes:
-    if isinstance(output, bytes):
-        return output
-    if isinstance(output, str):
-        return output.encode()
-    return b"".join(output)
-
-
-def _normalize_sqlplus_statement(sql: str) -> str:
-    statement = sql.strip()
-    if not statement.endswith(";"):
-        statement = f"{statement};"
-    return statement
-
-
-def _exec_sqlplus(
-    container: Container,
-    user: str,
-    password: str,
-    service_name: str,
-    sql: str,
-) -> tuple[int, bytes]:
-    script = "\n".join([
-        "SET HEADING OFF FEEDBACK OFF PAGESIZE 0 VERIFY OFF ECHO OFF",
-        "WHENEVER OSERROR EXIT 9",
-        "WHENEVER SQLERROR EXIT SQL.SQLCODE",
-        _normalize_sqlplus_statement(sql),
-        "EXIT",
-        "",
-    ])
-    connect_string = f"{user}/{password}@//localhost:1521/{service_name}"
-    command = f"printf '%s' {shlex.quote(script)} | sqlplus -L -S {shlex.quote(connect_string)}"
-    result = container.exec_run(["bash", "-lc", command])
-    return result.exit_code if result.exit_code is not None else -1, _output_to_bytes(result.output)
-
-
 @dataclass
 class OracleService(ServiceContainer):
     user: str
@@ -78,14 +40,7 @@ def _provide_oracle_service(
     system_password: str,
 ) -> Generator[OracleService, None, None]:
     def check(_service: ServiceContainer) -> bool:
-        exit_code, output = _exec_sqlplus(
-            _service.container,
-            user,
-            password,
-            service_name,
-            "SELECT 1 FROM dual",
-        )
-        return exit_code == 0 and output.strip() == b"1"
+        return oracle_ping(_service.host, _service.port, service_name)
 
     worker_num = get_xdist_worker_num()
     if worker_num is not None:
@@ -95,6 +50,8 @@ def _provide_oracle_service(
         image=image,
         name=name,
         check=check,
+        # printed once the application user exists, which the listener knows nothing about
+        wait_for_log="DATABASE IS READY TO USE!",
         container_port=1521,
         timeout=60,
         env={
@@ -102,7 +59,9 @@ def _provide_oracle_service(
             "APP_USER_PASSWORD": password,
             "APP_USER": user,
         },
+        snapshot=service_name,
     ) as service:
+        docker_service.commit_snapshot(service)
         yield OracleService(
             host=service.host,
             port=service.port,
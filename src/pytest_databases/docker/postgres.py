@@ -8,8 +8,9 @@ from typing import TYPE_CHECKING
 import psycopg
 import pytest
 
-from pytest_databases.helpers import get_xdist_worker_num
-from pytest_databases.types import ServiceContainer, XdistIsolationLevel
+from pytest_databases.docker import TRUE_VALUES
+from pytest_databases.helpers import get_xdist_shard_num, get_xdist_worker_num
+from pytest_databases.types import DatabaseProfile, ServiceContainer, XdistIsolationLevel
 
 if TYPE_CHECKING:
     from collections.abc import Generator
@@ -17,6 +18,14 @@ if TYPE_CHECKING:
     from pytest_databases._service import DockerService
 
 
+PGDATA = "/var/lib/postgresql/data"
+FAST_PROFILE_COMMAND = "-c fsync=off -c synchronous_commit=off -c full_page_writes=off"
+
+
+def _make_command(profile: DatabaseProfile) -> str | None:
+    return FAST_PROFILE_COMMAND if profile == "fast" else None
+
+
 def _make_connection_string(host: str, port: int, user: str, password: str, database: str) -> str:
     return f"dbname={database} user={user} host={host} port={port} password={password}"
 
@@ -26,6 +35,11 @@ def xdist_postgres_isolation_level() -> XdistIsolationLevel:
     return "database"
 
 
+@pytest.fixture(scope="session")
+def xdist_postgres_workers_per_server() -> int:
+    return 4
+
+
 @dataclasses.dataclass
 class PostgresService(ServiceContainer):
     database: str
@@ -48,6 +62,11 @@ def postgres_user() -> str:
     return "postgres"
 
 
+@pytest.fixture(autouse=False, scope="session")
+def postgres_use_tmpfs() -> bool:
+    return os.environ.get("POSTGRES_USE_TMPFS", "False") in TRUE_VALUES
+
+
 @pytest.fixture(autouse=False, scope="session")
 def postgres_port() -> int | None:
     value = os.environ.get("POSTGRES_PORT")
@@ -112,6 +131,9 @@ def _provide_postgres_service(
     password: str,
     xdist_postgres_isolate: XdistIsolationLevel,
     host_port: int | None = None,
+    workers_per_server: int = 4,
+    use_tmpfs: bool = False,
+    profile: DatabaseProfile = "default",
 ) -> Generator[PostgresService, None, None]:
     def check(_service: ServiceContainer) -> bool:
         try:
@@ -137,6 +159,17 @@ def _provide_postgres_service(
             name += suffix
         else:
             db_name += suffix
+            if xdist_postgres_isolate == "shard":
+                name += f"_shard_{get_xdist_shard_num(workers_per_server)}"
+
+    env = {
+        "POSTGRES_PASSWORD": password,
+    }
+    tmpfs = None
+    if use_tmpfs:
+        # pin PGDATA: from postgres 18 on the images default to a versioned directory
+        env["PGDATA"] = PGDATA
+        tmpfs = docker_service.tmpfs(PGDATA)
 
     with docker_service.run(
         image=image,
@@ -144,9 +177,9 @@ def _provide_postgres_service(
         container_host=host,
         container_port=5432,
         name=name,
-        env={
-            "POSTGRES_PASSWORD": password,
-        },
+        command=_make_command(profile),
+        env=env,
+        tmpfs=tmpfs,
         exec_after_start=f"psql -U postgres -d postgres -c 'CREATE DATABASE {db_name};'",
         transient=xdist_postgres_isolate == "server",
         host_port=host_port,
@@ -161,10 +194,19 @@ def _provide_postgres_service(
         )
 
 
+@pytest.fixture(autouse=False, scope="session")
+def postgres_11_image() -> str:
+    return "postgres:11"
+
+
 @pytest.fixture(autouse=False, scope="session")
 def postgres_11_service(
     docker_service: DockerService,
+    postgres_11_image: str,
     xdist_postgres_isolation_level: XdistIsolationLevel,
+    xdist_postgres_workers_per_server: int,
+    postgres_use_tmpfs: bool,
+    database_profile: DatabaseProfile,
     postgres_host: str,
     postgres_user: str,
     postgres_password: str,
@@ -172,9 +214,12 @@ def postgres_11_service(
 ) -> Generator[PostgresService, None, None]:
     with _provide_postgres_service(
         docker_service,
-        image="postgres:11",
+        image=postgres_11_image,
         name="postgres-11",
         xdist_postgres_isolate=xdist_postgres_isolation_level,
+        workers_per_server=xdist_postgres_workers_per_server,
+        use_tmpfs=postgres_use_tmpfs,
+        profile=database_profile,
         host=postgres_host,
         user=postgres_user,
         password=postgres_password,
@@ -183,10 +228,19 @@ def postgres_11_service(
         yield service
 
 
+@pytest.fixture(autouse=False, scope="session")
+def postgres_12_image() -> str:
+    return "postgres:12"
+
+
 @pytest.fixture(autouse=False, scope="session")
 def postgres_12_service(
     docker_service: DockerService,
+    postgres_12_image: str,
     xdist_postgres_isolation_level: XdistIsolationLevel,
+    xdist_postgres_workers_per_server: int,
+    postgres_use_tmpfs: bool,
+    database_profile: DatabaseProfile,
     postgres_host: str,
     postgres_user: str,
     postgres_password: str,
@@ -194,9 +248,12 @@ def postgres_12_service(
 ) -> Generator[PostgresService, None, None]:
     with _provide_postgres_service(
         docker_service,
-        image="postgres:12",
+        image=postgres_12_image,
         name="postgres-12",
         xdist_postgres_isolate=xdist_postgres_isolation_level,
+        workers_per_server=xdist_postgres_workers_per_server,
+        use_tmpfs=postgres_use_tmpfs,
+        profile=database_profile,
         host=postgres_host,
         user=postgres_user,
         password=postgres_password,
@@ -205,10 +262,19 @@ def postgres_12_service(
         yield service
 
 
+@pytest.fixture(autouse=False, scope="session")
+def postgres_13_image() -> str:
+    return "postgres:13"
+
+
 @pytest.fixture(autouse=False, scope="session")
 def postgres_13_service(
     docker_service: DockerService,
+    postgres_13_image: str,
     xdist_postgres_isolation_level: XdistIsolationLevel,
+    xdist_postgres_workers_per_server: int,
+    postgres_use_tmpfs: bool,
+    database_profile: DatabaseProfile,
     postgres_host: str,
     postgres_user: str,
     postgres_password: str,
@@ -216,9 +282,12 @@ def postgres_13_service(
 ) -> Generator[PostgresService, None, None]:
     with _provide_postgres_service(
         docker_service,
-        image="postgres:13",
+        image=postgres_13_image,
         name="postgres-13",
         xdist_postgres_isolate=xdist_postgres_isolation_level,
+        workers_per_server=xdist_postgres_workers_per_server,
+        use_tmpfs=postgres_use_tmpfs,
+        profile=database_profile,
         host=postgres_host,
         user=postgres_user,
         password=postgres_password,
@@ -227,10 +296,19 @@ def postgres_13_service(
         yield service
 
 
+@pytest.fixture(autouse=False, scope="session")
+def postgres_14_image() -> str:
+    return "postgres:14"
+
+
 @pytest.fixture(autouse=False, scope="session")
 def postgres_14_service(
     docker_service: DockerService,
+    postgres_14_image: str,
     xdist_postgres_isolation_level: XdistIsolationLevel,
+    xdist_postgres_workers_per_server: int,
+    postgres_use_tmpfs: bool,
+    database_profile: DatabaseProfile,
     postgres_host: str,
     postgres_user: str,
     postgres_password: str,
@@ -238,9 +316,12 @@ def postgres_14_service(
 ) -> Generator[PostgresService, None, None]:
     with _provide_postgres_service(
         docker_service,
-        image="postgres:14",
+        image=postgres_14_image,
         name="postgres-14",
         xdist_postgres_isolate=xdist_postgres_isolation_level,
+        workers_per_server=xdist_postgres_workers_per_server,
+        use_tmpfs=postgres_use_tmpfs,
+        profile=database_profile,
         host=postgres_host,
         user=postgres_user,
         password=postgres_password,
@@ -249,10 +330,19 @@ def postgres_14_service(
         yield service
 
 
+@pytest.fixture(autouse=False, scope="session")
+def postgres_15_image() -> str:
+    return "postgres:15"
+
+
 @pytest.fixture(autouse=False, scope="session")
 def postgres_15_service(
     docker_service: DockerService,
+    postgres_15_image: str,
     xdist_postgres_isolation_level: XdistIsolationLevel,
+    xdist_postgres_workers_per_server: int,
+    postgres_use_tmpfs: bool,
+    database_profile: DatabaseProfile,
     postgres_host: str,
     postgres_user: str,
     postgres_password: str,
@@ -260,9 +350,12 @@ def postgres_15_service(
 ) -> Generator[PostgresService, None, None]:
     with _provide_postgres_service(
         docker_service,
-        image="postgres:15",
+        image=postgres_15_image,
         name="postgres-15",
         xdist_postgres_isolate=xdist_postgres_isolation_level,
+        workers_per_server=xdist_postgres_workers_per_server,
+        use_tmpfs=postgres_use_tmpfs,
+        profile=database_profile,
         host=postgres_host,
         user=postgres_user,
         password=postgres_password,
@@ -271,10 +364,19 @@ def postgres_15_service(
         yield service
 
 
+@pytest.fixture(autouse=False, scope="session")
+def postgres_16_image() -> str:
+    return "postgres:16"
+
+
 @pytest.fixture(autouse=False, scope="session")
 def postgres_16_service(
     docker_service: DockerService,
+    postgres_16_image: str,
     xdist_postgres_isolation_level: XdistIsolationLevel,
+    xdist_postgres_workers_per_server: int,
+    postgres_use_tmpfs: bool,
+    database_profile: DatabaseProfile,
     postgres_host: str,
     postgres_user: str,
     postgres_password: str,
@@ -282,9 +384,12 @@ def postgres_16_service(
 ) -> Generator[PostgresService, None, None]:
     with _provide_postgres_service(
         docker_service,
-        image="postgres:16",
+        image=postgres_16_image,
         name="postgres-16",
         xdist_postgres_isolate=xdist_postgres_isolation_level,
+        workers_per_server=xdist_postgres_workers_per_server,
+        use_tmpfs=postgres_use_tmpfs,
+        profile=database_profile,
         host=postgres_host,
         user=postgres_user,
         password=postgres_password,
@@ -293,10 +398,19 @@ def postgres_16_service(
         yield service
 
 
+@pytest.fixture(autouse=False, scope="session")
+def postgres_17_image() -> str:
+    return "postgres:17"
+
+
 @pytest.fixture(autouse=False, scope="session")
 def postgres_17_service(
     docker_service: DockerService,
+    postgres_17_image: str,
     xdist_postgres_isolation_level: XdistIsolationLevel,
+    xdist_postgres_workers_per_server: int,
+    postgres_use_tmpfs: bool,
+    database_profile: DatabaseProfile,
     postgres_host: str,
     postgres_user: str,
     postgres_password: str,
@@ -304,9 +418,12 @@ def postgres_17_service(
 ) -> Generator[PostgresService, None, None]:
     with _provide_postgres_service(
         docker_service,
-        image="postgres:17",
+        image=postgres_17_image,
         name="postgres-17",
         xdist_postgres_isolate=xdist_postgres_isolation_level,
+        workers_per_server=xdist_postgres_workers_per_server,
+        use_tmpfs=postgres_use_tmpfs,
+        profile=database_profile,
         host=postgres_host,
         user=postgres_user,
         password=postgres_password,
@@ -315,10 +432,19 @@ def postgres_17_service(
         yield service
 
 
+@pytest.fixture(autouse=False, scope="session")
+def postgres_18_image() -> str:
+    return "postgres:18"
+
+
 @pytest.fixture(autouse=False, scope="session")
 def postgres_18_service(
     docker_service: DockerService,
+    postgres_18_image: str,
     xdist_postgres_isolation_level: XdistIsolationLevel,
+    xdist_postgres_workers_per_server: int,
+    postgres_use_tmpfs: bool,
+    database_profile: DatabaseProfile,
     postgres_host: str,
     postgres_user: str,
     postgres_password: str,
@@ -326,9 +452,12 @@ def postgres_18_service(
 ) -> Generator[PostgresService, None, None]:
     with _provide_postgres_service(
         docker_service,
-        image="postgres:18",
+        image=postgres_18_image,
         name="postgres-18",
         xdist_postgres_isolate=xdist_postgres_isolation_level,
+        workers_per_server=xdist_postgres_workers_per_server,
+        use_tmpfs=postgres_use_tmpfs,
+        profile=database_profile,
         host=postgres_host,
         user=postgres_user,
         password=postgres_password,
@@ -475,6 +604,9 @@ def postgres_service(
     docker_service: DockerService,
     postgres_image: str,
     xdist_postgres_isolation_level: XdistIsolationLevel,
+    xdist_postgres_workers_per_server: int,
+    postgres_use_tmpfs: bool,
+    database_profile: DatabaseProfile,
     postgres_host: str,
     postgres_user: str,
     postgres_password: str,
@@ -485,6 +617,9 @@ def postgres_service(
         image=postgres_image,
         name="postgres",
         xdist_postgres_isolate=xdist_postgres_isolation_level,
+        workers_per_server=xdist_postgres_workers_per_server,
+        use_tmpfs=postgres_use_tmpfs,
+        profile=database_profile,
         host=postgres_host,
         user=postgres_user,
         password=postgres_password,
@@ -561,6 +696,9 @@ def pgvector_service(
     docker_service: DockerService,
     pgvector_image: str,
     xdist_postgres_isolation_level: XdistIsolationLevel,
+    xdist_postgres_workers_per_server: int,
+    postgres_use_tmpfs: bool,
+    database_profile: DatabaseProfile,
     postgres_host: str,
     postgres_user: str,
     postgres_password: str,
@@ -571,6 +709,9 @@ def pgvector_service(
         image=pgvector_image,
         name="pgvector",
         xdist_postgres_isolate=xdist_postgres_isolation_level,
+        workers_per_server=xdist_postgres_workers_per_server,
+        use_tmpfs=postgres_use_tmpfs,
+        profile=database_profile,
         host=postgres_host,
         user=postgres_user,
         password=postgres_password,
@@ -579,10 +720,19 @@ def pgvector_service(
         yield service
 
 
+@pytest.fixture(autouse=False, scope="session")
+def pgvector_13_image() -> str:
+    return "pgvector/pgvector:pg13"
+
+
 @pytest.fixture(autouse=False, scope="session")
 def pgvector_13_service(
     docker_service: DockerService,
+    pgvector_13_image: str,
     xdist_postgres_isolation_level: XdistIsolationLevel,
+    xdist_postgres_workers_per_server: int,
+    postgres_use_tmpfs: bool,
+    database_profile: DatabaseProfile,
     postgres_host: str,
     postgres_user: str,
     postgres_password: str,
@@ -590,9 +740,12 @@ def pgvector_13_service(
 ) -> Generator[PostgresService, None, None]:
     with _provide_postgres_service(
         docker_service,
-        image="pgvector/pgvector:pg13",
+        image=pgvector_13_image,
         name="pgvector-13",
         xdist_postgres_isolate=xdist_postgres_isolation_level,
+        workers_per_server=xdist_postgres_workers_per_server,
+        use_tmpfs=postgres_use_tmpfs,
+        profile=database_profile,
         host=postgres_host,
         user=postgres_user,
         password=postgres_password,
@@ -601,10 +754,19 @@ def pgvector_13_service(
         yield service
 
 
+@pytest.fixture(autouse=False, scope="session")
+def pgvector_14_image() -> str:
+    return "pgvector/pgvector:pg14"
+
+
 @pytest.fixture(autouse=False, scope="session")
 def pgvector_14_service(
     docker_service: DockerService,
+    pgvector_14_image: str,
     xdist_postgres_isolation_level: XdistIsolationLevel,
+    xdist_postgres_workers_per_server: int,
+    postgres_use_tmpfs: bool,
+    database_profile: DatabaseProfile,
     postgres_host: str,
     postgres_user: str,
     postgres_password: str,
@@ -612,9 +774,12 @@ def pgvector_14_service(
 ) -> Generator[PostgresService, None, None]:
     with _provide_postgres_service(
         docker_service,
-        image="pgvector/pgvector:pg14",
+        image=pgvector_14_image,
         name="pgvector-14",
         xdist_postgres_isolate=xdist_postgres_isolation_level,
+        workers_per_server=xdist_postgres_workers_per_server,
+        use_tmpfs=postgres_use_tmpfs,
+        profile=database_profile,
         host=postgres_host,
         user=postgres_user,
         password=postgres_password,
@@ -623,10 +788,19 @@ def pgvector_14_service(
         yield service
 
 
+@pytest.fixture(autouse=False, scope="session")
+def pgvector_15_image() -> str:
+    return "pgvector/pgvector:pg15"
+
+
 @pytest.fixture(autouse=False, scope="session")
 def pgvector_15_service(
     docker_service: DockerService,
+    pgvector_15_image: str,
     xdist_postgres_isolation_level: XdistIsolationLevel,
+    xdist_postgres_workers_per_server: int,
+    postgres_use_tmpfs: bool,
+    database_profile: DatabaseProfile,
     postgres_host: str,
     postgres_user: str,
     postgres_password: str,
@@ -634,9 +808,12 @@ def pgvector_15_service(
 ) -> Generator[PostgresService, None, None]:
     with _provide_postgres_service(
         docker_service,
-        image="pgvector/pgvector:pg15",
+        image=pgvector_15_image,
         name="pgvector-15",
         xdist_postgres_isolate=xdist_postgres_isolation_level,
+        workers_per_server=xdist_postgres_workers_per_server,
+        use_tmpfs=postgres_use_tmpfs,
+        profile=database_profile,
         host=postgres_host,
         user=postgres_user,
         password=postgres_password,
@@ -645,10 +822,19 @@ def pgvector_15_service(
         yield service
 
 
+@pytest.fixture(autouse=False, scope="session")
+def pgvector_16_image() -> str:
+    return "pgvector/pgvector:pg16"
+
+
 @pytest.fixture(autouse=False, scope="session")
 def pgvector_16_service(
     docker_service: DockerService,
+    pgvector_16_image: str,
     xdist_postgres_isolation_level: XdistIsolationLevel,
+    xdist_postgres_workers_per_server: int,
+    postgres_use_tmpfs: bool,
+    database_profile: DatabaseProfile,
     postgres_host: str,
     postgres_user: str,
     postgres_password: str,
@@ -656,9 +842,12 @@ def pgvector_16_service(
 ) -> Generator[PostgresService, None, None]:
     with _provide_postgres_service(
         docker_service,
-        image="pgvector/pgvector:pg16",
+        image=pgvector_16_image,
         name="pgvector-16",
         xdist_postgres_isolate=xdist_postgres_isolation_level,
+        workers_per_server=xdist_postgres_workers_per_server,
+        use_tmpfs=postgres_use_tmpfs,
+        profile=database_profile,
         host=postgres_host,
         user=postgres_user,
         password=postgres_password,
@@ -667,10 +856,19 @@ def pgvector_16_service(
         yield service
 
 
+@pytest.fixture(autouse=False, scope="session")
+def pgvector_17_image() -> str:
+    return "pgvector/pgvector:pg17"
+
+
 @pytest.fixture(autouse=False, scope="session")
 def pgvector_17_service(
     docker_service: DockerService,
+    pgvector_17_image: str,
     xdist_postgres_isolation_level: XdistIsolationLevel,
+    xdist_postgres_workers_per_server: int,
+    postgres_use_tmpfs: bool,
+    database_profile: DatabaseProfile,
     postgres_host: str,
     postgres_user: str,
     postgres_password: str,
@@ -678,9 +876,12 @@ def pgvector_17_service(
 ) -> Generator[PostgresService, None, None]:
     with _provide_postgres_service(
         docker_service,
-        image="pgvector/pgvector:pg17",
+        image=pgvector_17_image,
         name="pgvector-17",
         xdist_postgres_isolate=xdist_postgres_isolation_level,
+        workers_per_server=xdist_postgres_workers_per_server,
+        use_tmpfs=postgres_use_tmpfs,
+        profile=database_profile,
         host=postgres_host,
         user=postgres_user,
         password=postgres_password,
@@ -689,10 +890,19 @@ def pgvector_17_service(
         yield service
 
 
+@pytest.fixture(autouse=False, scope="session")
+def pgvector_18_image() -> str:
+    return "pgvector/pgvector:pg18"
+
+
 @pytest.fixture(autouse=False, scope="session")
 def pgvector_18_service(
     docker_service: DockerService,
+    pgvector_18_image: str,
     xdist_postgres_isolation_level: XdistIsolationLevel,
+    xdist_postgres_workers_per_server: int,
+    postgres_use_tmpfs: bool,
+    database_profile: DatabaseProfile,
     postgres_host: str,
     postgres_user: str,
     postgres_password: str,
@@ -700,9 +910,12 @@ def pgvector_18_service(
 ) -> Generator[PostgresService, None, None]:
     with _provide_postgres_service(
         docker_service,
-        image="pgvector/pgvector:pg18",
+        image=pgvector_18_image,
         name="pgvector-18",
         xdist_postgres_isolate=xdist_postgres_isolation_level,
+        workers_per_server=xdist_postgres_workers_per_server,
+        use_tmpfs=postgres_use_tmpfs,
+        profile=database_profile,
         host=postgres_host,
         user=postgres_user,
         password=postgres_password,
@@ -863,6 +1076,9 @@ def paradedb_service(
     docker_service: DockerService,
     paradedb_image: str,
     xdist_postgres_isolation_level: XdistIsolationLevel,
+    xdist_postgres_workers_per_server: int,
+    postgres_use_tmpfs: bool,
+    database_profile: DatabaseProfile,
     postgres_host: str,
     postgres_user: str,
     postgres_password: str,
@@ -873,6 +1089,9 @@ def paradedb_service(
         image=paradedb_image,
         name="paradedb",
         xdist_postgres_isolate=xdist_postgres_isolation_level,
+        workers_per_server=xdist_postgres_workers_per_server,
+        use_tmpfs=postgres_use_tmpfs,
+        profile=database_profile,
         host=postgres_host,
         user=postgres_user,
         password=postgres_password,
@@ -881,10 +1100,19 @@ def paradedb_service(
         yield service
 
 
+@pytest.fixture(autouse=False, scope="session")
+def paradedb_15_image() -> str:
+    return "paradedb/paradedb:latest-pg15"
+
+
 @pytest.fixture(autouse=False, scope="session")
 def paradedb_15_service(
     docker_service: DockerService,
+    paradedb_15_image: str,
     xdist_postgres_isolation_level: XdistIsolationLevel,
+    xdist_postgres_workers_per_server: int,
+    postgres_use_tmpfs: bool,
+    database_profile: DatabaseProfile,
     postgres_host: str,
     postgres_user: str,
     postgres_password: str,
@@ -892,9 +1120,12 @@ def paradedb_15_service(
 ) -> Generator[PostgresService, None, None]:
     with _provide_postgres_service(
         docker_service,
-        image="paradedb/paradedb:latest-pg15",
+        image=paradedb_15_image,
         name="paradedb-15",
         xdist_postgres_isolate=xdist_postgres_isolation_level,
+        workers_per_server=xdist_postgres_workers_per_server,
+        use_tmpfs=postgres_use_tmpfs,
+        profile=database_profile,
         host=postgres_host,
         user=postgres_user,
         password=postgres_password,
@@ -903,10 +1134,19 @@ def paradedb_15_service(
         yield service
 
 
+@pytest.fixture(autouse=False, scope="session")
+def paradedb_16_image() -> str:
+    return "paradedb/paradedb:latest-pg16"
+
+
 @pytest.fixture(autouse=False, scope="session")
 def paradedb_16_service(
     docker_service: DockerService,
+    paradedb_16_image: str,
     xdist_postgres_isolation_level: XdistIsolationLevel,
+    xdist_postgres_workers_per_server: int,
+    postgres_use_tmpfs: bool,
+    database_profile: DatabaseProfile,
     postgres_host: str,
     postgres_user: str,
     postgres_password: str,
@@ -914,9 +1154,12 @@ def paradedb_16_service(
 ) -> Generator[PostgresService, None, None]:
     with _provide_postgres_service(
         docker_service,
-        image="paradedb/paradedb:latest-pg16",
+        image=paradedb_16_image,
         name="paradedb-16",
         xdist_postgres_isolate=xdist_postgres_isolation_level,
+        workers_per_server=xdist_postgres_workers_per_server,
+        use_tmpfs=postgres_use_tmpfs,
+        profile=database_profile,
         host=postgres_host,
         user=postgres_user,
         password=postgres_password,
@@ -925,10 +1168,19 @@ def paradedb_16_service(
         yield service
 
 
+@pytest.fixture(autouse=False, scope="session")
+def paradedb_17_image() -> str:
+    return "paradedb/paradedb:latest-pg17"
+
+
 @pytest.fixture(autouse=False, scope="session")
 def paradedb_17_service(
     docker_service: DockerService,
+    paradedb_17_image: str,
     xdist_postgres_isolation_level: XdistIsolationLevel,
+    xdist_postgres_workers_per_server: int,
+    postgres_use_tmpfs: bool,
+    database_profile: DatabaseProfile,
     postgres_host: str,
     postgres_user: str,
     postgres_password: str,
@@ -936,9 +1188,12 @@ def paradedb_17_service(
 ) -> Generator[PostgresService, None, None]:
     with _provide_postgres_service(
         docker_service,
-        image="paradedb/paradedb:latest-pg17",
+        image=paradedb_17_image,
         name="paradedb-17",
         xdist_postgres_isolate=xdist_postgres_isolation_level,
+        workers_per_server=xdist_postgres_workers_per_server,
+        use_tmpfs=postgres_use_tmpfs,
+        profile=database_profile,
         host=postgres_host,
         user=postgres_user,
         password=postgres_password,
@@ -947,10 +1202,19 @@ def paradedb_17_service(
         yield service
 
 
+@pytest.fixture(autouse=False, scope="session")
+def paradedb_18_image() -> str:
+    return "paradedb/paradedb:latest-pg18"
+
+
 @pytest.fixture(autouse=False, scope="session")
 def paradedb_18_service(
     docker_service: DockerService,
+    paradedb_18_image: str,
     xdist_postgres_isolation_level: XdistIsolationLevel,
+    xdist_postgres_workers_per_server: int,
+    postgres_use_tmpfs: bool,
+    database_profile: DatabaseProfile,
     postgres_host: str,
     postgres_user: str,
     postgres_password: str,
@@ -958,9 +1222,12 @@ def paradedb_18_service(
 ) -> Generator[PostgresService, None, None]:
     with _provide_postgres_service(
         docker_service,
-        image="paradedb/paradedb:latest-pg18",
+        image=paradedb_18_image,
         name="paradedb-18",
         xdist_postgres_isolate=xdist_postgres_isolation_level,
+        workers_per_server=xdist_postgres_workers_per_server,
+        use_tmpfs=postgres_use_tmpfs,
+        profile=database_profile,
         host=postgres_host,
         user=postgres_user,
         password=postgres_password,
@@ -1083,6 +1350,9 @@ def alloydb_omni_service(
     docker_service: DockerService,
     alloydb_omni_image: str,
     xdist_postgres_isolation_level: XdistIsolationLevel,
+    xdist_postgres_workers_per_server: int,
+    postgres_use_tmpfs: bool,
+    database_profile: DatabaseProfile,
     postgres_host: str,
     postgres_user: str,
     postgres_password: str,
@@ -1093,6 +1363,9 @@ def alloydb_omni_service(
         image=alloydb_omni_image,
         name="alloydb-omni",
         xdist_postgres_isolate=xdist_postgres_isolation_level,
+        workers_per_server=xdist_postgres_workers_per_server,
+        use_tmpfs=postgres_use_tmpfs,
+        profile=database_profile,
         host=postgres_host,
         user=postgres_user,
         password=postgres_password,
@@ -1101,10 +1374,19 @@ def alloydb_omni_service(
         yield service
 
 
+@pytest.fixture(autouse=False, scope="session")
+def alloydb_omni_15_image() -> str:
+    return "google/alloydbomni:15"
+
+
 @pytest.fixture(autouse=False, scope="session")
 def alloydb_omni_15_service(
     docker_service: DockerService,
+    alloydb_omni_15_image: str,
     xdist_postgres_isolation_level: XdistIsolationLevel,
+    xdist_postgres_workers_per_server: int,
+    postgres_use_tmpfs: bool,
+    database_profile: DatabaseProfile,
     postgres_host: str,
     postgres_user: str,
     postgres_password: str,
@@ -1112,9 +1394,12 @@ def alloydb_omni_15_service(
 ) -> Generator[PostgresService, None, None]:
     with _provide_postgres_service(
         docker_service,
-        image="google/alloydbomni:15",
+        image=alloydb_omni_15_image,
         name="alloydb-omni-15",
         xdist_postgres_isolate=xdist_postgres_isolation_level,
+        workers_per_server=xdist_postgres_workers_per_server,
+        use_tmpfs=postgres_use_tmpfs,
+        profile=database_profile,
         host=postgres_host,
         user=postgres_user,
         password=postgres_password,
@@ -1123,10 +1408,19 @@ def alloydb_omni_15_service(
         yield service
 
 
+@pytest.fixture(autouse=False, scope="session")
+def alloydb_omni_16_image() -> str:
+    return "google/alloydbomni:16"
+
+
 @pytest.fixture(autouse=False, scope="session")
 def alloydb_omni_16_service(
     docker_service: DockerService,
+    alloydb_omni_16_image: str,
     xdist_postgres_isolation_level: XdistIsolationLevel,
+    xdist_postgres_workers_per_server: int,
+    postgres_use_tmpfs: bool,
+    database_profile: DatabaseProfile,
     postgres_host: str,
     postgres_user: str,
     postgres_password: str,
@@ -1134,9 +1428,12 @@ def alloydb_omni_16_service(
 ) -> Generator[PostgresService, None, None]:
     with _provide_postgres_service(
         docker_service,
-        image="google/alloydbomni:16",
+        image=alloydb_omni_16_image,
         name="alloydb-omni-16",
         xdist_postgres_isolate=xdist_postgres_isolation_level,
+        workers_per_server=xdist_postgres_workers_per_server,
+        use_tmpfs=postgres_use_tmpfs,
+        profile=database_profile,
         host=postgres_host,
         user=postgres_user,
         password=postgres_password,
@@ -1145,10 +1442,19 @@ def alloydb_omni_16_service(
         yield service
 
 
+@pytest.fixture(autouse=False, scope="session")
+def alloydb_omni_17_image() -> str:
+    return "google/alloydbomni:17"
+
+
 @pytest.fixture(autouse=False, scope="session")
 def alloydb_omni_17_service(
     docker_service: DockerService,
+    alloydb_omni_17_image: str,
     xdist_postgres_isolation_level: XdistIsolationLevel,
+    xdist_postgres_workers_per_server: int,
+    postgres_use_tmpfs: bool,
+    database_profile: DatabaseProfile,
     postgres_host: str,
     postgres_user: str,
     postgres_password: str,
@@ -1156,9 +1462,12 @@ def alloydb_omni_17_service(
 ) -> Generator[PostgresService, None, None]:
     with _provide_postgres_service(
         docker_service,
-        image="google/alloydbomni:17",
+        image=alloydb_omni_17_image,
         name="alloydb-omni-17",
         xdist_postgres_isolate=xdist_postgres_isolation_level,
+        workers_per_server=xdist_postgres_workers_per_server,
+        use_tmpfs=postgres_use_tmpfs,
+        profile=database_profile,
         host=postgres_host,
         user=postgres_user,
         password=postgres_password,
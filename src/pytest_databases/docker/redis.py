@@ -7,7 +7,7 @@ import pytest
 from redis import Redis
 from redis.exceptions import ConnectionError as RedisConnectionError
 
-from pytest_databases.helpers import get_xdist_worker_num
+from pytest_databases.helpers import get_xdist_shard_num, get_xdist_worker_num
 from pytest_databases.types import ServiceContainer, XdistIsolationLevel
 
 if TYPE_CHECKING:
@@ -26,6 +26,11 @@ def xdist_redis_isolation_level() -> XdistIsolationLevel:
     return "database"
 
 
+@pytest.fixture(scope="session")
+def xdist_redis_workers_per_server() -> int:
+    return 4
+
+
 def redis_responsive(service_container: ServiceContainer) -> bool:
     client = Redis(host=service_container.host, port=service_container.port)
     try:
@@ -56,6 +61,7 @@ def redis_service(
     docker_service: DockerService,
     redis_image: str,
     xdist_redis_isolation_level: XdistIsolationLevel,
+    xdist_redis_workers_per_server: int,
 ) -> Generator[RedisService, None, None]:
     worker_num = get_xdist_worker_num()
     name = "redis"
@@ -63,6 +69,9 @@ def redis_service(
     if worker_num is not None:
         if xdist_redis_isolation_level == "database":
             db = worker_num
+        elif xdist_redis_isolation_level == "shard":
+            db = worker_num % xdist_redis_workers_per_server
+            name += f"_shard_{get_xdist_shard_num(xdist_redis_workers_per_server)}"
         else:
             name += f"_{worker_num + 1}"
 
@@ -91,6 +100,7 @@ def dragonfly_service(
     docker_service: DockerService,
     dragonfly_image: str,
     xdist_redis_isolation_level: XdistIsolationLevel,
+    xdist_redis_workers_per_server: int,
 ) -> Generator[RedisService, None, None]:
     worker_num = get_xdist_worker_num()
     name = "dragonfly"
@@ -98,6 +108,9 @@ def dragonfly_service(
     if worker_num is not None:
         if xdist_redis_isolation_level == "database":
             db = worker_num
+        elif xdist_redis_isolation_level == "shard":
+            db = worker_num % xdist_redis_workers_per_server
+            name += f"_shard_{get_xdist_shard_num(xdist_redis_workers_per_server)}"
         else:
             name += f"_{worker_num + 1}"
 
@@ -136,6 +149,7 @@ def keydb_service(
     docker_service: DockerService,
     keydb_image: str,
     xdist_redis_isolation_level: XdistIsolationLevel,
+    xdist_redis_workers_per_server: int,
 ) -> Generator[RedisService, None, None]:
     worker_num = get_xdist_worker_num()
     name = "keydb"
@@ -143,6 +157,9 @@ def keydb_service(
     if worker_num is not None:
         if xdist_redis_isolation_level == "database":
             db = worker_num
+        elif xdist_redis_isolation_level == "shard":
+            db = worker_num % xdist_redis_workers_per_server
+            name += f"_shard_{get_xdist_shard_num(xdist_redis_workers_per_server)}"
         else:
             name += f"_{worker_num + 1}"
 
@@ -8,7 +8,6 @@ from urllib.error import URLError
 from urllib.request import Request, urlopen
 
 import pytest
-from docker.errors import ImageNotFound
 
 from pytest_databases.docker import TRUE_VALUES
 from pytest_databases.helpers import get_xdist_worker_num
@@ -58,9 +57,22 @@ def rustfs_default_bucket_name(xdist_rustfs_isolation_level: XdistIsolationLevel
     return "pytest-databases"
 
 
+@pytest.fixture(scope="session")
+def rustfs_image() -> str:
+    return "rustfs/rustfs:latest"
+
+
+@pytest.fixture(scope="session")
+def rustfs_client_image() -> str:
+    """Image of the ``rc`` client that creates the default bucket."""
+    return "rustfs/rc:latest"
+
+
 @pytest.fixture(scope="session")
 def rustfs_service(
     docker_service: "DockerService",
+    rustfs_image: str,
+    rustfs_client_image: str,
     rustfs_access_key: str,
     rustfs_secret_key: str,
     rustfs_secure: bool,
@@ -93,7 +105,7 @@ def rustfs_service(
     }
 
     with docker_service.run(
-        image="rustfs/rustfs:latest",
+        image=rustfs_image,
         name=name,
         container_port=9000,
         timeout=30,
@@ -110,11 +122,7 @@ def rustfs_service(
         # We need the Docker client to run the one-shot container
         client = docker_service._client
 
-        # Pull the RC image first if not present
-        try:
-            client.images.get("rustfs/rc:latest")
-        except ImageNotFound:
-            client.images.pull("rustfs/rc:latest")
+        docker_service.ensure_image(rustfs_client_image)
 
         # Run rc container to create bucket
         # Command: rc alias set local <url> <access> <secret> && rc mb local/<bucket>
@@ -131,7 +139,7 @@ def rustfs_service(
 
         with contextlib.suppress(Exception):
             client.containers.run(
-                image="rustfs/rc:latest",
+                image=rustfs_client_image,
                 command=command,
                 remove=True,
                 network_mode="host",  # Use host network to connect to the mapped port
@@ -1,20 +1,17 @@
 from __future__ import annotations
 
-import shlex
 import time
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 import pytest
-from docker.errors import ContainerError
 
-from pytest_databases.helpers import get_xdist_worker_num
+from pytest_databases._probes import ProbeError, postgres_ping, postgres_session
+from pytest_databases.helpers import get_xdist_shard_num, get_xdist_worker_num
 from pytest_databases.types import ServiceContainer
 
 if TYPE_CHECKING:
-    from collections.abc import Generator, Iterator
-
-    from docker.models.containers import Container
+    from collections.abc import Generator
 
     from pytest_databases._service import DockerService
     from pytest_databases.types import XdistIsolationLevel
@@ -27,14 +24,6 @@ YUGABYTE_DATABASE = "pytest_databases"
 YUGABYTE_TSERVER_FLAGS = "reject_writes_min_disk_space_mb=128"
 
 
-def _output_to_bytes(output: bytes | str | Iterator[bytes]) -> bytes:
-    if isinstance(output, bytes):
-        return output
-    if isinstance(output, str):
-        return output.encode()
-    return b"".join(output)
-
-
 def _quote_identifier(value: str) -> str:
     return f'"{value.replace(chr(34), chr(34) * 2)}"'
 
@@ -48,6 +37,11 @@ def xdist_yugabyte_isolation_level() -> XdistIsolationLevel:
     return "database"
 
 
+@pytest.fixture(scope="session")
+def xdist_yugabyte_workers_per_server() -> int:
+    return 4
+
+
 @dataclass
 class YugabyteService(ServiceContainer):
     database: str
@@ -75,46 +69,6 @@ def yugabyte_database() -> str:
     return YUGABYTE_DATABASE
 
 
-def _make_ysqlsh_command(
-    sql: str,
-    *,
-    database: str = YUGABYTE_DB,
-    user: str = YUGABYTE_USER,
-    host: str = "$(hostname)",
-    port: int | None = None,
-) -> str:
-    command_parts = [
-        "bin/ysqlsh",
-        f"-h {host}",
-    ]
-    if port is not None:
-        command_parts.append(f"-p {port}")
-    command_parts.extend([
-        f"-U {shlex.quote(user)}",
-        f"-d {shlex.quote(database)}",
-        "-tAc",
-        shlex.quote(sql),
-    ])
-    return " ".join(command_parts)
-
-
-def _exec_ysqlsh(
-    container: Container,
-    sql: str,
-    *,
-    database: str = YUGABYTE_DB,
-    user: str = YUGABYTE_USER,
-    password: str | None = None,
-) -> tuple[int, bytes]:
-    environment = {"PGPASSWORD": password} if password is not None else None
-    result = container.exec_run([
-        "sh",
-        "-c",
-        _make_ysqlsh_command(sql, database=database, user=user),
-    ], environment=environment)
-    return result.exit_code if result.exit_code is not None else -1, _output_to_bytes(result.output)
-
-
 def _make_role_sql(user: str, password: str) -> str:
     quoted_user = _quote_identifier(user)
     quoted_password = _quote_literal(password)
@@ -130,131 +84,58 @@ def _make_role_sql(user: str, password: str) -> str:
     )
 
 
-def _ensure_yugabyte_role(container: Container, user: str, password: str) -> tuple[bool, bytes]:
-    exit_code, output = _exec_ysqlsh(container, _make_role_sql(user, password))
-    return exit_code == 0, output
-
-
-def _ensure_yugabyte_database(container: Container, database: str, user: str) -> tuple[bool, bytes]:
-    quoted_database = _quote_identifier(database)
-    quoted_database_literal = _quote_literal(database)
-    quoted_user = _quote_identifier(user)
-    exists_code, exists_output = _exec_ysqlsh(
-        container,
-        f"SELECT 1 FROM pg_database WHERE datname = {quoted_database_literal}",
-    )
-    if exists_code != 0:
-        return False, exists_output
-
-    if exists_output.strip() != b"1":
-        create_code, create_output = _exec_ysqlsh(container, f"CREATE DATABASE {quoted_database} OWNER {quoted_user}")
-        if create_code != 0:
-            return False, create_output
-
-    grant_code, grant_output = _exec_ysqlsh(
-        container,
-        f"GRANT ALL PRIVILEGES ON DATABASE {quoted_database} TO {quoted_user}",
-    )
-    if grant_code != 0:
-        return False, grant_output
-
-    schema_code, schema_output = _exec_ysqlsh(
-        container,
-        f"GRANT ALL PRIVILEGES ON SCHEMA public TO {quoted_user}",
-        database=database,
-    )
-    return schema_code == 0, schema_output
-
-
-def _verify_yugabyte_database_access(
-    container: Container,
-    database: str,
-    user: str,
-    password: str,
-) -> tuple[bool, bytes]:
-    exit_code, output = _exec_ysqlsh(
-        container,
-        "SELECT 1",
-        database=database,
-        user=user,
-        password=password,
-    )
-    return exit_code == 0 and output.strip() == b"1", output
+def _setup_yugabyte_database(service: ServiceContainer, database: str, user: str, password: str) -> None:
+    with postgres_session(service.host, service.port, YUGABYTE_USER, YUGABYTE_PASSWORD, YUGABYTE_DB) as query:
+        query(_make_role_sql(user, password))
+        # CREATE DATABASE cannot run in a DO block, so it has to be conditional here
+        if not query(f"SELECT 1 FROM pg_database WHERE datname = {_quote_literal(database)}"):
+            query(f"CREATE DATABASE {_quote_identifier(database)} OWNER {_quote_identifier(user)}")
+        query(f"GRANT ALL PRIVILEGES ON DATABASE {_quote_identifier(database)} TO {_quote_identifier(user)}")
+    # schema privileges are granted from within the database
+    with postgres_session(service.host, service.port, YUGABYTE_USER, YUGABYTE_PASSWORD, database) as query:
+        query(f"GRANT ALL PRIVILEGES ON SCHEMA public TO {_quote_identifier(user)}")
 
 
 def _prepare_yugabyte_database(
-    container: Container,
+    service: ServiceContainer,
     container_name: str,
     database: str,
     user: str,
     password: str,
 ) -> None:
-    last_output = b""
+    last_error = ""
     for attempt in range(15):
-        role_ready, role_output = _ensure_yugabyte_role(container, user, password)
-        database_ready, database_output = _ensure_yugabyte_database(container, database, user) if role_ready else (False, role_output)
-        access_ready, access_output = (
-            _verify_yugabyte_database_access(container, database, user, password) if database_ready else (False, database_output)
-        )
-        if access_ready:
-            return
+        try:
+            _setup_yugabyte_database(service, database, user, password)
+        except (OSError, ProbeError) as exc:
+            last_error = str(exc)
+        else:
+            # through the mapped port, as the tests will connect
+            if postgres_ping(service.host, service.port, user, password, database):
+                return
+            last_error = f"user {user!r} could not run queries"
 
-        last_output = access_output
         time.sleep(1 + attempt * 0.5)
 
     msg = (
         f"Yugabyte fixture {container_name!r}: user {user!r} could not reach database "
-        f"{database!r} after 15 attempts. Last output: {last_output!r}"
+        f"{database!r} at {service.host}:{service.port} after 15 attempts. Last error: {last_error}"
     )
     raise RuntimeError(msg)
 
 
-def _validate_mapped_endpoint(
-    docker_service: DockerService,
-    image: str,
-    service: ServiceContainer,
-    database: str,
-    user: str,
-    password: str,
-) -> tuple[int, bytes]:
-    try:
-        output = docker_service._client.containers.run(
-            image=image,
-            command=[
-                "sh",
-                "-c",
-                _make_ysqlsh_command(
-                    "SELECT 1",
-                    database=database,
-                    user=user,
-                    host=service.host,
-                    port=service.port,
-                ),
-            ],
-            environment={"PGPASSWORD": password},
-            network_mode="host",
-            remove=True,
-        )
-    except ContainerError as exc:
-        return exc.exit_status, _output_to_bytes(exc.stderr) if exc.stderr else str(exc).encode()
-    return 0, _output_to_bytes(output)
-
-
 @pytest.fixture(scope="session")
 def yugabyte_service(
     docker_service: "DockerService",
     xdist_yugabyte_isolation_level: XdistIsolationLevel,
+    xdist_yugabyte_workers_per_server: int,
     yugabyte_image: str,
     yugabyte_user: str,
     yugabyte_password: str,
     yugabyte_database: str,
 ) -> Generator[YugabyteService, None, None]:
     def yugabyte_responsive(_service: ServiceContainer) -> bool:
-        container = docker_service._get_container(f"pytest_databases_{container_name}")
-        if container is None:
-            return False
-        exit_code, output = _exec_ysqlsh(container, "SELECT 1")
-        return exit_code == 0 and output.strip() == b"1"
+        return postgres_ping(_service.host, _service.port, YUGABYTE_USER, YUGABYTE_PASSWORD, YUGABYTE_DB)
 
     container_name = "yugabyte"
     db_name = yugabyte_database
@@ -265,6 +146,8 @@ def yugabyte_service(
             container_name += suffix
         else:
             db_name += suffix
+            if xdist_yugabyte_isolation_level == "shard":
+                container_name += f"_shard_{get_xdist_shard_num(xdist_yugabyte_workers_per_server)}"
 
     with docker_service.run(
         image=yugabyte_image,
@@ -275,40 +158,17 @@ def yugabyte_service(
         transient=xdist_yugabyte_isolation_level == "server",
         timeout=120,
         pause=1.0,
+        snapshot=_make_role_sql(yugabyte_user, yugabyte_password),
     ) as service:
-        container = docker_service._get_container(f"pytest_databases_{container_name}")
-        if container is None:
-            msg = f"Yugabyte container {container_name!r} disappeared after startup"
-            raise RuntimeError(msg)
-
         _prepare_yugabyte_database(
-            container,
+            service,
             container_name,
             db_name,
             yugabyte_user,
             yugabyte_password,
         )
 
-        last_output = b""
-        for attempt in range(5):
-            endpoint_code, endpoint_output = _validate_mapped_endpoint(
-                docker_service,
-                yugabyte_image,
-                service,
-                db_name,
-                yugabyte_user,
-                yugabyte_password,
-            )
-            if endpoint_code == 0 and endpoint_output.strip() == b"1":
-                break
-            last_output = endpoint_output
-            time.sleep(1 + attempt * 0.5)
-        else:
-            msg = (
-                f"Yugabyte fixture {container_name!r}: mapped endpoint {service.host}:{service.port} "
-                f"was not ready after 5 attempts. Last output: {last_output!r}"
-            )
-            raise RuntimeError(msg)
+        docker_service.commit_snapshot(service)
 
         yield YugabyteService(
             host=service.host,
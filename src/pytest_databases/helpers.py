@@ -5,6 +5,8 @@ import os
 import platform
 from typing import Literal
 
+TRUE_VALUES = {"True", "true", "1", "yes", "y", "Y", "T", "on", "enabled", "ok"}
+
 
 def simple_string_hash(string_to_hash: str) -> str:
     """Generates a short hash based on a string.
@@ -39,6 +41,24 @@ def get_xdist_worker_count() -> int:
     return int(os.getenv("PYTEST_XDIST_WORKER_COUNT", "0"))
 
 
+def get_xdist_shard_num(workers_per_server: int) -> int | None:
+    """Number of the server this xdist worker uses with ``"shard"`` isolation.
+
+    Consecutive workers are packed ``workers_per_server`` to a server, which
+    gives ``ceil(worker count / workers_per_server)`` servers in total.
+
+    Args:
+      workers_per_server: How many workers share one server.
+
+    Returns:
+      The shard number, or ``None`` when not running under xdist.
+    """
+    worker_num = get_xdist_worker_num()
+    if worker_num is None:
+        return None
+    return worker_num // max(workers_per_server, 1)
+
+
 def get_cpu_architecture() -> Literal["x86_64", "arm", "unknown"]:
     """Detects the CPU architecture.
 
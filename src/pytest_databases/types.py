@@ -1,17 +1,50 @@
 from __future__ import annotations
 
 import dataclasses
+import time
+from contextlib import contextmanager
 from typing import TYPE_CHECKING, Literal
 
 if TYPE_CHECKING:
+    from collections.abc import Generator
+
     from docker.models.containers import Container
 
 
+@dataclasses.dataclass
+class ServiceTimings:
+    """Seconds spent in each phase of starting and stopping a service.
+
+    ``spans`` keeps every measured interval as ``(phase, start, duration)``,
+    with ``start`` as a UNIX timestamp, for timelines across processes.
+    """
+
+    phases: dict[str, float] = dataclasses.field(default_factory=dict)
+    check_attempts: int = 0
+    spans: list[tuple[str, float, float]] = dataclasses.field(default_factory=list)
+
+    @contextmanager
+    def measure(self, phase: str) -> Generator[None, None, None]:
+        started_at = time.time()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - started
+            self.phases[phase] = self.phases.get(phase, 0.0) + duration
+            self.spans.append((phase, started_at, duration))
+
+
 @dataclasses.dataclass
 class ServiceContainer:
     container: Container
     host: str
     port: int
+    timings: ServiceTimings = dataclasses.field(default_factory=ServiceTimings, init=False, repr=False, compare=False)
 
 
-XdistIsolationLevel = Literal["database", "server"]
+# "database": one server for all workers, each with its own database
+# "server": a server per worker
+# "shard": a server per xdist_<service>_workers_per_server workers, each with its own database
+XdistIsolationLevel = Literal["database", "server", "shard"]
+DatabaseProfile = Literal["default", "fast"]
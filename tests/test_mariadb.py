@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import pytest
 
+from pytest_databases.docker import mariadb
+
 
 @pytest.mark.parametrize(
     "service_fixture",
@@ -94,3 +96,8 @@ def test_xdist_isolate_server(pytester: pytest.Pytester) -> None:
 
     result = pytester.runpytest_subprocess("-p", "pytest_databases", "-n", "2")
     result.assert_outcomes(passed=2)
+
+
+def test_profile_command() -> None:
+    assert mariadb._make_command("fast") == mariadb.FAST_PROFILE_COMMAND
+    assert mariadb._make_command("default") is None
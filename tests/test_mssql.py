@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import pytest
 
+from pytest_databases.docker import mssql
 from tests.conftest import PLATFORM_PROCESSOR
 
 
@@ -132,3 +133,13 @@ def test_xdist_isolate_server(pytester: pytest.Pytester, mssql_test_helpers: str
 
     result = pytester.runpytest_subprocess("-p", "pytest_databases", "-n", "2", "-vv")
     result.assert_outcomes(passed=2)
+
+
+def test_fast_profile_delays_durability() -> None:
+    delayed_durability = "ALTER DATABASE [pytest_databases] SET DELAYED_DURABILITY = FORCED;"
+
+    fast = mssql._make_setup_sql("pytest_databases", "app", "secret", "fast")
+    default = mssql._make_setup_sql("pytest_databases", "app", "secret")
+
+    assert delayed_durability in fast
+    assert "DELAYED_DURABILITY" not in default
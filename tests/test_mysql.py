@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import pytest
 
+from pytest_databases.docker import mysql
+
 
 @pytest.mark.parametrize(
     "service_fixture",
@@ -101,3 +103,29 @@ def test_xdist_isolate_server(pytester: pytest.Pytester) -> None:
 
     result = pytester.runpytest_subprocess("-p", "pytest_databases", "-n", "2")
     result.assert_outcomes(passed=2)
+
+
+@pytest.mark.parametrize(
+    ("image", "skip_log_bin"),
+    [
+        ("mysql:8", True),
+        ("docker.io/library/mysql:8.4", True),
+        ("mysql:5.7", False),
+        ("docker.io/library/mysql:5.7", False),
+        ("mirror.local:5000/mysql:5.6", False),
+    ],
+)
+def test_fast_profile_command(image: str, skip_log_bin: bool) -> None:
+    command = mysql._make_command(image, "fast")
+
+    assert command is not None
+    for arg in mysql.FAST_PROFILE_ARGS:
+        assert arg in command
+    assert ("--skip-log-bin" in command) is skip_log_bin
+
+
+def test_default_profile_command() -> None:
+    assert mysql._make_command("mysql:8", "default") is None
+    assert mysql._make_command("mysql:8", "default", "/var/lib/pytest-databases") == (
+        "--datadir=/var/lib/pytest-databases"
+    )
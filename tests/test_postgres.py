@@ -4,6 +4,8 @@ import socket
 
 import pytest
 
+from pytest_databases.docker import postgres
+
 
 def _pick_free_port() -> int:
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
@@ -212,3 +214,8 @@ def test_xdist_isolate_server(pytester: pytest.Pytester) -> None:
 
     result = pytester.runpytest_subprocess("-p", "pytest_databases", "-n", "2")
     result.assert_outcomes(passed=2)
+
+
+def test_profile_command() -> None:
+    assert postgres._make_command("fast") == postgres.FAST_PROFILE_COMMAND
+    assert postgres._make_command("default") is None
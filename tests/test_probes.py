@@ -0,0 +1,355 @@
+"""Tests for the wire-protocol readiness probes, against fake servers."""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import socket
+import struct
+import threading
+from contextlib import contextmanager, suppress
+from typing import TYPE_CHECKING, Any, Callable
+
+import pytest
+
+from pytest_databases._probes import (
+    TDS_RESPONSE,
+    ProbeError,
+    _decode_bson,
+    _encode_bson,
+    _read_mysql_packet,
+    _read_pg_message,
+    _read_tds_message,
+    _recv_exactly,
+    _sha1,
+    _tds_obfuscate,
+    _write_mysql_packet,
+    _write_pg_message,
+    _write_tds_message,
+    mongodb_ping,
+    mssql_execute,
+    mssql_ping,
+    mysql_ping,
+    oracle_ping,
+    postgres_ping,
+    postgres_session,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+NONCE = b"abcdefgh" + b"ijklmnopqrst"
+
+
+@contextmanager
+def _fake_server(handler: Callable[[socket.socket], None]) -> Generator[int, None, None]:
+    """Serve one connection with ``handler``.
+
+    Yields:
+        The port to connect to.
+    """
+    listener = socket.create_server(("127.0.0.1", 0))
+
+    def serve() -> None:
+        conn, _ = listener.accept()
+        with conn:
+            handler(conn)
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    try:
+        yield listener.getsockname()[1]
+    finally:
+        listener.close()
+        thread.join(timeout=5)
+
+
+def _mysql_handshake(plugin: bytes = b"mysql_native_password") -> bytes:
+    return (
+        b"\x0a8.4.0\x00"
+        + (7).to_bytes(4, "little")
+        + NONCE[:8]
+        + b"\x00"
+        + b"\xff\xf7"
+        + b"\x21"
+        + b"\x02\x00"
+        + b"\xff\x81"
+        + bytes([len(NONCE) + 1])
+        + bytes(10)
+        + NONCE[8:]
+        + b"\x00"
+        + plugin
+        + b"\x00"
+    )
+
+
+def _mysql_login_user_and_token(payload: bytes) -> tuple[bytes, bytes]:
+    user, _, rest = payload[32:].partition(b"\0")
+    return user, rest[1 : 1 + rest[0]]
+
+
+def _native_password_matches(token: bytes, password: str) -> bool:
+    # what the server does: it only stores SHA1(SHA1(password))
+    stored = _sha1(_sha1(password.encode()))
+    candidate = bytes(a ^ b for a, b in zip(token, _sha1(NONCE + stored)))
+    return _sha1(candidate) == stored
+
+
+def _mysql_server(password: str, plugin: bytes = b"mysql_native_password") -> Callable[[socket.socket], None]:
+    def handler(conn: socket.socket) -> None:
+        _write_mysql_packet(conn, 0, _mysql_handshake(plugin))
+        sequence, payload = _read_mysql_packet(conn)
+        user, token = _mysql_login_user_and_token(payload)
+        if plugin == b"caching_sha2_password":
+            # nothing cached after a restart: the client must do the full exchange
+            _write_mysql_packet(conn, sequence + 1, b"\x01\x04")
+        elif user == b"root" and _native_password_matches(token, password):
+            _write_mysql_packet(conn, sequence + 1, b"\x00\x00\x00\x02\x00\x00\x00")
+        else:
+            _write_mysql_packet(conn, sequence + 1, b"\xff\x15\x04#28000Access denied")
+
+    return handler
+
+
+def test_mysql_ping_accepts_handshake() -> None:
+    with _fake_server(lambda conn: _write_mysql_packet(conn, 0, _mysql_handshake())) as port:
+        assert mysql_ping("127.0.0.1", port)
+
+
+@pytest.mark.parametrize(("password", "expected"), [("secret", True), ("wrong", False)])
+def test_mysql_ping_logs_in_with_native_password(password: str, expected: bool) -> None:
+    with _fake_server(_mysql_server("secret")) as port:
+        assert mysql_ping("127.0.0.1", port, user="root", password=password) is expected
+
+
+def test_mysql_ping_accepts_caching_sha2_full_authentication_request() -> None:
+    with _fake_server(_mysql_server("secret", plugin=b"caching_sha2_password")) as port:
+        assert mysql_ping("127.0.0.1", port, user="root", password="secret")
+
+
+def test_mysql_ping_rejects_error_packet() -> None:
+    def handler(conn: socket.socket) -> None:
+        _write_mysql_packet(conn, 0, b"\xff\x10\x04Too many connections")
+
+    with _fake_server(handler) as port:
+        assert not mysql_ping("127.0.0.1", port)
+
+
+def _tds_error(message: str) -> bytes:
+    text = message.encode("utf-16-le")
+    body = struct.pack("<IBBH", 18456, 1, 14, len(message)) + text + bytes(4) + struct.pack("<I", 1)
+    return struct.pack("<BH", 0xAA, len(body)) + body
+
+
+def _tds_done(status: int = 0) -> bytes:
+    return struct.pack("<BHHQ", 0xFD, status, 0, 0)
+
+
+def _tds_login_credentials(payload: bytes) -> tuple[str, bytes]:
+    # the user and password offset/length pairs follow the hostname's
+    user_offset, user_length, password_offset, password_length = struct.unpack_from("<HHHH", payload, 40)
+    user = payload[user_offset : user_offset + user_length * 2].decode("utf-16-le")
+    return user, payload[password_offset : password_offset + password_length * 2]
+
+
+def _mssql_server(password: str, batch_error: str | None = None) -> Callable[[socket.socket], None]:
+    def handler(conn: socket.socket) -> None:
+        assert _read_tds_message(conn)
+        _write_tds_message(conn, TDS_RESPONSE, b"\x00\x00\x06\x00\x06\xff" + bytes(6))
+        user, token = _tds_login_credentials(_read_tds_message(conn))
+        if user != "sa" or token != _tds_obfuscate(password):
+            _write_tds_message(conn, TDS_RESPONSE, _tds_error("Login failed for user 'sa'.") + _tds_done(0x02))
+            return
+        login_ack = b"\x01\x74\x00\x00\x04\x00" + bytes(4)
+        _write_tds_message(conn, TDS_RESPONSE, struct.pack("<BH", 0xAD, len(login_ack)) + login_ack + _tds_done())
+        with suppress(ProbeError):
+            # pings disconnect after the login
+            _read_tds_message(conn)
+            response = _tds_error(batch_error) + _tds_done(0x02) if batch_error else _tds_done()
+            _write_tds_message(conn, TDS_RESPONSE, response)
+
+    return handler
+
+
+@pytest.mark.parametrize(("password", "expected"), [("secret", True), ("wrong", False)])
+def test_mssql_ping_requires_a_login(password: str, expected: bool) -> None:
+    with _fake_server(_mssql_server("secret")) as port:
+        assert mssql_ping("127.0.0.1", port, "sa", password) is expected
+
+
+def test_mssql_execute_sends_one_batch() -> None:
+    with _fake_server(_mssql_server("secret")) as port:
+        mssql_execute("127.0.0.1", port, "sa", "secret", "CREATE DATABASE [db];")
+
+
+def test_mssql_execute_raises_batch_errors() -> None:
+    server = _fake_server(_mssql_server("secret", batch_error="Database 'db' already exists."))
+    with server as port, pytest.raises(ProbeError, match="already exists"):
+        mssql_execute("127.0.0.1", port, "sa", "secret", "CREATE DATABASE [db];")
+
+
+def _tns_packet(packet_type: int, body: bytes = b"") -> bytes:
+    return struct.pack(">HHBBH", len(body) + 8, 0, packet_type, 0, 0) + body
+
+
+def _oracle_listener(service_name: str, resend: bool = False) -> Callable[[socket.socket], None]:
+    def handler(conn: socket.socket) -> None:
+        if resend:
+            conn.recv(4096)
+            conn.sendall(_tns_packet(0x0B))
+        header = _recv_exactly(conn, 8)
+        length, _, packet_type = struct.unpack_from(">HHB", header)
+        packet = header + _recv_exactly(conn, length - 8)
+        data_length, data_offset = struct.unpack_from(">HH", packet, 24)
+        connect_data = packet[data_offset : data_offset + data_length].decode()
+        assert packet_type == 0x01
+        if f"(SERVICE_NAME={service_name})" in connect_data:
+            conn.sendall(_tns_packet(0x02, bytes(24)))
+        else:
+            conn.sendall(_tns_packet(0x04, b"\x01\x01\x00\x0a(ERR=12514)"))
+
+    return handler
+
+
+@pytest.mark.parametrize(("service_name", "expected"), [("FREEPDB1", True), ("XEPDB1", False)])
+def test_oracle_ping_requires_the_service_to_be_registered(service_name: str, expected: bool) -> None:
+    with _fake_server(_oracle_listener("FREEPDB1")) as port:
+        assert oracle_ping("127.0.0.1", port, service_name) is expected
+
+
+def test_oracle_ping_resends_the_connect_packet() -> None:
+    with _fake_server(_oracle_listener("FREEPDB1", resend=True)) as port:
+        assert oracle_ping("127.0.0.1", port, "FREEPDB1")
+
+
+def _mongodb_reply(conn: socket.socket, reply: dict[str, Any]) -> None:
+    body = struct.pack("<IB", 0, 0) + _encode_bson(reply)
+    conn.sendall(struct.pack("<iiii", len(body) + 16, 2, 1, 2013) + body)
+
+
+def _mongodb_request(conn: socket.socket) -> dict[str, Any]:
+    length = struct.unpack("<i", _recv_exactly(conn, 4))[0]
+    # the rest of the header, the flags and the section kind precede the document
+    return _decode_bson(_recv_exactly(conn, length - 4)[17:])
+
+
+def _mongodb_server(password: str) -> Callable[[socket.socket], None]:
+    salt, iterations = b"0123456789abcdef", 4096
+    salted = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+    stored_key = hashlib.sha256(hmac.digest(salted, b"Client Key", "sha256")).digest()
+
+    def handler(conn: socket.socket) -> None:
+        start = _mongodb_request(conn)
+        assert start["mechanism"] == "SCRAM-SHA-256"
+        client_first_bare = start["payload"].decode()[3:]
+        nonce = client_first_bare.split("r=", 1)[1] + "server"
+        server_first = f"r={nonce},s={base64.b64encode(salt).decode()},i={iterations}"
+        _mongodb_reply(conn, {"conversationId": 1, "payload": server_first.encode(), "done": False, "ok": 1})
+
+        client_final, _, proof = _mongodb_request(conn)["payload"].decode().rpartition(",p=")
+        auth_message = f"{client_first_bare},{server_first},{client_final}".encode()
+        signature = hmac.digest(stored_key, auth_message, "sha256")
+        client_key = bytes(a ^ b for a, b in zip(base64.b64decode(proof), signature))
+        if hashlib.sha256(client_key).digest() != stored_key:
+            _mongodb_reply(conn, {"ok": 0, "errmsg": "Authentication failed.", "code": 18})
+            return
+        server_signature = hmac.digest(hmac.digest(salted, b"Server Key", "sha256"), auth_message, "sha256")
+        verifier = f"v={base64.b64encode(server_signature).decode()}".encode()
+        _mongodb_reply(conn, {"conversationId": 1, "payload": verifier, "done": True, "ok": 1})
+
+        assert _mongodb_request(conn) == {"ping": 1, "$db": "admin"}
+        _mongodb_reply(conn, {"ok": 1})
+
+    return handler
+
+
+def test_bson_round_trip() -> None:
+    document = {"ok": 1, "done": True, "payload": b"\x00\x01", "errmsg": "é", "options": {"nested": False}}
+    assert _decode_bson(_encode_bson(document)) == document
+
+
+@pytest.mark.parametrize(("password", "expected"), [("secret", True), ("wrong", False)])
+def test_mongodb_ping_authenticates_with_scram(password: str, expected: bool) -> None:
+    with _fake_server(_mongodb_server("secret")) as port:
+        assert mongodb_ping("127.0.0.1", port, user="mongo_user", password=password) is expected
+
+
+def _pg_error(message: str) -> bytes:
+    return b"SERROR\0C28P01\0M" + message.encode() + b"\0\0"
+
+
+def _postgres_server(password: str, queries: dict[str, bytes]) -> Callable[[socket.socket], None]:
+    salt, iterations = b"fedcba9876543210", 4096
+    salted = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+    stored_key = hashlib.sha256(hmac.digest(salted, b"Client Key", "sha256")).digest()
+
+    def handler(conn: socket.socket) -> None:
+        length = struct.unpack(">i", _recv_exactly(conn, 4))[0]
+        assert b"user\0yugabyte\0" in _recv_exactly(conn, length - 4)
+        _write_pg_message(conn, b"R", struct.pack(">i", 10) + b"SCRAM-SHA-256\0\0")
+
+        body = _read_pg_message(conn)[1]
+        client_first_bare = body[body.index(b"n,,") + 3 :].decode()
+        nonce = client_first_bare.split("r=", 1)[1] + "server"
+        server_first = f"r={nonce},s={base64.b64encode(salt).decode()},i={iterations}"
+        _write_pg_message(conn, b"R", struct.pack(">i", 11) + server_first.encode())
+
+        client_final, _, proof = _read_pg_message(conn)[1].decode().rpartition(",p=")
+        auth_message = f"{client_first_bare},{server_first},{client_final}".encode()
+        signature = hmac.digest(stored_key, auth_message, "sha256")
+        client_key = bytes(a ^ b for a, b in zip(base64.b64decode(proof), signature))
+        if hashlib.sha256(client_key).digest() != stored_key:
+            _write_pg_message(conn, b"E", _pg_error("password authentication failed"))
+            return
+        server_signature = hmac.digest(hmac.digest(salted, b"Server Key", "sha256"), auth_message, "sha256")
+        _write_pg_message(conn, b"R", struct.pack(">i", 12) + b"v=" + base64.b64encode(server_signature))
+        _write_pg_message(conn, b"R", struct.pack(">i", 0))
+        _write_pg_message(conn, b"S", b"server_version\x0011.2-YB\0")
+        _write_pg_message(conn, b"Z", b"I")
+
+        while True:
+            message_type, body = _read_pg_message(conn)
+            if message_type == b"X":
+                return
+            sql = body.rstrip(b"\0").decode()
+            if sql in queries:
+                _write_pg_message(conn, b"D", struct.pack(">hi", 1, len(queries[sql])) + queries[sql])
+                _write_pg_message(conn, b"C", b"SELECT 1\0")
+            else:
+                _write_pg_message(conn, b"E", _pg_error(f"cannot run {sql}"))
+            _write_pg_message(conn, b"Z", b"I")
+
+    return handler
+
+
+@pytest.mark.parametrize(("password", "expected"), [("secret", True), ("wrong", False)])
+def test_postgres_ping_authenticates_with_scram(password: str, expected: bool) -> None:
+    with _fake_server(_postgres_server("secret", {"SELECT 1": b"1"})) as port:
+        assert postgres_ping("127.0.0.1", port, "yugabyte", password, "yugabyte") is expected
+
+
+def test_postgres_session_runs_queries_until_one_fails() -> None:
+    server = _fake_server(_postgres_server("secret", {"SELECT datname FROM pg_database": b"yugabyte"}))
+    with server as port, postgres_session("127.0.0.1", port, "yugabyte", "secret", "yugabyte") as query:
+        assert query("SELECT datname FROM pg_database") == [("yugabyte",)]
+        with pytest.raises(ProbeError, match="cannot run CREATE DATABASE"):
+            query("CREATE DATABASE db")
+        assert query("SELECT datname FROM pg_database") == [("yugabyte",)]
+
+
+@pytest.mark.parametrize(
+    "ping",
+    [
+        lambda port: mysql_ping("127.0.0.1", port, timeout=1),
+        lambda port: mssql_ping("127.0.0.1", port, "sa", "secret", timeout=1),
+        lambda port: oracle_ping("127.0.0.1", port, "FREEPDB1", timeout=1),
+        lambda port: mongodb_ping("127.0.0.1", port, timeout=1),
+        lambda port: postgres_ping("127.0.0.1", port, "yugabyte", "yugabyte", "yugabyte", timeout=1),
+    ],
+    ids=["mysql", "mssql", "oracle", "mongodb", "postgres"],
+)
+def test_probes_fail_when_the_connection_is_closed_right_away(ping: Callable[[int], bool]) -> None:
+    # what Docker's port proxy does while nothing listens in the container
+    with _fake_server(lambda _: None) as port:
+        assert not ping(port)
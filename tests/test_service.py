@@ -0,0 +1,943 @@
+"""Tests for ``DockerService`` behavior shared by all services."""
+
+from __future__ import annotations
+
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, ClassVar
+
+import pytest
+from docker.errors import APIError, ImageNotFound, NotFound
+
+from pytest_databases import _service
+from pytest_databases._service import (
+    EXPIRES_LABEL,
+    NAME_LABEL,
+    OWNER_HOST_LABEL,
+    OWNER_PID_LABEL,
+    REUSE_LABEL,
+    SESSION_LABEL,
+    _allocate_host_port,
+    _collect_eager_fixturedefs,
+    _collect_images,
+    _eager_start_supported,
+    _EagerStart,
+    _format_timings,
+    _get_cached_docker_host,
+    _HealthWatcher,
+    _ImageCache,
+    _is_stale,
+    _make_trace,
+    _prefetch_images,
+    _pull_image,
+    _remove_containers,
+    _stop_all_containers,
+    _wait_for_log,
+)
+from pytest_databases.docker import mysql
+from pytest_databases.helpers import get_xdist_shard_num
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Generator, Iterator
+    from pathlib import Path
+    from typing import BinaryIO
+
+    from docker import DockerClient
+
+    from pytest_databases._service import DockerService
+    from pytest_databases.types import ServiceContainer
+
+
+CONTAINER_IMAGE = "busybox:latest"
+CONTAINER_PORT = 1234
+COMMAND = f"sh -c 'nc -lk -p {CONTAINER_PORT}'"
+
+
+def _tcp_open(service: ServiceContainer) -> bool:
+    try:
+        with socket.create_connection((service.host, service.port), timeout=1):
+            return True
+    except OSError:
+        return False
+
+
+def _spec(name: str) -> dict:
+    return {
+        "image": CONTAINER_IMAGE,
+        "container_port": CONTAINER_PORT,
+        "name": name,
+        "command": COMMAND,
+        "check": _tcp_open,
+        "timeout": 15,
+        "pause": 0.2,
+        "transient": True,
+    }
+
+
+def test_run_many_starts_all_services(docker_service: DockerService) -> None:
+    with docker_service.run_many(_spec("run_many_a"), _spec("run_many_b")) as services:
+        assert [service.container.labels[NAME_LABEL] for service in services] == [
+            "pytest_databases_run_many_a",
+            "pytest_databases_run_many_b",
+        ]
+        assert all(_tcp_open(service) for service in services)
+        assert all(service.timings.check_attempts >= 1 for service in services)
+        assert all({"create", "check"} <= service.timings.phases.keys() for service in services)
+
+
+def test_run_many_hands_out_ready_service(docker_service: DockerService) -> None:
+    with docker_service.run_many(_spec("run_many_ready")) as (started,):
+
+        def never_ready(_service: ServiceContainer) -> bool:
+            return False
+
+        with docker_service.run(**{**_spec("run_many_ready"), "check": never_ready}) as service:
+            assert service is started
+
+
+def _fake_run(events: list[str], started: threading.Barrier) -> Callable[..., Any]:
+    @contextmanager
+    def run(name: str, fail: bool = False) -> Generator[str, None, None]:
+        # every service waits for the others, so this only passes when they start concurrently
+        started.wait()
+        if fail:
+            raise ValueError(name)
+        events.append(f"start {name}")
+        try:
+            yield name
+        finally:
+            events.append(f"stop {name}")
+
+    return run
+
+
+def test_run_many_starts_services_concurrently(
+    request: pytest.FixtureRequest, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    events: list[str] = []
+    service = _fake_docker_service(request, tmp_path, _FakeContainers({}))
+    monkeypatch.setattr(service, "run", _fake_run(events, threading.Barrier(3, timeout=5)))
+
+    with service.run_many({"name": "a"}, {"name": "b"}, {"name": "c"}) as services:
+        assert services == ["a", "b", "c"]
+        assert sorted(events) == ["start a", "start b", "start c"]
+
+    assert events[3:] == ["stop c", "stop b", "stop a"]
+
+
+def test_run_many_stops_started_services_when_one_fails(
+    request: pytest.FixtureRequest, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    events: list[str] = []
+    service = _fake_docker_service(request, tmp_path, _FakeContainers({}))
+    monkeypatch.setattr(service, "run", _fake_run(events, threading.Barrier(2, timeout=5)))
+
+    with pytest.raises(ValueError, match="b"), service.run_many({"name": "a"}, {"name": "b", "fail": True}):
+        pytest.fail("run_many yielded although a service failed")
+
+    assert events == ["start a", "stop a"]
+
+
+def test_run_of_a_running_service_must_match_its_setup(
+    request: pytest.FixtureRequest, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    service = _fake_docker_service(request, tmp_path, _FakeContainers({}))
+    started = _service.ServiceContainer(SimpleNamespace(id="abc"), "127.0.0.1", 5432)  # type: ignore[arg-type]
+    monkeypatch.setattr(service, "_start", lambda **_: started)
+    spec = {
+        "image": "postgres:17",
+        "container_port": 5432,
+        "name": "postgres",
+        "exec_after_start": "psql -c 'CREATE DATABASE pytest_databases_1;'",
+    }
+
+    with service.run(**spec, check=lambda _: True):
+        # the readiness arguments are only used by the run() starting the service
+        with service.run(**spec, check=lambda _: False, timeout=1) as again:
+            assert again is started
+        with (
+            pytest.raises(ValueError, match="different settings"),
+            service.run(**{**spec, "exec_after_start": None}, check=lambda _: True),
+        ):
+            pass
+
+
+class _FakeLogStream:
+    def __init__(self, chunks: list[bytes]) -> None:
+        self._chunks = chunks
+        self.closed = False
+
+    def __iter__(self) -> Iterator[bytes]:
+        return iter(self._chunks)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class _FakeContainer:
+    name = "fake"
+
+    def __init__(self, chunks: list[bytes]) -> None:
+        self.stream = _FakeLogStream(chunks)
+
+    def logs(self, **kwargs: object) -> _FakeLogStream:
+        assert kwargs == {"stream": True, "follow": True}
+        return self.stream
+
+
+def test_wait_for_log_matches_across_chunks() -> None:
+    container = _FakeContainer([b"booting...\nready to ", b"accept connections\n"])
+    assert _wait_for_log(container, b"ready to accept", timeout=5)  # type: ignore[arg-type]
+    assert container.stream.closed
+
+
+def test_wait_for_log_returns_when_stream_ends() -> None:
+    container = _FakeContainer([b"fatal error\n"])
+    assert not _wait_for_log(container, b"ready", timeout=5)  # type: ignore[arg-type]
+
+
+def test_wait_for_log_matches_single_byte_pattern() -> None:
+    container = _FakeContainer([b"ab", b"c"])
+    assert _wait_for_log(container, b"c", timeout=5)  # type: ignore[arg-type]
+
+
+class _BlockingLogStream:
+    def __init__(self) -> None:
+        self.closed = threading.Event()
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield b"starting\n"
+        # a container that keeps running without logging anything else
+        self.closed.wait(5)
+
+    def close(self) -> None:
+        self.closed.set()
+
+
+def test_wait_for_log_gives_up_after_timeout() -> None:
+    stream = _BlockingLogStream()
+    container = SimpleNamespace(name="fake", logs=lambda **_: stream)
+
+    started = time.monotonic()
+    assert not _wait_for_log(container, b"ready", timeout=0.2)  # type: ignore[arg-type]
+    assert time.monotonic() - started < 2
+    assert stream.closed.is_set()
+
+
+class _ClosedEventStream:
+    def __iter__(self) -> Iterator[dict]:
+        return iter(())
+
+    def close(self) -> None:
+        pass
+
+
+class _ClosingEventsClient:
+    def __init__(self) -> None:
+        self.subscriptions = 0
+
+    def events(self, **_: object) -> _ClosedEventStream:
+        self.subscriptions += 1
+        return _ClosedEventStream()
+
+
+class _StartingContainer:
+    id = "abc"
+    status = "running"
+    attrs: ClassVar[dict] = {"State": {"Health": {"Status": "starting"}}}
+
+    def __init__(self) -> None:
+        self.reloads = 0
+
+    def reload(self) -> None:
+        self.reloads += 1
+
+
+def test_health_watcher_backs_off_when_the_event_stream_closes() -> None:
+    client = _ClosingEventsClient()
+    container = _StartingContainer()
+    watcher = _HealthWatcher(client)  # type: ignore[arg-type]
+    assert not watcher.wait(container, timeout=0.5, pause=0.2)  # type: ignore[arg-type]
+    assert client.subscriptions <= 4
+    assert container.reloads <= 4
+
+
+class _OpenEventStream:
+    def __init__(self, events: list[dict]) -> None:
+        self.events = events
+        self.closed = threading.Event()
+
+    def __iter__(self) -> Iterator[dict]:
+        yield from self.events
+        self.closed.wait(5)
+
+    def close(self) -> None:
+        self.closed.set()
+
+
+def _container_event(action: str, container_id: str) -> dict:
+    # the shape of current API versions, without the legacy 'id' and 'status' fields
+    return {
+        "Type": "container",
+        "Action": action,
+        "Actor": {"ID": container_id, "Attributes": {"name": "pytest_databases_postgres"}},
+        "scope": "local",
+        "time": 1700000000,
+        "timeNano": 1700000000000000000,
+    }
+
+
+@pytest.mark.parametrize(("action", "healthy"), [("health_status: healthy", True), ("die", False)])
+def test_health_watcher_follows_container_events(action: str, healthy: bool) -> None:
+    stream = _OpenEventStream([_container_event(action, "other"), _container_event(action, "abc")])
+    client = SimpleNamespace(events=lambda **_: stream)
+    container = _StartingContainer()
+    watcher = _HealthWatcher(client)  # type: ignore[arg-type]
+
+    started = time.monotonic()
+    assert watcher.wait(container, timeout=5, pause=0.2) is healthy  # type: ignore[arg-type]
+    assert time.monotonic() - started < 1
+    # answered from the stream, without polling the container
+    assert container.reloads == 1
+    watcher.close()
+    assert stream.closed.is_set()
+
+
+def test_docker_host_is_resolved_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = []
+
+    def get_docker_host() -> str:
+        calls.append(1)
+        return "unix:///var/run/docker.sock"
+
+    monkeypatch.setattr("pytest_databases._service.get_docker_host", get_docker_host)
+    assert _get_cached_docker_host(tmp_path) == "unix:///var/run/docker.sock"
+    assert _get_cached_docker_host(tmp_path) == "unix:///var/run/docker.sock"
+    assert len(calls) == 1
+
+
+def test_format_timings_sums_per_service_and_worker() -> None:
+    records = [
+        {"service": "postgres", "worker": "gw0", "phases": {"create": 1.0, "check": 2.0}, "check_attempts": 3},
+        {"service": "postgres", "worker": "gw1", "phases": {"pull": 4.0, "create": 1.0}, "check_attempts": 0},
+        {"service": "postgres", "worker": "gw1", "phases": {"teardown": 0.5}, "check_attempts": 1},
+    ]
+    header, *rows = (line.split() for line in _format_timings(records))
+    assert header == ["service", "worker", "starts", "pull", "create", "check", "teardown", "checks", "total"]
+    assert rows == [
+        ["postgres", "gw0", "1", "0.00s", "1.00s", "2.00s", "0.00s", "3", "3.00s"],
+        ["postgres", "gw1", "2", "4.00s", "1.00s", "0.00s", "0.50s", "1", "5.50s"],
+        ["postgres", "all", "3", "4.00s", "2.00s", "2.00s", "0.50s", "4", "8.50s"],
+    ]
+
+
+def test_make_trace_has_a_process_per_worker_and_a_track_per_service() -> None:
+    records = [
+        {"service": "postgres", "worker": "gw0", "pid": 10, "spans": [("lock", 100.0, 0.5), ("create", 100.5, 1.0)]},
+        {"service": "mysql", "worker": "gw0", "pid": 10, "spans": [("pull", 100.0, 2.0)]},
+        {"service": "postgres", "worker": "gw1", "pid": 11, "spans": [("lock", 100.0, 1.5)]},
+    ]
+    events = _make_trace(records)["traceEvents"]
+    names = {(event["pid"], event.get("tid"), event["args"]["name"]) for event in events if event["ph"] == "M"}
+    assert names == {
+        (10, None, "gw0"),
+        (10, 1, "postgres"),
+        (10, 2, "mysql"),
+        (11, None, "gw1"),
+        (11, 3, "postgres"),
+    }
+    spans = [
+        (event["pid"], event["tid"], event["name"], event["ts"], event["dur"]) for event in events if event["ph"] == "X"
+    ]
+    assert spans == [
+        (10, 1, "lock", 100_000_000, 500_000),
+        (10, 1, "create", 100_500_000, 1_000_000),
+        (10, 2, "pull", 100_000_000, 2_000_000),
+        (11, 3, "lock", 100_000_000, 1_500_000),
+    ]
+
+
+class _FakeAPI:
+    def __init__(self, missing: set[str]) -> None:
+        self.missing = missing
+        self.removed: list[tuple[str, bool]] = []
+
+    def remove_container(self, container_id: str, force: bool = False) -> None:
+        if container_id in self.missing:
+            msg = "gone"
+            raise APIError(msg, response=type("Response", (), {"status_code": 404})())  # type: ignore[arg-type]
+        self.removed.append((container_id, force))
+
+
+class _FakeClient:
+    def __init__(self, missing: set[str]) -> None:
+        self.api = _FakeAPI(missing)
+
+
+def test_remove_containers_kills_all_and_ignores_missing() -> None:
+    client = _FakeClient(missing={"b"})
+    _remove_containers(client, ["a", "b", "c"])  # type: ignore[arg-type]
+    assert sorted(client.api.removed) == [("a", True), ("c", True)]
+
+
+def test_stop_all_containers_records_the_session_teardown() -> None:
+    client = _FakeClient(missing=set())
+    client.containers = SimpleNamespace(list=lambda **_: [SimpleNamespace(id="a", status="running")])  # type: ignore[attr-defined]
+    records: list[dict] = []
+    _stop_all_containers(client, "session-id", timings=records)  # type: ignore[arg-type]
+
+    assert client.api.removed == [("a", True)]
+    [record] = records
+    assert (record["service"], record["starts"]) == ("(session)", 0)
+    assert record["phases"].keys() == {"teardown"}
+    header, row = (line.split() for line in _format_timings(records))
+    assert header == ["service", "worker", "starts", "teardown", "checks", "total"]
+    assert row[:3] == ["(session)", "main", "0"]
+
+
+class _FakeImages:
+    def __init__(self, present: set[str], failing: set[str]) -> None:
+        self.present = present
+        self.failing = failing
+        self.pulled: list[tuple[str, str | None]] = []
+
+    def get(self, image: str) -> str:
+        if image not in self.present:
+            raise ImageNotFound(image)
+        return image
+
+    def pull(self, repository: str, tag: str | None = None) -> str:
+        self.pulled.append((repository, tag))
+        if repository in self.failing:
+            msg = "rate limited"
+            raise APIError(msg)
+        time.sleep(0.1)
+        self.present.add(f"{repository}:{tag}")
+        return repository
+
+
+def test_prefetch_images_pulls_missing_images_and_warns_on_failure(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("time.sleep", lambda _: None)
+    client = SimpleNamespace(images=_FakeImages(present={"postgres:17"}, failing={"oracle"}))
+    with pytest.warns(UserWarning, match="oracle"):
+        _prefetch_images(client, ["postgres:17", "mysql:8", "oracle:23"], max_workers=2)  # type: ignore[arg-type]
+    # oracle was retried with backoff
+    assert sorted(client.images.pulled) == [("mysql", "8"), ("oracle", "23"), ("oracle", "23"), ("oracle", "23")]
+
+
+def _fixturedef(argname: str, value: str, module: str) -> SimpleNamespace:
+    def func() -> str:
+        return value
+
+    func.__module__ = module
+    return SimpleNamespace(argname=argname, scope="session", params=None, argnames=(), func=func)
+
+
+def _item(*fixturedefs: SimpleNamespace) -> SimpleNamespace:
+    return SimpleNamespace(
+        _fixtureinfo=SimpleNamespace(
+            names_closure=[fixturedef.argname for fixturedef in fixturedefs],
+            name2fixturedefs={fixturedef.argname: [fixturedef] for fixturedef in fixturedefs},
+        )
+    )
+
+
+def test_collect_images_only_calls_bundled_fixtures_and_honours_platforms() -> None:
+    mysql_image = _fixturedef("mysql_image", "mysql:8", mysql.__name__)
+    items = [
+        _item(mysql_image, _fixturedef("platform", "linux/x86_64", "pytest_databases.docker.mysql")),
+        _item(_fixturedef("postgres_image", "postgres:17", "pytest_databases.docker.postgres")),
+        _item(_fixturedef("custom_image", "custom:1", "conftest")),
+        # a platform overridden by the user is not called, so the image is left to the service
+        _item(
+            _fixturedef("mysql_57_image", "mysql:5.7", "pytest_databases.docker.mysql"),
+            _fixturedef("platform", "linux/arm64", "conftest"),
+        ),
+    ]
+    assert _collect_images(items) == (["mysql:8", "postgres:17"], {"mysql:8": "linux/x86_64"})  # type: ignore[arg-type]
+
+
+def test_prefetch_images_pulls_for_the_given_platform() -> None:
+    pulled: list[tuple[str, str | None, str | None]] = []
+
+    def pull(repository: str, tag: str | None = None, platform: str | None = None) -> str:
+        pulled.append((repository, tag, platform))
+        return repository
+
+    images = _FakeImages(present=set(), failing=set())
+    images.pull = pull  # type: ignore[method-assign]
+    _prefetch_images(
+        SimpleNamespace(images=images), ["mysql:8", "postgres:17"], 2, platforms={"mysql:8": "linux/x86_64"}
+    )  # type: ignore[arg-type]
+    assert sorted(pulled) == [("mysql", "8", "linux/x86_64"), ("postgres", "17", None)]
+
+
+def test_pull_image_pulls_once_across_processes(tmp_path: Path) -> None:
+    client = SimpleNamespace(images=_FakeImages(present=set(), failing=set()))
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda _: _pull_image(client, "oracle:23", {}, lock_dir=tmp_path), range(4)))  # type: ignore[arg-type]
+    assert client.images.pulled == [("oracle", "23")]
+
+
+def test_pull_image_shares_failures_across_processes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("time.sleep", lambda _: None)
+    client = SimpleNamespace(images=_FakeImages(present=set(), failing={"oracle"}))
+    with pytest.raises(APIError):
+        _pull_image(client, "oracle:23", {}, lock_dir=tmp_path)  # type: ignore[arg-type]
+    attempts = len(client.images.pulled)
+    with pytest.raises(RuntimeError, match="rate limited"):
+        _pull_image(client, "oracle:23", {}, lock_dir=tmp_path)  # type: ignore[arg-type]
+    assert len(client.images.pulled) == attempts
+
+
+def test_prefetch_failures_do_not_fail_later_pulls(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("time.sleep", lambda _: None)
+    images = _FakeImages(present=set(), failing={"oracle"})
+    client = SimpleNamespace(images=images)
+    with pytest.warns(UserWarning, match="oracle"):
+        _prefetch_images(client, ["oracle:23"], max_workers=1, lock_dir=tmp_path)  # type: ignore[arg-type]
+    images.failing.clear()
+    assert _pull_image(client, "oracle:23", {}, lock_dir=tmp_path) == "oracle"  # type: ignore[arg-type]
+
+
+class _FakeSavedImage:
+    def __init__(self, image_id: str) -> None:
+        self.id = image_id
+        self.saved_as: list[str] = []
+
+    def save(self, named: str) -> list[bytes]:
+        self.saved_as.append(named)
+        return [b"layer-1", b"layer-2"]
+
+
+class _FakeArchiveImages:
+    def __init__(self) -> None:
+        self.present: dict[str, _FakeSavedImage] = {}
+        self.loaded: list[bytes] = []
+
+    def get(self, image: str) -> _FakeSavedImage:
+        if image not in self.present:
+            raise ImageNotFound(image)
+        return self.present[image]
+
+    def load(self, data: BinaryIO) -> None:
+        self.loaded.append(data.read())
+        self.present["minio/mc"] = _FakeSavedImage("sha256:abc")
+
+
+def test_image_cache_round_trips_through_tarballs(tmp_path: Path) -> None:
+    client = SimpleNamespace(images=_FakeArchiveImages())  # type: ignore[arg-type]
+    cache = _ImageCache(path=tmp_path, save=True)
+    assert cache.load(client, "minio/mc") is None  # type: ignore[arg-type]
+
+    client.images.present["minio/mc"] = image = _FakeSavedImage("sha256:abc")
+    cache.store(client, "minio/mc")  # type: ignore[arg-type]
+    assert image.saved_as == ["minio/mc:latest"]
+    assert (tmp_path / "images" / "abc.tar").read_bytes() == b"layer-1layer-2"
+
+    client.images.present.clear()
+    assert cache.load(client, "minio/mc") is not None  # type: ignore[arg-type]
+    assert client.images.loaded == [b"layer-1layer-2"]
+
+
+def test_allocate_host_port_hands_out_each_port_once(tmp_path: Path) -> None:
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        ports = list(pool.map(lambda _: _allocate_host_port(tmp_path), range(20)))
+    assert len(set(ports)) == 20
+    # the ports are free until a container binds them
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("", ports[0]))
+
+
+def _session_labels(pid: int, host: str, expires: float) -> dict[str, str]:
+    return {
+        "pytest_databases": "",
+        SESSION_LABEL: "abc",
+        OWNER_PID_LABEL: str(pid),
+        OWNER_HOST_LABEL: host,
+        EXPIRES_LABEL: str(int(expires)),
+    }
+
+
+@pytest.mark.skipif(os.name == "nt", reason="pids are not probed on Windows")
+def test_is_stale_checks_owner_process_on_this_host() -> None:
+    host = socket.gethostname()
+    assert not _is_stale(_session_labels(os.getpid(), host, expires=0), now=1000)
+    # pids are capped well below this on every platform
+    assert _is_stale(_session_labels(2**30, host, expires=2000), now=1000)
+
+
+def test_is_stale_falls_back_to_expiry_for_other_hosts() -> None:
+    assert not _is_stale(_session_labels(1, "elsewhere", expires=2000), now=1000)
+    assert _is_stale(_session_labels(1, "elsewhere", expires=500), now=1000)
+
+
+def test_is_stale_keeps_reused_and_reaps_unlabelled_containers() -> None:
+    assert not _is_stale({"pytest_databases": "", REUSE_LABEL: ""}, now=1000)
+    assert _is_stale({"pytest_databases": ""}, now=1000)
+
+
+def test_run_waits_for_healthcheck(docker_service: DockerService) -> None:
+    with docker_service.run(
+        image=CONTAINER_IMAGE,
+        container_port=CONTAINER_PORT,
+        name="healthcheck",
+        command=COMMAND,
+        healthcheck={
+            "test": ["CMD-SHELL", f"nc -z 127.0.0.1 {CONTAINER_PORT}"],
+            "interval": 100_000_000,
+            "timeout": 1_000_000_000,
+            "retries": 50,
+        },
+        timeout=15,
+        transient=True,
+    ) as service:
+        service.container.reload()
+        assert service.container.attrs["State"]["Health"]["Status"] == "healthy"
+
+
+def test_run_fails_fast_when_container_exits(docker_service: DockerService) -> None:
+    with (
+        pytest.raises(RuntimeError, match=r"(?s)exit code 3.*boom"),
+        docker_service.run(
+            image=CONTAINER_IMAGE,
+            container_port=CONTAINER_PORT,
+            name="exits_early",
+            command="sh -c 'echo boom; sleep 1; exit 3'",
+            check=lambda _service: False,
+            timeout=60,
+            pause=0.2,
+            transient=True,
+        ),
+    ):
+        pytest.fail("DockerService.run should have raised for the exited container")
+
+
+def test_xdist_workers_attach_to_published_service(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(f"""
+    import os
+    import pathlib
+    import socket
+
+    def _tcp_open(service):
+        try:
+            with socket.create_connection((service.host, service.port), timeout=1):
+                return True
+        except OSError:
+            return False
+
+    def test_attach(docker_service):
+        with docker_service.run(
+            image="{CONTAINER_IMAGE}",
+            container_port={CONTAINER_PORT},
+            name="published",
+            command="{COMMAND}",
+            check=_tcp_open,
+            timeout=15,
+            pause=0.2,
+        ) as service:
+            assert _tcp_open(service)
+            pathlib.Path(os.environ["PYTEST_XDIST_WORKER"]).write_text(
+                f"{{service.container.id}} {{service.timings.check_attempts}}"
+            )
+    """)
+    pytester.runpytest_subprocess("-p", "pytest_databases", "-n", "2", "--dist", "each").assert_outcomes(passed=2)
+
+    results = [(pytester.path / worker).read_text().split() for worker in ("gw0", "gw1")]
+    assert results[0][0] == results[1][0]
+    # only the worker that started the container checked it
+    assert sorted(int(checks) > 0 for _, checks in results) == [False, True]
+
+
+class _FakeContainers:
+    def __init__(self, containers: dict[str, SimpleNamespace]) -> None:
+        self.containers = containers
+
+    def get(self, container_id: str) -> SimpleNamespace:
+        if container_id not in self.containers:
+            raise NotFound(container_id)
+        return self.containers[container_id]
+
+
+def _fake_docker_service(
+    request: pytest.FixtureRequest,
+    tmp_path: Path,
+    containers: _FakeContainers | _CreatingContainers,
+    base_url: str = "http+docker://localhost",
+) -> DockerService:
+    client = SimpleNamespace(api=SimpleNamespace(base_url=base_url), containers=containers)
+    return _service.DockerService(client, tmp_path, request.session)  # type: ignore[arg-type]
+
+
+class _CreatingContainers:
+    def __init__(self) -> None:
+        self.created: list[dict[str, object]] = []
+
+    def list(self, **_: object) -> list[SimpleNamespace]:
+        return []
+
+    def create(self, image: str, command: str | None, **kwargs: object) -> SimpleNamespace:
+        self.created.append(kwargs)
+        return SimpleNamespace(
+            id="abc",
+            status="running",
+            # the binding Docker reports when it picked the host port itself
+            ports={"5432/tcp": [{"HostIp": "127.0.0.1", "HostPort": "49153"}]},
+            start=lambda: None,
+            reload=lambda: None,
+            exec_run=lambda _: None,
+        )
+
+
+def test_run_mounts_tmpfs_with_the_configured_size(
+    request: pytest.FixtureRequest, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(request.config.option, "databases_tmpfs_size", "256m")
+    containers = _CreatingContainers()
+    service = _fake_docker_service(request, tmp_path, containers)
+    service._client.images = SimpleNamespace(get=lambda image: SimpleNamespace(id=image))  # type: ignore[attr-defined]
+
+    with service.run(
+        "postgres:17",
+        container_port=5432,
+        name="tmpfs",
+        check=lambda _: True,
+        shm_size=2**30,
+        tmpfs=service.tmpfs("/var/lib/postgresql/data"),
+    ):
+        pass
+
+    [created] = containers.created
+    assert created["tmpfs"] == {"/var/lib/postgresql/data": "rw,size=256m"}
+    assert created["shm_size"] == 2**30
+
+
+@pytest.mark.parametrize(
+    ("base_url", "allocated"),
+    [
+        ("http+docker://localhost", True),
+        ("http+docker://localnpipe", True),
+        # ssh:// daemons, whose ports are not free just because they are free here
+        ("http+docker://ssh", False),
+        ("http://10.0.0.5:2375", False),
+    ],
+)
+def test_host_ports_are_allocated_only_for_local_daemons(
+    request: pytest.FixtureRequest, tmp_path: Path, base_url: str, allocated: bool
+) -> None:
+    containers = _CreatingContainers()
+    service = _fake_docker_service(request, tmp_path, containers, base_url)
+    service._client.images = SimpleNamespace(get=lambda image: SimpleNamespace(id=image))  # type: ignore[attr-defined]
+
+    with service.run("postgres:17", container_port=5432, name="ports", check=lambda _: True) as started:
+        [created] = containers.created
+        [host_port] = created["ports"].values()  # type: ignore[attr-defined]
+        assert (host_port is not None) is allocated
+        assert started.port == (host_port if allocated else 49153)
+
+
+@pytest.mark.parametrize(("status", "attached"), [("running", True), ("exited", False), (None, False)])
+def test_published_service_is_attached_only_while_its_container_runs(
+    request: pytest.FixtureRequest, tmp_path: Path, status: str | None, attached: bool
+) -> None:
+    container = SimpleNamespace(id="abc", status=status)
+    containers = _FakeContainers({"abc": container} if status else {})
+    service = _fake_docker_service(request, tmp_path, containers)
+    service._publish("postgres", "fingerprint", _service.ServiceContainer(container, "127.0.0.1", 5432))  # type: ignore[arg-type]
+
+    published = service._attach_published("postgres", "fingerprint", "127.0.0.1")
+    assert (published is not None) is attached
+    if published is not None:
+        assert (published.container, published.port) == (container, 5432)
+    assert service._attach_published("postgres", "other-fingerprint", "127.0.0.1") is None
+
+
+def test_reuse_databases_attaches_to_running_container(pytester: pytest.Pytester, docker_client: DockerClient) -> None:
+    pytester.makepyfile(f"""
+    import socket
+
+    def _tcp_open(service):
+        try:
+            with socket.create_connection((service.host, service.port), timeout=1):
+                return True
+        except OSError:
+            return False
+
+    def test_start(docker_service):
+        with docker_service.run(
+            image="{CONTAINER_IMAGE}",
+            container_port={CONTAINER_PORT},
+            name="reuse",
+            command="{COMMAND}",
+            check=_tcp_open,
+            timeout=15,
+            pause=0.2,
+        ) as service:
+            print("container-id:", service.container.id)
+    """)
+    first = pytester.runpytest_subprocess("-p", "pytest_databases", "--reuse-databases", "-s")
+    first.assert_outcomes(passed=1)
+    second = pytester.runpytest_subprocess("-p", "pytest_databases", "--reuse-databases", "-s")
+    second.assert_outcomes(passed=1)
+    # sessions without the flag leave reused containers alone
+    pytester.runpytest_subprocess("-p", "pytest_databases").assert_outcomes(passed=1)
+    reused = docker_client.containers.list(filters={"label": REUSE_LABEL})
+    assert [container.name for container in reused] == ["pytest_databases_reuse"]
+    reused[0].remove(force=True)
+
+    ids = [line.split()[-1] for line in [*first.outlines, *second.outlines] if line.startswith("container-id:")]
+    assert len(ids) == 2
+    assert ids[0] == ids[1]
+
+
+def test_snapshot_restores_initialized_state(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(f"""
+    import socket
+
+    def _tcp_open(service):
+        try:
+            with socket.create_connection((service.host, service.port), timeout=1):
+                return True
+        except OSError:
+            return False
+
+    def test_snapshot(docker_service):
+        with docker_service.run(
+            image="{CONTAINER_IMAGE}",
+            container_port={CONTAINER_PORT},
+            name="snapshot",
+            command="{COMMAND}",
+            check=_tcp_open,
+            timeout=15,
+            pause=0.2,
+            transient=True,
+            snapshot="touch /initialized",
+        ) as service:
+            print("initialized:", service.container.exec_run(["test", "-f", "/initialized"]).exit_code == 0)
+            service.container.exec_run(["touch", "/initialized"])
+            docker_service.commit_snapshot(service)
+    """)
+    first = pytester.runpytest_subprocess("-p", "pytest_databases", "--databases-snapshots", "-s")
+    first.assert_outcomes(passed=1)
+    first.stdout.fnmatch_lines(["*initialized: False*"])
+
+    second = pytester.runpytest_subprocess("-p", "pytest_databases", "--databases-snapshots", "-s")
+    second.assert_outcomes(passed=1)
+    second.stdout.fnmatch_lines(["*initialized: True*"])
+
+    cleared = pytester.runpytest_subprocess(
+        "-p", "pytest_databases", "--databases-snapshots", "--databases-clear-snapshots", "-s"
+    )
+    cleared.assert_outcomes(passed=1)
+    cleared.stdout.fnmatch_lines(["*initialized: False*"])
+
+
+def test_eager_start_boots_services_before_they_are_requested(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(f"""
+    import time
+
+    def _running_redis(docker_client):
+        return docker_client.containers.list(filters={{"label": "{NAME_LABEL}=redis"}})
+
+    def test_first(docker_client):
+        deadline = time.monotonic() + 60
+        while not _running_redis(docker_client):
+            assert time.monotonic() < deadline
+            time.sleep(0.5)
+
+    def test_second(docker_client, redis_service):
+        assert redis_service.container.id in [c.id for c in _running_redis(docker_client)]
+    """)
+    pytester.runpytest_subprocess(
+        "-p", "pytest_databases", "-p", "pytest_databases.docker.redis", "--databases-eager-start"
+    ).assert_outcomes(passed=2)
+
+
+class _FakeFixtureDef(SimpleNamespace):
+    # fixture definitions are dict keys in pytest, so they hash by identity
+    __hash__ = object.__hash__
+
+
+def _service_fixturedef(func: Callable[..., object], argnames: tuple[str, ...] = ()) -> _FakeFixtureDef:
+    func.__module__ = "pytest_databases.docker.postgres"
+    return _FakeFixtureDef(
+        argname="postgres_service",
+        scope="session",
+        params=None,
+        argnames=argnames,
+        baseid="",
+        func=func,
+        cache_key=lambda _: None,
+        addfinalizer=lambda _: None,
+    )
+
+
+def test_eager_start_skips_services_with_locally_overridden_dependencies() -> None:
+    service = _service_fixturedef(lambda postgres_image: postgres_image, argnames=("postgres_image",))
+    image = SimpleNamespace(argname="postgres_image", scope="session", argnames=(), baseid="")
+    local_image = SimpleNamespace(argname="postgres_image", scope="session", argnames=(), baseid="tests/legacy")
+
+    def item(*image_definitions: SimpleNamespace) -> SimpleNamespace:
+        return SimpleNamespace(
+            _fixtureinfo=SimpleNamespace(
+                names_closure=["postgres_service", "postgres_image"],
+                name2fixturedefs={"postgres_service": [service], "postgres_image": list(image_definitions)},
+            )
+        )
+
+    assert _collect_eager_fixturedefs([item(image)]) == [service]  # type: ignore[list-item]
+    assert _collect_eager_fixturedefs([item(image), item(image, local_image)]) == []  # type: ignore[list-item]
+
+
+@pytest.mark.parametrize(
+    ("version", "supported"),
+    [("7.4.4", False), ("8.0.0rc1", True), ("8.4.2", True), ("9.1.1", True), ("10.0.0", False)],
+)
+def test_eager_start_supported_pytest_versions(version: str, supported: bool) -> None:
+    assert _eager_start_supported(version) is supported
+
+
+def test_eager_start_leaves_failed_services_to_pytest() -> None:
+    def fail() -> None:
+        msg = "no such image"
+        raise RuntimeError(msg)
+
+    failing, starting = _service_fixturedef(fail), _service_fixturedef(lambda: "service")
+    eager_start = _EagerStart([failing, starting])  # type: ignore[list-item]
+    eager_start.start(SimpleNamespace(getfixturevalue=None))  # type: ignore[arg-type]
+    # pytest then calls the fixture itself, and reports and caches its error
+    assert eager_start.join(failing, None) is None  # type: ignore[arg-type]
+    assert eager_start.join(starting, None) == "service"  # type: ignore[arg-type]
+    assert starting.cached_result == ("service", None, None)
+    eager_start.close()
+
+
+@pytest.mark.parametrize(
+    ("worker", "workers_per_server", "shard"),
+    [("gw0", 4, 0), ("gw3", 4, 0), ("gw4", 4, 1), ("gw9", 4, 2), ("gw9", 1, 9)],
+)
+def test_get_xdist_shard_num(monkeypatch: pytest.MonkeyPatch, worker: str, workers_per_server: int, shard: int) -> None:
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", worker)
+    assert get_xdist_shard_num(workers_per_server) == shard
+
+
+@pytest.mark.parametrize(("value", "outcome"), [("fast", {"passed": 1}), ("durable", {"errors": 1})])
+def test_database_profile_is_validated(
+    pytester: pytest.Pytester, monkeypatch: pytest.MonkeyPatch, value: str, outcome: dict[str, int]
+) -> None:
+    monkeypatch.setenv("DATABASE_PROFILE", value)
+    pytester.makepyfile("""
+    def test_profile(database_profile):
+        assert database_profile == "fast"
+    """)
+
+    result = pytester.runpytest_subprocess("-p", "pytest_databases")
+
+    result.assert_outcomes(**outcome)
+    if "errors" in outcome:
+        result.stdout.fnmatch_lines(["*ValueError: DATABASE_PROFILE must be one of*'durable'*"])